@@ -39,19 +39,37 @@ these context recommendations for each operation:
   interpret them correctly.
 """
 
+import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import copy
+import errno
+import io
+import itertools
 import os
+import queue
 import sys
 import json
 import logging
+import re
+import subprocess
 import tempfile
+import threading
 import time
+import weakref
+import zipfile
 from pathlib import Path
-from typing import List, Dict, Union, Optional, Tuple, Any, Callable
+from typing import TYPE_CHECKING, List, Dict, Set, Union, Optional, Tuple, Any, Callable
 import math
+import functools
+from collections import OrderedDict
 
-# Logging configuration
+# Logging configuration; EXCEL_MCP_LOG_LEVEL=WARNING silences the INFO
+# progress messages. Messages use lazy %-style arguments, which are only
+# formatted when a record is actually emitted
 logger = logging.getLogger("excel_mcp_master")
-logger.setLevel(logging.INFO)
+logger.setLevel(getattr(logging, os.environ.get("EXCEL_MCP_LOG_LEVEL", "INFO").upper(), logging.INFO))
 handler = logging.StreamHandler(sys.stderr)
 handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 logger.addHandler(handler)
@@ -66,10 +84,10 @@ except ImportError:
 
 # Attempt to import required libraries
 try:
-    import pandas as pd
-    import numpy as np
     import openpyxl
     from openpyxl.utils import get_column_letter, column_index_from_string
+    from openpyxl.utils.cell import range_boundaries
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.worksheet.table import Table, TableStyleInfo
     from openpyxl.styles import (
         Font, PatternFill, Border, Side, Alignment, 
@@ -80,13 +98,38 @@ try:
         Reference, Series
     )
     from openpyxl.worksheet.filters import AutoFilter
-    from openpyxl.pivot.table import PivotTable, PivotField
-    from openpyxl.pivot.cache import PivotCache
+    from openpyxl.worksheet._writer import WorksheetWriter
+    from openpyxl.formula.translate import Translator
+    # Load the xlsx writer up front so the first save does not pay for it
+    import openpyxl.writer.excel
+    if not openpyxl.xml.LXML:
+        logger.warning("lxml is not available; openpyxl will use the slower ElementTree writer")
     HAS_OPENPYXL = True
+    # The fast paths gated on this use openpyxl internals (cell._value,
+    # ws._cells, ws._current_row, WorksheetWriter, wb._cell_styles) as they
+    # are in the 3.1 series pinned in pyproject.toml; other versions use the
+    # public API
+    _OPENPYXL_INTERNALS_OK = openpyxl.__version__.startswith("3.1.")
+    if not _OPENPYXL_INTERNALS_OK:
+        logger.warning("openpyxl %s is not a tested version; fast write paths are disabled",
+                       openpyxl.__version__)
 except ImportError as e:
-    logger.warning(f"Failed to import required libraries: {e}")
+    logger.warning("Failed to import required libraries: %s", e)
     logger.warning("Some functionality may be unavailable")
     HAS_OPENPYXL = False
+    _OPENPYXL_INTERNALS_OK = False
+
+# Only older openpyxl releases have these pivot classes; without them
+# create_pivot_table reports a PivotTableError
+try:
+    from openpyxl.pivot.table import PivotTable, PivotField
+    from openpyxl.pivot.cache import PivotCache
+except ImportError:
+    PivotTable = PivotField = PivotCache = None
+
+# pandas stays optional at runtime; it is only needed for the annotations
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Import existing Excel MCP modules
 # Note: In a real implementation we would import the functions from the existing modules
@@ -130,6 +173,64 @@ DEFAULT_TABLE_STYLE = "TableStyleMedium9"
 CHART_MARGIN = 2  # Rows/columns of space around charts
 SECTION_PADDING = 1  # Rows between sections
 
+# Blocks with more rows than this written to an empty area are formatted
+# from the data itself instead of rescanning the whole worksheet
+BULK_WRITE_ROW_THRESHOLD = 1000
+# Range formula fills validate the formula once and copy the bound value to
+# the remaining cells instead of running openpyxl's value setter per cell
+FAST_FORMULA_WRITE = _OPENPYXL_INTERNALS_OK
+# When the only edits since the cache last saved a file are cell changes on
+# one plain sheet, rewrite that sheet's XML inside the xlsx instead of
+# serializing the whole workbook again
+FAST_SHEET_SAVE = _OPENPYXL_INTERNALS_OK
+# Deflate level for the cache's own saves of edits. Level 1 is several times
+# faster than zlib's default (6) for a slightly larger file; save_workbook_tool
+# writes the file handed back to the user at the default level
+CACHE_SAVE_COMPRESS_LEVEL = 1
+
+# Strings made only of digits with optional sign, thousands separators and
+# decimal point (e.g. "1,000", "-3.5", ".25") that may be stored as numbers
+_NUMERIC_STRING_RE = re.compile(r"^-?(?:[\d,]+\.?[\d,]*|\.[\d,]+)$")
+# Percentages such as "15%" or "-2.5%"
+_PERCENT_STRING_RE = re.compile(r"^-?\d+(?:\.\d+)?%$")
+# Cell position given by the caller, e.g. "E4"
+_CELL_POSITION_RE = re.compile(r'([A-Z]+)(\d+)')
+# Characters a numeric or percentage string can start and end with; anything
+# else is plain text and skips the regular expressions entirely
+_NUMBER_FIRST_CHARS = frozenset("-.0123456789,")
+_NUMBER_LAST_CHARS = frozenset(".0123456789,%")
+# Below this many rows the per-cell cleaning is cheaper than building a DataFrame
+PANDAS_CLEAN_ROW_THRESHOLD = 64
+# Single-pass character substitutions for header text and table names
+_LINE_BREAK_TABLE = str.maketrans('\r\n', '  ')
+_TABLE_NAME_SEPARATOR_TABLE = str.maketrans(' -', '__')
+
+# XML parts of the minimal xlsx package used when openpyxl is not available
+_CONTENT_TYPES_XML: bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/><Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/></Types>'
+_ROOT_RELS_XML: bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+_WORKBOOK_RELS_XML: bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/></Relationships>'
+_WORKBOOK_XML: bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+_SHEET1_XML: bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData/></worksheet>'
+
+# The package contents never change, so the archive is built once at import
+# time and written verbatim.
+def _build_empty_xlsx() -> bytes:
+    """Return the bytes of an empty single-sheet xlsx package."""
+    parts = [
+        ("[Content_Types].xml", _CONTENT_TYPES_XML),
+        ("_rels/.rels", _ROOT_RELS_XML),
+        ("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML),
+        ("xl/workbook.xml", _WORKBOOK_XML),
+        ("xl/worksheets/sheet1.xml", _SHEET1_XML),
+    ]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for arc_name, xml in parts:
+            zf.writestr(arc_name, xml)
+    return buffer.getvalue()
+
+_EMPTY_XLSX_BYTES = _build_empty_xlsx()
+
 # Base exception classes (unified)
 class ExcelMCPError(Exception):
     """Base exception for all Excel MCP errors."""
@@ -179,6 +280,19 @@ class PivotTableError(ExcelMCPError):
 # ENHANCED UTILITY FUNCTIONS
 # ===========================
 
+def _stored_cells(ws: Any) -> Dict[Tuple[int, int], Any]:
+    """
+    Map ``(row, column)`` to the non-empty cells of ``ws``, without creating empty ones.
+
+    Reads openpyxl's cell map directly when ``_OPENPYXL_INTERNALS_OK``;
+    otherwise walks the used range with ``iter_rows``, which also creates
+    the empty cells in its gaps (they are not written to the file).
+    """
+    if _OPENPYXL_INTERNALS_OK:
+        return ws._cells
+    return {(cell.row, cell.column): cell for row in ws.iter_rows() for cell in row
+            if cell.value is not None or cell.has_style}
+
 def enhanced_autofit_columns(ws: Any, min_width: float = 8.43, max_width: float = 80) -> None:
     """
     Enhanced auto-fit for all columns in a worksheet.
@@ -188,24 +302,28 @@ def enhanced_autofit_columns(ws: Any, min_width: float = 8.43, max_width: float
         min_width: Minimum column width
         max_width: Maximum column width
     """
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        
-        for cell in column:
-            if cell.value:
-                # Calculate length considering line breaks
-                lines = str(cell.value).split('\n')
-                max_line_length = max(len(line) for line in lines)
-                max_length = max(max_length, max_line_length)
-                
-                # Enable text wrapping for multi-line content
-                if len(lines) > 1:
-                    cell.alignment = Alignment(wrap_text=True)
-        
-        # Apply calculated width
-        adjusted_width = min(max(max_length + 2, min_width), max_width)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    # Walk the stored cells only: ws.columns would create an empty cell for
+    # every gap in the used range just to index the columns
+    max_lengths: Dict[int, int] = {}
+    cells = _stored_cells(ws)
+    for (_, col), cell in cells.items():
+        if cell.value:
+            # Calculate length considering line breaks
+            lines = str(cell.value).split('\n')
+            max_line_length = max(len(line) for line in lines)
+            if max_line_length > max_lengths.get(col, 0):
+                max_lengths[col] = max_line_length
+            
+            # Enable text wrapping for multi-line content
+            if len(lines) > 1:
+                cell.alignment = Alignment(wrap_text=True)
+    
+    # Apply calculated width; an empty sheet has no columns to fit
+    if not cells:
+        return
+    for col in range(1, ws.max_column + 1):
+        adjusted_width = min(max(max_lengths.get(col, 0) + 2, min_width), max_width)
+        ws.column_dimensions[get_column_letter(col)].width = adjusted_width
 
 def apply_consistent_number_format(ws: Any, detect_currency: bool = True, detect_percentage: bool = True) -> None:
     """
@@ -321,13 +439,15 @@ def create_text_box_title(ws: Any, title: str, position: str, font_size: int = N
     cell.font = Font(name=DEFAULT_FONT, size=font_size, bold=True)
     cell.alignment = Alignment(horizontal="center", vertical="center")
 
-def apply_unified_theme(wb: Any, theme_name: str = "professional") -> None:
+def apply_unified_theme(wb: Any, theme_name: str = "professional",
+                        sheet_names: Optional[List[str]] = None) -> None:
     """
     Apply a unified theme to the entire workbook.
     
     Args:
         wb: Workbook object
         theme_name: Theme to apply ("professional", "modern", "classic")
+        sheet_names: Only theme these sheets (default: all of them)
     """
     theme_config = {
         "professional": {
@@ -359,7 +479,7 @@ def apply_unified_theme(wb: Any, theme_name: str = "professional") -> None:
     theme = theme_config.get(theme_name, theme_config["professional"])
     
     # Apply theme to all sheets
-    for sheet_name in wb.sheetnames:
+    for sheet_name in sheet_names or wb.sheetnames:
         ws = wb[sheet_name]
         
         # Apply default font to all cells
@@ -579,7 +699,7 @@ def conservative_table_cleanup(ws: Any, cell_range: str) -> str:
         The same range (unchanged)
     """
     try:
-        start_row, start_col, end_row, end_col = ExcelRange.parse_range(cell_range)
+        start_row, start_col, end_row, end_col = _parse_range(cell_range)
         
         # Only improve headers if they are clearly generic
         # Check first row for generic headers
@@ -625,7 +745,7 @@ def conservative_table_cleanup(ws: Any, cell_range: str) -> str:
         return cell_range  # Return unchanged range
         
     except Exception as e:
-        logger.warning(f"Conservative table cleanup failed: {e}")
+        logger.warning("Conservative table cleanup failed: %s", e)
         return cell_range  # Return original range on error
 
 # ----------------------------------------
@@ -726,6 +846,17 @@ def detect_formula_type_from_data(data_column: list, header_name: str = "") -> s
     # Default to sum for numeric columns
     return 'sum'
 
+# Named style shared by the formula cells of totals rows
+TOTAL_STYLE_NAME = "excel_mcp_total"
+
+def _ensure_total_style(wb: Any) -> str:
+    """Register the totals-row style in ``wb`` if needed and return its name."""
+    if TOTAL_STYLE_NAME not in wb.named_styles:
+        wb.add_named_style(NamedStyle(name=TOTAL_STYLE_NAME,
+                                      font=Font(name=DEFAULT_FONT, size=11, bold=True),
+                                      number_format='#,##0.00'))
+    return TOTAL_STYLE_NAME
+
 def add_formula_to_table(ws: Any, table_range: str, formula_type: str = 'auto') -> Dict[str, Any]:
     """Add formulas to a table (typically in a total row).
     
@@ -738,17 +869,15 @@ def add_formula_to_table(ws: Any, table_range: str, formula_type: str = 'auto')
         Dictionary with information about added formulas
     """
     try:
-        start_row, start_col, end_row, end_col = ExcelRange.parse_range(table_range)
+        start_row, start_col, end_row, end_col = _parse_range(table_range)
         
         # Find a row for totals (after the data)
         total_row = end_row + 2  # Leave one empty row
         
-        # Add "Total" label in first column
-        label_cell = ws.cell(row=total_row + 1, column=start_col + 1)
-        label_cell.value = "Total"
-        label_cell.font = Font(name=DEFAULT_FONT, size=11, bold=True)
-        
         formulas_added = []
+        # Formula cells take a named style by name instead of a new font and
+        # number format each, which openpyxl would hash per cell
+        total_style = _ensure_total_style(ws.parent)
         
         # Add formulas for each numeric column
         for col in range(start_col + 1, end_col + 1):  # Skip first column (labels)
@@ -795,8 +924,7 @@ def add_formula_to_table(ws: Any, table_range: str, formula_type: str = 'auto')
                 formula_cell.value = generate_sum_formula(data_range)
             
             # Format formula cell
-            formula_cell.font = Font(name=DEFAULT_FONT, size=11, bold=True)
-            formula_cell.number_format = '#,##0.00'
+            formula_cell.style = total_style
             
             formulas_added.append({
                 'column': get_column_letter(col + 1),
@@ -805,6 +933,12 @@ def add_formula_to_table(ws: Any, table_range: str, formula_type: str = 'auto')
                 'range': data_range
             })
         
+        # Add "Total" label in first column, unless there is nothing to total
+        if formulas_added:
+            label_cell = ws.cell(row=total_row + 1, column=start_col + 1)
+            label_cell.value = "Total"
+            label_cell.font = Font(name=DEFAULT_FONT, size=11, bold=True)
+        
         return {
             'success': True,
             'total_row': total_row + 1,
@@ -819,6 +953,11 @@ def add_formula_to_table(ws: Any, table_range: str, formula_type: str = 'auto')
             'message': f"Error adding formulas to table: {e}"
         }
 
+@functools.lru_cache(maxsize=256)
+def _row_template_parts(formula_template: str) -> Tuple[str, ...]:
+    """Split a ``{row}`` template once; ``str(row).join(parts)`` then fills every placeholder."""
+    return tuple(formula_template.split('{row}'))
+
 def create_calculated_column(ws: Any, table_range: str, new_column_header: str, formula_template: str) -> Dict[str, Any]:
     """Add a calculated column to a table.
     
@@ -832,7 +971,7 @@ def create_calculated_column(ws: Any, table_range: str, new_column_header: str,
         Dictionary with information about the new column
     """
     try:
-        start_row, start_col, end_row, end_col = ExcelRange.parse_range(table_range)
+        start_row, start_col, end_row, end_col = _parse_range(table_range)
         
         # New column will be after the last column
         new_col = end_col + 1
@@ -843,19 +982,18 @@ def create_calculated_column(ws: Any, table_range: str, new_column_header: str,
         header_cell.font = Font(name=DEFAULT_FONT, size=11, bold=True)
         header_cell.alignment = Alignment(horizontal="center", vertical="center")
         
-        # Add formulas for each data row
-        formulas_added = []
-        for row in range(start_row + 1, end_row + 1):
-            formula_cell = ws.cell(row=row + 1, column=new_col + 1)
-            # Replace {row} placeholder with actual row number (1-based)
-            actual_formula = formula_template.replace('{row}', str(row + 1))
+        # Build the formula of every data row up front, joining the template
+        # pieces around the actual row number (1-based)
+        template_parts = _row_template_parts(formula_template)
+        formulas_added = [str(row + 1).join(template_parts)
+                          for row in range(start_row + 1, end_row + 1)]
+        
+        # Then write them down the new column in a single walk
+        column_cells = ws.iter_rows(min_row=start_row + 2, max_row=end_row + 1,
+                                    min_col=new_col + 1, max_col=new_col + 1)
+        for (formula_cell,), actual_formula in zip(column_cells, formulas_added):
             formula_cell.value = actual_formula
             formula_cell.number_format = '#,##0.00'
-            
-            formulas_added.append({
-                'row': row + 1,
-                'formula': actual_formula
-            })
         
         # Return new expanded range
         new_range = ExcelRange.range_to_a1(start_row, start_col, end_row, new_col)
@@ -875,6 +1013,250 @@ def create_calculated_column(ws: Any, table_range: str, new_column_header: str,
             'message': f"Error creating calculated column: {e}"
         }
 
+_STRING_LITERAL_RE = re.compile(r'"[^"]*"')
+_ABSOLUTE_REF_RE = re.compile(r"\$[A-Z]{1,3}\$\d+", re.IGNORECASE)
+# Anything left that looks like a cell, column or row reference. Function
+# names such as LOG10 also match, which only costs a needless translation
+_RELATIVE_REF_RE = re.compile(r"[A-Z]{1,3}\$?\d+|\$?[A-Z]{1,3}:\$?[A-Z]{1,3}|\$?\d+:\$?\d+", re.IGNORECASE)
+
+def _has_relative_refs(formula: str) -> bool:
+    """Return ``True`` unless every reference in ``formula`` is fully absolute (``$A$1``)."""
+    formula = _ABSOLUTE_REF_RE.sub('', _STRING_LITERAL_RE.sub('', formula))
+    return _RELATIVE_REF_RE.search(formula) is not None
+
+_AGGREGATE_FORMULA_RE = re.compile(
+    r"^=(SUM|AVERAGE|COUNT|MAX|MIN)\((\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?\d+)\)$", re.IGNORECASE)
+_ARITHMETIC_FORMULA_RE = re.compile(
+    r"^=(\$?[A-Z]+\$?\d+)\s*([-+*/])\s*(\$?[A-Z]+\$?\d+)$", re.IGNORECASE)
+
+def _evaluate_simple_formula(ws: Any, formula: str) -> Optional[Union[int, float]]:
+    """
+    Compute the result of a simple formula from the values stored in ``ws``.
+
+    Only ``=SUM/AVERAGE/COUNT/MAX/MIN(range)`` and ``=REF op REF`` (``+ - * /``)
+    are understood. Anything else, a reference to another formula, text in an
+    arithmetic operand or a division by zero gives ``None``.
+    """
+    cells = _stored_cells(ws)  # read through the cell map so no empty cells get created
+    match = _AGGREGATE_FORMULA_RE.match(formula)
+    if match:
+        function = match.group(1).upper()
+        start_row, start_col, end_row, end_col = _parse_range(match.group(2).upper())
+        numbers = []
+        for row in range(start_row + 1, end_row + 2):
+            for col in range(start_col + 1, end_col + 2):
+                cell = cells.get((row, col))
+                if cell is None:
+                    continue
+                if cell.data_type == 'f':
+                    return None
+                value = cell.value
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers.append(value)
+        if function == 'SUM':
+            return sum(numbers)
+        if function == 'COUNT':
+            return len(numbers)
+        if function == 'AVERAGE':
+            return sum(numbers) / len(numbers) if numbers else None
+        if not numbers:
+            return 0
+        return max(numbers) if function == 'MAX' else min(numbers)
+
+    match = _ARITHMETIC_FORMULA_RE.match(formula)
+    if match:
+        operands = []
+        for ref in (match.group(1), match.group(3)):
+            row, col = ExcelRange.parse_cell_ref(ref)
+            cell = cells.get((row + 1, col + 1))
+            value = None if cell is None else cell.value
+            if cell is not None and cell.data_type == 'f':
+                return None
+            if value is None:
+                value = 0
+            elif not isinstance(value, (int, float)) or isinstance(value, bool):
+                return None
+            operands.append(value)
+        left, right = operands
+        operator = match.group(2)
+        if operator == '+':
+            return left + right
+        if operator == '-':
+            return left - right
+        if operator == '*':
+            return left * right
+        return left / right if right else None
+    return None
+
+def evaluate_formula_cells(ws: Any, range_str: str) -> Dict[str, Union[int, float]]:
+    """
+    Evaluate the simple formulas found in ``range_str``.
+
+    Args:
+        ws: Openpyxl worksheet object.
+        range_str (str): Range to scan (e.g. ``"A1:D10"`` or ``"E5"``).
+
+    Returns:
+        Mapping of cell coordinate to computed value for every formula that
+        :func:`_evaluate_simple_formula` understands.
+    """
+    values = {}
+    start_row, start_col, end_row, end_col = _parse_range(range_str)
+    for row in ws.iter_rows(min_row=start_row + 1, max_row=end_row + 1,
+                            min_col=start_col + 1, max_col=end_col + 1):
+        for cell in row:
+            if cell.data_type != 'f' or not isinstance(cell.value, str):
+                continue
+            value = _evaluate_simple_formula(ws, cell.value)
+            if value is not None:
+                values[cell.coordinate] = value
+    return values
+
+_OFFICE_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+def _workbook_sheet_names(zf: zipfile.ZipFile) -> List[str]:
+    """Return the sheet names listed in ``xl/workbook.xml``, in tab order."""
+    import xml.etree.ElementTree as ET
+    
+    workbook_xml = ET.fromstring(zf.read("xl/workbook.xml"))
+    return [sheet.get('name') for sheet in workbook_xml.iter() if sheet.tag.endswith('}sheet')]
+
+def _sheet_part_name(zf: zipfile.ZipFile, sheet_name: str) -> str:
+    """Return the zip member holding the XML of ``sheet_name``."""
+    import xml.etree.ElementTree as ET
+    
+    workbook_xml = ET.fromstring(zf.read("xl/workbook.xml"))
+    rel_id = None
+    for sheet in workbook_xml.iter():
+        if sheet.tag.endswith('}sheet') and sheet.get('name') == sheet_name:
+            rel_id = sheet.get(f"{{{_OFFICE_REL_NS}}}id")
+            break
+    if rel_id is None:
+        raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in the workbook")
+    
+    rels_xml = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels_xml:
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            # Targets are either absolute ("/xl/worksheets/...") or relative to xl/
+            return target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+    raise SheetNotFoundError(f"Sheet '{sheet_name}' has no worksheet part")
+
+def _replace_zip_member(filename: str, part: str, data: bytes,
+                        compress_level: Optional[int] = None) -> None:
+    """
+    Rewrite the xlsx ``filename`` with the member ``part`` replaced by ``data``.
+
+    The other members are copied unchanged into a temporary file in the same
+    directory, which then replaces the original atomically. Every member is
+    deflated again at ``compress_level`` (``None`` for zlib's default).
+    """
+    fd, temp_path = tempfile.mkstemp(suffix='.xlsx', dir=os.path.dirname(os.path.abspath(filename)))
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(filename) as src, zipfile.ZipFile(temp_path, 'w') as out:
+            for item in src.infolist():
+                out.writestr(item, data if item.filename == part else src.read(item.filename),
+                             compresslevel=compress_level)
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+# Sheets given cached formula results by write_cached_formula_values, by
+# absolute path. openpyxl drops cached values when it loads a file, so saves
+# made through the workbook cache evaluate and patch these sheets again.
+# rename_sheet_tool and delete_sheet_tool keep the names in step.
+_cached_value_sheets: Dict[str, Set[str]] = {}
+
+def write_cached_formula_values(filename: str, sheet_name: str,
+                                values: Dict[str, Union[int, float]]) -> int:
+    """
+    Store precomputed formula results in a saved workbook.
+
+    openpyxl writes formula cells with an empty cached value, so readers using
+    ``data_only=True`` (or pandas) see ``None`` until Excel recalculates.
+    This patches the sheet XML in a single pass, adding ``<v>`` results to the
+    given formula cells, and replaces the file atomically.
+
+    The sheet is remembered for the rest of the session: every later save
+    through the workbook cache stores the results of its simple formulas
+    again, recomputed from the current data. Files written by other means
+    (``save_workbook`` on another copy, Excel itself) lose them until Excel
+    recalculates.
+
+    Args:
+        filename (str): Path to a saved ``.xlsx`` file.
+        sheet_name (str): Sheet that holds the formulas.
+        values (dict): Cell coordinate to value, e.g. from :func:`evaluate_formula_cells`.
+
+    Returns:
+        Number of the given cells whose results are stored in the file,
+        including those a save through the cache had already stored.
+
+    Raises:
+        SheetNotFoundError: If the sheet does not exist.
+        ExcelMCPError: If the file cannot be rewritten.
+    """
+    if not values:
+        return 0
+    
+    stored, changed = _patch_cached_values(filename, sheet_name, values)
+    with _workbook_cache_lock:
+        _cached_value_sheets.setdefault(os.path.abspath(filename), set()).add(sheet_name)
+        if changed:
+            forget_cached_workbook(filename)
+    return stored
+
+def _rename_cached_value_sheet(filename: str, old_name: str, new_name: Optional[str] = None) -> None:
+    """Follow a renamed sheet in :data:`_cached_value_sheets`, or forget it when ``new_name`` is ``None``."""
+    with _workbook_cache_lock:
+        sheets = _cached_value_sheets.get(os.path.abspath(filename))
+        if sheets is None or old_name not in sheets:
+            return
+        sheets.discard(old_name)
+        if new_name is not None:
+            sheets.add(new_name)
+
+def _patch_cached_values(filename: str, sheet_name: str, values: Dict[str, Union[int, float]],
+                         compress_level: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Store ``<v>`` results in the formula cells of ``sheet_name``; see :func:`write_cached_formula_values`.
+
+    Returns:
+        ``(stored, changed)``: cells of ``values`` whose result is now in the
+        file, and how many of them this call had to write.
+    """
+    try:
+        with zipfile.ZipFile(filename) as zf:
+            part = _sheet_part_name(zf, sheet_name)
+            xml = zf.read(part).decode('utf-8')
+            
+            stored = changed = 0
+            def _patch(match):
+                nonlocal stored, changed
+                value = values.get(match.group(1))
+                # Leave typed cells (t="str", shared strings...) untouched
+                if value is None or 't=' in match.group(2):
+                    return match.group(0)
+                stored += 1
+                cached = f'<v>{value!r}</v>'
+                if match.group(4) == cached:
+                    return match.group(0)
+                changed += 1
+                return f'<c r="{match.group(1)}"{match.group(2)}><f>{match.group(3)}</f>{cached}</c>'
+            
+            xml = re.sub(r'<c r="([A-Z]+\d+)"([^>]*)><f>([^<]*)</f>(<v\s*/>|<v>[^<]*</v>)</c>', _patch, xml)
+            if not changed:
+                return stored, 0
+        
+        _replace_zip_member(filename, part, xml.encode('utf-8'), compress_level)
+        return stored, changed
+    except ExcelMCPError:
+        raise
+    except Exception as e:
+        raise ExcelMCPError(f"Error writing cached formula values: {e}")
+
 def remove_empty_rows_before_data(ws: Any, start_row: int, start_col: int, end_col: int) -> int:
     """
     Remove empty rows before actual data starts.
@@ -995,16 +1377,45 @@ def smart_header_renaming(headers: List[str], data_sample: List[List[Any]]) -> L
     
     return improved_headers
 
+# Chart positions per worksheet, stored with the sheet title and chart anchors
+# they were computed from so that adding, removing or moving a chart
+# invalidates the entry
+_chart_position_cache: "weakref.WeakKeyDictionary[Any, Tuple[Tuple[Any, ...], List[Dict[str, Any]]]]" = weakref.WeakKeyDictionary()
+
+def _chart_anchor_key(chart_ref: Any) -> Any:
+    """Describe where an entry of ``ws._charts`` is anchored, for :data:`_chart_position_cache`."""
+    try:
+        anchor = chart_ref[1]
+    except (TypeError, IndexError, KeyError):
+        anchor = getattr(chart_ref, 'anchor', None)
+    if anchor is None or isinstance(anchor, str):
+        return anchor
+    markers = (getattr(anchor, '_from', None), getattr(anchor, 'to', None) or getattr(anchor, '_to', None))
+    return tuple((marker.col, marker.row) if marker is not None else None for marker in markers)
+
 def get_existing_chart_positions(ws: Any) -> List[Dict[str, Any]]:
     """
     Get positions and dimensions of all existing charts in the worksheet.
     
+    Results are cached per worksheet until its title or the anchors of its
+    charts change.
+    
     Args:
         ws: Worksheet object
         
     Returns:
-        List of chart position dictionaries with start/end coordinates
+        List of chart position dictionaries with start/end coordinates,
+        sorted by starting row
     """
+    charts_key = (getattr(ws, 'title', None),
+                  tuple(_chart_anchor_key(chart_ref) for chart_ref in getattr(ws, '_charts', None) or ()))
+    try:
+        cached = _chart_position_cache.get(ws)
+    except TypeError:
+        cached = None
+    if cached is not None and cached[0] == charts_key:
+        return list(cached[1])
+    
     chart_positions = []
     
     try:
@@ -1049,12 +1460,17 @@ def get_existing_chart_positions(ws: Any) -> List[Dict[str, Any]]:
                         
                 except Exception as e:
                     # If we can't parse a chart, log and continue
-                    logger.warning(f"Could not parse chart position: {e}")
+                    logger.warning("Could not parse chart position: %s", e)
                     continue
     except Exception as e:
-        logger.warning(f"Error getting chart positions: {e}")
+        logger.warning("Error getting chart positions: %s", e)
     
-    return chart_positions
+    chart_positions.sort(key=lambda pos: pos['start_row'])
+    try:
+        _chart_position_cache[ws] = (charts_key, chart_positions)
+    except TypeError:
+        pass  # Worksheet type without weak reference support
+    return list(chart_positions)
 
 def check_area_overlap(start_col: int, start_row: int, width: int, height: int, 
                       existing_positions: List[Dict[str, Any]], 
@@ -1135,7 +1551,8 @@ def check_content_overlap(ws: Any, start_col: int, start_row: int, width: int, h
         return True  # Error accessing area, consider it occupied
 
 def find_optimal_chart_position(ws: Any, preferred_col: int = 6, preferred_row: int = 1, 
-                               chart_width: int = 8, chart_height: int = 15) -> str:
+                               chart_width: int = 8, chart_height: int = 15,
+                               existing_charts: Optional[List[Dict[str, Any]]] = None) -> str:
     """
     Find optimal position for chart with intelligent overlap prevention.
     
@@ -1151,6 +1568,8 @@ def find_optimal_chart_position(ws: Any, preferred_col: int = 6, preferred_row:
         preferred_row: Preferred starting row (0-based)
         chart_width: Chart width in columns (default: 8)
         chart_height: Chart height in rows (default: 15)
+        existing_charts: Chart positions already obtained from
+            get_existing_chart_positions, to avoid scanning the sheet again
         
     Returns:
         Optimal position string (e.g., "F1", "J5")
@@ -1162,7 +1581,8 @@ def find_optimal_chart_position(ws: Any, preferred_col: int = 6, preferred_row:
     chart_height = int(chart_height) if chart_height is not None else 15
     
     # Get all existing chart positions
-    existing_charts = get_existing_chart_positions(ws)
+    if existing_charts is None:
+        existing_charts = get_existing_chart_positions(ws)
     
     # Professional spacing requirements
     MIN_SPACING_COLS = 2  # Minimum columns between charts
@@ -1209,7 +1629,7 @@ def find_optimal_chart_position(ws: Any, preferred_col: int = 6, preferred_row:
     emergency_row = 1
     col_letter = get_column_letter(emergency_col + 1)
     
-    logger.warning(f"All optimal chart positions occupied, using emergency position {col_letter}{emergency_row}")
+    logger.warning("All optimal chart positions occupied, using emergency position %s%s", col_letter, emergency_row)
     return f"{col_letter}{emergency_row}"
 
 def get_chart_layout_recommendations(ws: Any, data_ranges: List[str]) -> Dict[str, Any]:
@@ -1401,7 +1821,7 @@ def comprehensive_data_cleanup(ws: Any, start_cell: str = "A1") -> Tuple[str, Li
             # Clean header value
             clean_header = str(header_val).strip()
             # Remove common issues
-            clean_header = clean_header.replace('\n', ' ').replace('\r', ' ')
+            clean_header = clean_header.translate(_LINE_BREAK_TABLE)
             headers.append(clean_header)
     
     # Extract sample data for header analysis (skip the header row)
@@ -1455,20 +1875,21 @@ def comprehensive_data_cleanup(ws: Any, start_cell: str = "A1") -> Tuple[str, Li
     # Add smart formulas to enhance the data
     try:
         formula_result = add_smart_formulas_to_data(ws, optimized_range, add_totals=True)
-        logger.info(f"Smart formulas added: {formula_result.get('message', '')}")
+        logger.info("Smart formulas added: %s", formula_result.get('message', ''))
     except Exception as e:
-        logger.warning(f"Could not add smart formulas: {e}")
+        logger.warning("Could not add smart formulas: %s", e)
     
     return optimized_range, improved_headers
 
-def optimize_entire_workbook(wb: Any) -> None:
+def optimize_entire_workbook(wb: Any, sheet_names: Optional[List[str]] = None) -> None:
     """
     Apply comprehensive optimization to all sheets in a workbook.
     
     Args:
         wb: Workbook object
+        sheet_names: Only optimize these sheets (default: all of them)
     """
-    for sheet_name in wb.sheetnames:
+    for sheet_name in sheet_names or wb.sheetnames:
         ws = wb[sheet_name]
         
         try:
@@ -1484,7 +1905,7 @@ def optimize_entire_workbook(wb: Any) -> None:
             
         except Exception as e:
             # Log error but continue with other sheets
-            logger.warning(f"Error optimizing sheet '{sheet_name}': {e}")
+            logger.warning("Error optimizing sheet '%s': %s", sheet_name, e)
             continue
 
 # Common utilities 
@@ -1496,6 +1917,7 @@ class ExcelRange:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def parse_cell_ref(cell_ref: str) -> Tuple[int, int]:
         """
         Convert an A1-style cell reference to zero-based (row, column) coordinates.
@@ -1597,6 +2019,7 @@ class ExcelRange:
         return f"{col_str}{row_val}"
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def range_to_a1(start_row: int, start_col: int, end_row: int, end_col: int) -> str:
         """
         Convert zero-based range coordinates to an A1:B5 style range.
@@ -1702,6 +2125,11 @@ CHART_COLOR_SCHEMES = {
     'dark-orange': ['C55A11', 'ED7D31', 'F4B183', 'FFC000', 'FFD966', 'FF8C00', 'FF7F50', 'FF4500']
 }
 
+@functools.lru_cache(maxsize=1024)
+def _parse_range(range_str: str) -> Tuple[int, int, int, int]:
+    """Memoized ExcelRange.parse_range; tools keep reusing the same few ranges."""
+    return ExcelRange.parse_range(range_str)
+
 # Helper function to obtain a worksheet (unified)
 def get_sheet(wb, sheet_name_or_index) -> Any:
     """Retrieve a worksheet by name or index.
@@ -1792,21 +2220,21 @@ def apply_chart_style(chart, style):
     
     if style_number is None:
         style_str = str(style) if style else "None"
-        logger.warning(f"Invalid chart style: '{style_str}'. Must be a number between 1-48 or a valid style name.")
+        logger.warning("Invalid chart style: '%s'. Must be a number between 1-48 or a valid style name.", style_str)
         logger.info("Valid style names include: 'dark-blue', 'light-1', 'colorful-3', etc.")
         return False
         
     if not (1 <= style_number <= 48):
-        logger.warning(f"Invalid chart style: {style_number}. It must be between 1 and 48.")
+        logger.warning("Invalid chart style: %s. It must be between 1 and 48.", style_number)
         return False
     
     # Step 1: apply the numeric style to native Excel attributes
     try:
         # The style property in openpyxl corresponds to the Excel style number
         chart.style = style_number
-        logger.info(f"Applied native style {style_number} to chart")
+        logger.info("Applied native style %s to chart", style_number)
     except Exception as e:
-        logger.warning(f"Error applying style {style_number}: {e}")
+        logger.warning("Error applying style %s: %s", style_number, e)
     
     # Step 2: apply the color palette associated with the style's theme
     palette_name = STYLE_TO_PALETTE.get(style_number, 'default')
@@ -1830,11 +2258,11 @@ def apply_chart_style(chart, style):
                     
                 series.graphicalProperties.solidFill = ColorChoice(srgbClr=color)
                 
-        logger.info(f"Applied style {style_number} with palette '{palette_name}' to chart")
+        logger.info("Applied style %s with palette '%s' to chart", style_number, palette_name)
         return True
         
     except Exception as e:
-        logger.warning(f"Error applying colors for style {style_number}: {e}")
+        logger.warning("Error applying colors for style %s: %s", style_number, e)
         return False
 
 def determine_orientation(ws: Any, min_row: int, min_col: int, max_row: int, max_col: int) -> bool:
@@ -1908,13 +2336,22 @@ def _range_has_blank(ws: Any, min_row: int, min_col: int, max_row: int, max_col:
 # ----------------------------------------
 
 # 1. Workbook management
-def create_workbook(filename: str, overwrite: bool = False) -> Any:
+def create_workbook(filename: str, overwrite: bool = False, write_only: bool = False,
+                    empty: bool = False) -> Any:
     """
     Create a new empty Excel file.
 
     Args:
         filename (str): Full path and name of the file to create.
         overwrite (bool, optional): Overwrite existing file if ``True``.
+        write_only (bool, optional): Create an openpyxl write-only workbook.
+            Rows added with ``ws.append`` are streamed out instead of kept in
+            memory, which suits large generated files, but cells cannot be
+            read back and the workbook can only be saved once. It starts
+            without sheets.
+        empty (bool, optional): Leave out openpyxl's default "Sheet", for
+            callers that add their own sheets. Add at least one before
+            saving; Excel cannot open a workbook without sheets.
 
     Returns:
         Workbook object.
@@ -1925,17 +2362,25 @@ def create_workbook(filename: str, overwrite: bool = False) -> Any:
     if os.path.exists(filename) and not overwrite:
         raise FileExistsError(f"El archivo '{filename}' ya existe. Use overwrite=True para sobreescribir.")
     
-    wb = openpyxl.Workbook()
-    # Store the filename in the workbook for later use
-    wb.path = filename
+    # Workbook.path is openpyxl's internal part name ("/xl/workbook.xml"),
+    # so the filename must not be stored there or the workbook cannot be saved
+    wb = openpyxl.Workbook(write_only=write_only)
+    if empty and not write_only:
+        wb.remove(wb.active)
     return wb
 
-def open_workbook(filename: str) -> Any:
+def open_workbook(filename: str, read_only: bool = False, data_only: bool = False,
+                  keep_links: bool = True) -> Any:
     """
     Open an existing Excel file.
 
     Args:
         filename (str): Path to the file.
+        read_only (bool, optional): Open in openpyxl's streaming read-only mode.
+            Much faster for metadata-only access such as listing sheets, but the
+            workbook cannot be modified or saved.
+        data_only (bool, optional): Return cached values instead of formulas.
+        keep_links (bool, optional): Keep links to external workbooks.
 
     Returns:
         Workbook object.
@@ -1943,23 +2388,48 @@ def open_workbook(filename: str) -> Any:
     Raises:
         FileNotFoundError: If the file does not exist.
     """
+    # Pending in-memory edits must reach the disk before reading the file
+    flush_cached_workbook(filename)
+
     if not os.path.exists(filename):
         raise FileNotFoundError(f"El archivo '{filename}' no existe.")
     
+    return _load_workbook_file(filename, read_only=read_only, data_only=data_only,
+                               keep_links=keep_links)
+
+def _load_workbook_file(filename: str, read_only: bool = False, data_only: bool = False,
+                        keep_links: bool = True) -> Any:
+    """Parse ``filename`` with openpyxl; callers have already checked that it exists."""
     try:
-        wb = openpyxl.load_workbook(filename)
-        return wb
+        return openpyxl.load_workbook(filename, read_only=read_only, data_only=data_only,
+                                      keep_links=keep_links)
     except Exception as e:
-        logger.error(f"Error opening file '{filename}': {e}")
+        logger.error("Error opening file '%s': %s", filename, e)
         raise ExcelMCPError(f"Error opening file: {e}")
 
-def save_workbook(wb: Any, filename: Optional[str] = None) -> str:
+def optimize_workbook_object(wb: Any, sheet_names: Optional[List[str]] = None) -> None:
+    """
+    Apply the comprehensive layout, formatting and theme optimizations in memory.
+
+    Args:
+        wb: Workbook object.
+        sheet_names (list, optional): Only optimize these sheets.
+    """
+    # First optimize all data and layout
+    optimize_entire_workbook(wb, sheet_names)
+    # Then apply unified theme
+    apply_unified_theme(wb, "professional", sheet_names)
+
+def save_workbook(wb: Any, filename: Optional[str] = None,
+                  compress_level: Optional[int] = None) -> str:
     """
     Save the workbook to disk.
 
     Args:
         wb: Workbook object.
         filename (str, optional): Alternative file name if provided.
+        compress_level (int, optional): Deflate level for the zip members.
+            ``None`` keeps openpyxl's default.
 
     Returns:
         Path to the saved file.
@@ -1977,21 +2447,33 @@ def save_workbook(wb: Any, filename: Optional[str] = None) -> str:
         elif not filename:
             raise ExcelMCPError("Debe proporcionar un nombre de archivo")
         
-        # Apply comprehensive optimization before saving
-        try:
-            # First optimize all data and layout
-            optimize_entire_workbook(wb)
-            # Then apply unified theme
-            apply_unified_theme(wb, "professional")
-        except Exception:
-            pass
+        # Apply comprehensive optimization before saving; the cells of a
+        # write-only workbook have already been streamed out
+        if not getattr(wb, "write_only", False):
+            try:
+                optimize_workbook_object(wb)
+            except Exception:
+                pass
         
-        wb.save(filename)
+        if compress_level is None:
+            wb.save(filename)
+        else:
+            _write_workbook(wb, filename, compress_level)
         return filename
     except Exception as e:
-        logger.error(f"Error saving workbook to '{filename}': {e}")
+        logger.error("Error saving workbook to '%s': %s", filename, e)
         raise ExcelMCPError(f"Error saving workbook: {e}")
 
+def _write_workbook(wb: Any, filename: str, compress_level: int) -> None:
+    """Same as ``wb.save(filename)`` with the zip members deflated at ``compress_level``."""
+    import datetime
+    from openpyxl.writer.excel import ExcelWriter
+    
+    archive = zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED, allowZip64=True,
+                              compresslevel=compress_level)
+    wb.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+    ExcelWriter(wb, archive).save()
+
 def close_workbook(wb: Any) -> None:
     """
     Close the workbook in memory.
@@ -2002,16 +2484,464 @@ def close_workbook(wb: Any) -> None:
     Returns:
         None.
     """
-    if not wb:
+    # Only workbooks loaded from a file (read-only ones keep it open) have
+    # an archive to close; new workbooks have nothing to release
+    archive = getattr(wb, "_archive", None) if wb else None
+    if archive is None:
+        return
+    
+    try:
+        archive.close()
+    except Exception as e:
+        logger.warning("Warning while closing workbook: %s", e)
+
+# In-memory cache of parsed workbooks shared by consecutive tool calls.
+# Entries are keyed by absolute path and validated against the file's
+# modification time and size, so external edits are picked up on next use.
+# Entries modified by editing tools are marked dirty and written back by a
+# background writer shortly after the edit, on flush, on eviction, before
+# the file is read again, or at interpreter exit.
+WORKBOOK_CACHE_SIZE = 8
+_workbook_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_workbook_cache_lock = threading.RLock()
+# Last error of a save that failed outside a tool call (background writer or
+# flush_workbook_cache), by path. The entry stays dirty until a save succeeds.
+_save_errors: Dict[str, str] = {}
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """Return ``(mtime_ns, size)`` used to detect changes on disk."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def _drop_cache_entry(key: str, flush: bool = False) -> None:
+    """Remove a cache entry and release its resources, saving it first if requested."""
+    if flush:
+        try:
+            flush_cached_workbook(key, compress_level=None)
+        except ExcelMCPError as e:
+            logger.error("Could not write pending changes to '%s': %s", key, e)
+    _save_errors.pop(key, None)
+    entry = _workbook_cache.pop(key, None)
+    if entry is None:
         return
+    close_workbook(entry["wb"])
+
+def get_cached_workbook(filename: str, read_only: bool = False) -> Any:
+    """
+    Return a parsed workbook for ``filename``, reusing a cached copy when possible.
+
+    A read-only request is served by any valid entry. A writable request
+    upgrades a read-only entry by reloading the file in normal mode.
+
+    Args:
+        filename (str): Path to the file.
+        read_only (bool, optional): ``True`` if the caller only reads metadata
+            or values and will not modify or save the workbook.
+
+    Returns:
+        Workbook object owned by the cache. Do not close it.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    key = os.path.abspath(filename)
+    with _workbook_cache_lock:
+        entry = _workbook_cache.get(key)
+        if entry is not None and entry["dirty"]:
+            # Unsaved edits are newer than whatever is on disk
+            _workbook_cache.move_to_end(key)
+            return entry["wb"]
+
+        try:
+            signature = _file_signature(key)
+        except OSError:
+            _drop_cache_entry(key)
+            raise FileNotFoundError(f"File does not exist: {filename}")
+
+        if entry is not None:
+            if entry["signature"] == signature and (read_only or not entry["read_only"]):
+                _workbook_cache.move_to_end(key)
+                return entry["wb"]
+            _drop_cache_entry(key)
+
+        # The stat above already found the file and no edits are pending, so
+        # skip open_workbook's flush and second stat. Read-only entries are
+        # never saved back, so they also skip loading external links
+        wb = _load_workbook_file(key, read_only=read_only, keep_links=not read_only)
+        _workbook_cache[key] = {"wb": wb, "signature": signature, "read_only": read_only,
+                                "dirty": False, "saved": False, "dirty_sheets": set(),
+                                "layout": None, "compact": False}
+        while len(_workbook_cache) > WORKBOOK_CACHE_SIZE:
+            _drop_cache_entry(next(iter(_workbook_cache)), flush=True)
+        return wb
+
+class _WorkbookUnchanged(Exception):
+    """Raised inside :func:`cached_workbook_edit` when the block changed nothing."""
+
+@contextlib.contextmanager
+def cached_workbook_edit(filename: str, defer_save: bool = False,
+                         sheet_name: Optional[str] = None):
+    """
+    Yield the cached writable workbook for ``filename`` and mark it dirty on success.
+
+    The file is saved by the background writer (or right away when the
+    ``SYNC_SAVE`` environment variable is ``1``). If the block raises, none of
+    its changes are kept: a workbook with no earlier pending edits is dropped
+    so the next call starts again from the file on disk, and one with pending
+    edits is put back to its state before the block (see
+    :func:`_snapshot_workbook`). A block that raises ``_WorkbookUnchanged``
+    ends quietly and nothing is marked or saved.
+
+    Args:
+        filename (str): Path to the file.
+        defer_save (bool, optional): Keep the edit in memory only. It is written
+            by the next flush, eviction, non-deferred edit or at exit.
+        sheet_name (str, optional): The only sheet the block changes, if known.
+            When it is the only edited sheet, the save may rewrite just its XML.
+
+    Yields:
+        Workbook object owned by the cache. Do not close or save it.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ExcelMCPError: If an earlier background save of the file failed and
+            fails again; the pending edits are kept in memory.
+    """
+    key = os.path.abspath(filename)
+    with _workbook_cache_lock:
+        if key in _save_errors:
+            # Retry the failed save before taking more edits that could not be saved either
+            try:
+                flush_cached_workbook(key)
+            except Exception as e:
+                raise ExcelMCPError(f"Pending changes to '{filename}' could not be saved: {e}")
+        wb = get_cached_workbook(filename)
+        snapshot = None
+        if _workbook_cache[key]["dirty"]:
+            if _OPENPYXL_INTERNALS_OK:
+                snapshot = _snapshot_workbook(wb, sheet_name)
+            else:
+                # Save the earlier edits so a failed block can be dropped with the entry
+                flush_cached_workbook(key)
+        try:
+            yield wb
+        except _WorkbookUnchanged:
+            return
+        except Exception:
+            if snapshot is None:
+                _drop_cache_entry(key)
+            else:
+                _restore_workbook(wb, snapshot)
+            raise
+        entry = _workbook_cache.get(key)
+        if entry is not None and entry["wb"] is wb:
+            entry["dirty"] = True
+            entry["dirty_sheets"].add(sheet_name)
+            if defer_save:
+                return
+            if SYNC_SAVE:
+                flush_cached_workbook(key)
+            else:
+                _schedule_save(key)
+
+def _snapshot_workbook(wb: Any, sheet_name: Optional[str] = None) -> Tuple:
+    """
+    Record what a failed edit of ``wb`` must undo, for :func:`_restore_workbook`.
+
+    This covers the sheet list, tab order, titles and active sheet, and the
+    value, type and style of the cells of ``sheet_name`` (of every worksheet
+    when ``None``). Other sheet parts (merged cells, tables, charts...) are not
+    recorded. Uses openpyxl internals; only call it when
+    ``_OPENPYXL_INTERNALS_OK`` is true.
+    """
+    sheets = [(ws, ws.title) for ws in wb._sheets]
+    cells = [(ws, _snapshot_cells(ws)) for ws in wb.worksheets
+             if sheet_name is None or ws.title == sheet_name]
+    return sheets, wb._active_sheet_index, cells
+
+def _restore_workbook(wb: Any, snapshot: Tuple) -> None:
+    """Put ``wb`` back to a :func:`_snapshot_workbook` state."""
+    sheets, active_index, cells = snapshot
+    wb._sheets = [ws for ws, _ in sheets]
+    for ws, title in sheets:
+        if ws.title != title:
+            ws.title = title
+    wb._active_sheet_index = active_index
+    for ws, cell_snapshot in cells:
+        _restore_cells(ws, cell_snapshot)
+
+def _snapshot_cells(ws: Any) -> Dict[Tuple[int, int], Tuple[Any, Any, str, Any]]:
+    """
+    Record the value, type and style of every cell of ``ws`` for :func:`_restore_cells`.
+
+    Both use openpyxl internals, like :func:`_snapshot_workbook`.
+    """
+    return {key: (cell, cell._value, cell.data_type, copy.copy(cell._style))
+            for key, cell in ws._cells.items()}
+
+def _restore_cells(ws: Any, snapshot: Dict[Tuple[int, int], Tuple[Any, Any, str, Any]]) -> None:
+    """Put ``ws`` back to a :func:`_snapshot_cells` state, dropping cells created since."""
+    for cell, value, data_type, style in snapshot.values():
+        cell._value = value
+        cell.data_type = data_type
+        cell._style = style
+    ws._cells = {key: state[0] for key, state in snapshot.items()}
+
+def flush_cached_workbook(filename: str,
+                          compress_level: Optional[int] = CACHE_SAVE_COMPRESS_LEVEL) -> bool:
+    """
+    Write pending in-memory edits for ``filename`` to disk.
+
+    Args:
+        filename (str): Path to the file.
+        compress_level (int, optional): Deflate level for the saved file;
+            ``None`` for the default level used for final saves.
+
+    Returns:
+        ``True`` if the workbook was saved, ``False`` if there was nothing to write.
+
+    Raises:
+        ExcelMCPError: If an error occurs while saving.
+    """
+    key = os.path.abspath(filename)
+    with _workbook_cache_lock:
+        entry = _workbook_cache.get(key)
+        if entry is None or not entry["dirty"]:
+            return False
+        if FAST_SHEET_SAVE and _save_edited_sheet(entry, key, compress_level):
+            rewritten = set(entry["dirty_sheets"])
+        else:
+            save_workbook(entry["wb"], key, compress_level)
+            entry["layout"] = _workbook_layout(entry["wb"]) if FAST_SHEET_SAVE else None
+            rewritten = None
+        _restore_cached_values(entry["wb"], key, rewritten, compress_level)
+        # Both paths deflate every member of the file at compress_level
+        entry["compact"] = compress_level is None
+        entry["dirty"] = False
+        entry["dirty_sheets"].clear()
+        entry["saved"] = True
+        entry["signature"] = _file_signature(key)
+        _save_errors.pop(key, None)
+        return True
+
+def _restore_cached_values(wb: Any, key: str, sheet_names: Optional[Set[str]],
+                           compress_level: Optional[int] = None) -> None:
+    """
+    Patch formula results back into the sheets of ``key`` that had them before a save.
+
+    Args:
+        sheet_names: Sheets the save rewrote, or ``None`` for all of them.
+    """
+    for sheet_name in _cached_value_sheets.get(key, ()):
+        if sheet_name not in wb.sheetnames or (sheet_names is not None and sheet_name not in sheet_names):
+            continue
+        ws = wb[sheet_name]
+        try:
+            _patch_cached_values(key, sheet_name, evaluate_formula_cells(ws, ws.dimensions),
+                                 compress_level)
+        except ExcelMCPError as e:
+            # The edits themselves are saved; only the cached results are missing
+            logger.warning("Could not store formula results of '%s' in '%s': %s", sheet_name, key, e)
+
+def _workbook_layout(wb: Any) -> Tuple:
+    """Summarize what a save writes outside the sheet XML: sheets, styles and names."""
+    return (tuple(wb.sheetnames), wb._active_sheet_index, len(wb._cell_styles),
+            len(wb._named_styles), len(wb._differential_styles.styles), len(wb.defined_names),
+            tuple((ws.sheet_state, ws.auto_filter.ref, ws.print_title_rows, ws.print_title_cols,
+                   ws.print_area, len(ws.defined_names)) for ws in wb.worksheets))
+
+def _save_edited_sheet(entry: Dict[str, Any], key: str,
+                       compress_level: Optional[int] = None) -> bool:
+    """
+    Save a cache entry by rewriting only the XML of the one sheet edited since the last save.
+
+    This applies when the file on disk is the cache's own last full save and
+    the edits left everything else as it was: same sheets, no new styles or
+    names, and no charts, images, tables, comments or links on the sheet,
+    which would need parts of their own.
+
+    Returns:
+        ``True`` if the sheet was written, ``False`` if a full save is needed.
+    """
+    wb = entry["wb"]
+    if entry["layout"] is None or len(entry["dirty_sheets"]) != 1:
+        return False
+    sheet_name = next(iter(entry["dirty_sheets"]))
+    if sheet_name is None or sheet_name not in wb.sheetnames:
+        return False
+    ws = wb[sheet_name]
+    if ws._charts or ws._images or ws.tables or ws._pivots or ws.legacy_drawing is not None:
+        return False
+    try:
+        if _file_signature(key) != entry["signature"]:
+            return False
+    except OSError:
+        return False
     
+    # Same optimization save_workbook applies, limited to the edited sheet
     try:
-        # Openpyxl does not really have a close() method,
-        # but we can remove references to help the GC
-        if hasattr(wb, "_archive"):
-            wb._archive.close()
+        optimize_workbook_object(wb, [sheet_name])
+    except Exception:
+        pass
+    
+    part = ws.path[1:]
+    writer = WorksheetWriter(ws, out=io.BytesIO())
+    writer.write()
+    xml = writer.read()
+    # Conditional formats may register new differential styles while writing
+    if writer._rels or ws._comments or _workbook_layout(wb) != entry["layout"]:
+        return False
+    
+    try:
+        with zipfile.ZipFile(key) as zf:
+            names = set(zf.namelist())
+        if part not in names or f"{os.path.dirname(part)}/_rels/{os.path.basename(part)}.rels" in names:
+            return False
+        _replace_zip_member(key, part, xml, compress_level)
+    except Exception as e:
+        logger.error("Error saving sheet '%s' to '%s': %s", sheet_name, key, e)
+        raise ExcelMCPError(f"Error saving workbook: {e}")
+    return True
+
+def workbook_is_optimized(filename: str, compact: bool = False) -> bool:
+    """
+    Return ``True`` if ``filename`` on disk is exactly what the cache last wrote.
+
+    save_workbook optimizes every workbook it writes, so such a file needs no
+    further optimization until it is edited or changed by another program.
+
+    Args:
+        filename (str): Path to the file.
+        compact (bool, optional): Also require that the last save used the
+            default compression rather than the cache's faster level.
+    """
+    key = os.path.abspath(filename)
+    with _workbook_cache_lock:
+        entry = _workbook_cache.get(key)
+        if entry is None or entry["dirty"] or not entry["saved"]:
+            return False
+        if compact and not entry["compact"]:
+            return False
+        try:
+            return entry["signature"] == _file_signature(key)
+        except OSError:
+            return False
+
+@functools.lru_cache(maxsize=64)
+def _sheet_names_on_disk(path: str, signature: Tuple[int, int]) -> Tuple[str, ...]:
+    """Sheet names of ``path``, memoized per file version so repeated calls skip the zip."""
+    with zipfile.ZipFile(path) as zf:
+        return tuple(_workbook_sheet_names(zf))
+
+def get_sheet_names(filename: str) -> List[str]:
+    """
+    Return the sheet names of ``filename``, reading only ``xl/workbook.xml`` when possible.
+
+    A workbook with pending edits answers from memory. Otherwise no sheet,
+    style or shared-string XML is parsed; openpyxl is only used if the
+    workbook part cannot be read directly.
+
+    Args:
+        filename (str): Path to the file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    key = os.path.abspath(filename)
+    with _workbook_cache_lock:
+        entry = _workbook_cache.get(key)
+        if entry is not None and entry["dirty"]:
+            return list(list_sheets(entry["wb"]))
+    
+    try:
+        signature = _file_signature(key)
+    except OSError:
+        raise FileNotFoundError(f"File does not exist: {filename}")
+    try:
+        return list(_sheet_names_on_disk(key, signature))
     except Exception as e:
-        logger.warning(f"Warning while closing workbook: {e}")
+        logger.debug("Reading sheet names from '%s' with openpyxl: %s", filename, e)
+        return list(list_sheets(get_cached_workbook(filename, read_only=True)))
+
+def flush_workbook_cache() -> List[str]:
+    """
+    Write every workbook with pending edits to disk.
+
+    Errors are logged and kept for :func:`pending_save_errors`; they do not
+    stop the remaining files from being saved.
+
+    Returns:
+        List of paths that were saved.
+    """
+    flushed = []
+    with _workbook_cache_lock:
+        for key in list(_workbook_cache):
+            try:
+                if flush_cached_workbook(key):
+                    flushed.append(key)
+            except ExcelMCPError as e:
+                logger.error("Could not write pending changes to '%s': %s", key, e)
+                _save_errors[key] = str(e)
+    return flushed
+
+def pending_save_errors() -> Dict[str, str]:
+    """Return ``{path: error}`` for files whose last save failed and whose edits are still unsaved."""
+    with _workbook_cache_lock:
+        return dict(_save_errors)
+
+atexit.register(flush_workbook_cache)
+
+# Edits are written by a single background thread. It waits
+# SAVE_COALESCE_DELAY seconds after the first queued path so that a burst of
+# edits to the same file ends in one save. Set SYNC_SAVE=1 to save before
+# each editing tool returns instead.
+SYNC_SAVE = os.environ.get("SYNC_SAVE") == "1"
+SAVE_COALESCE_DELAY = 1.0
+_save_queue: "queue.Queue[str]" = queue.Queue()
+_save_worker_lock = threading.Lock()
+_save_worker: Optional[threading.Thread] = None
+
+def _save_worker_loop() -> None:
+    """Save queued paths, merging repeated requests for the same file."""
+    while True:
+        keys = [_save_queue.get()]
+        time.sleep(SAVE_COALESCE_DELAY)
+        while True:
+            try:
+                keys.append(_save_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        for key in dict.fromkeys(keys):
+            try:
+                flush_cached_workbook(key)
+            except Exception as e:
+                # The entry stays dirty; the next edit or flush retries and reports it
+                logger.error("Background save of '%s' failed: %s", key, e)
+                with _workbook_cache_lock:
+                    _save_errors[key] = str(e)
+        for _ in keys:
+            _save_queue.task_done()
+
+def _schedule_save(key: str) -> None:
+    """Queue a background save of the cached workbook ``key``."""
+    global _save_worker
+    with _save_worker_lock:
+        if _save_worker is None:
+            _save_worker = threading.Thread(target=_save_worker_loop, name="excel-mcp-saver",
+                                            daemon=True)
+            _save_worker.start()
+    _save_queue.put(key)
+
+def forget_cached_workbook(filename: str) -> None:
+    """
+    Discard the cached workbook for ``filename``, if any.
+
+    Args:
+        filename (str): Path to the file.
+    """
+    with _workbook_cache_lock:
+        _drop_cache_entry(os.path.abspath(filename))
 
 def list_sheets(wb: Any) -> List[str]:
     """
@@ -2037,6 +2967,42 @@ def list_sheets(wb: Any) -> List[str]:
     
     return sheet_names
 
+def _has_sheet(wb: Any, sheet_name: str) -> bool:
+    """Return ``True`` if ``wb`` contains a sheet called ``sheet_name``."""
+    return sheet_name in wb.sheetnames
+
+def _sheetname_set(wb: Any) -> Set[str]:
+    """Return the sheet names of ``wb`` as a set for repeated membership checks."""
+    return set(list_sheets(wb))
+
+def _get_ws_or_raise(wb: Any, sheet_name: str, file_path: Optional[str] = None) -> Any:
+    """
+    Return the sheet ``sheet_name`` with a single lookup.
+
+    Raises:
+        SheetNotFoundError: If the workbook has no such sheet.
+    """
+    try:
+        return wb[sheet_name]
+    except KeyError:
+        location = f" in {file_path}" if file_path else ""
+        raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist{location}")
+
+@contextlib.contextmanager
+def _edit_sheet(file_path: str, sheet_name: str, defer_save: bool = False):
+    """
+    Yield sheet ``sheet_name`` of the cached workbook for ``file_path``.
+
+    Same as :func:`cached_workbook_edit` plus the sheet lookup, so a missing
+    file or sheet is reported before anything is changed.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        SheetNotFoundError: If the workbook has no such sheet.
+    """
+    with cached_workbook_edit(file_path, defer_save=defer_save, sheet_name=sheet_name) as wb:
+        yield _get_ws_or_raise(wb, sheet_name, file_path)
+
 def add_sheet(wb: Any, sheet_name: str, index: Optional[int] = None) -> Any:
     """
     Add a new empty worksheet.
@@ -2056,7 +3022,7 @@ def add_sheet(wb: Any, sheet_name: str, index: Optional[int] = None) -> Any:
         raise ExcelMCPError("Workbook cannot be None")
     
     # Check if a sheet with that name already exists
-    if sheet_name in list_sheets(wb):
+    if _has_sheet(wb, sheet_name):
         raise SheetExistsError(f"A sheet named '{sheet_name}' already exists")
     
     # Create new sheet
@@ -2082,14 +3048,14 @@ def delete_sheet(wb: Any, sheet_name: str) -> None:
         raise ExcelMCPError("Workbook cannot be None")
     
     # Check that the sheet exists
-    if sheet_name not in list_sheets(wb):
+    if not _has_sheet(wb, sheet_name):
         raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in the workbook")
     
     # Delete the sheet
     try:
         del wb[sheet_name]
     except Exception as e:
-        logger.error(f"Error deleting sheet '{sheet_name}': {e}")
+        logger.error("Error deleting sheet '%s': %s", sheet_name, e)
         raise ExcelMCPError(f"Error deleting sheet: {e}")
 
 def rename_sheet(wb: Any, old_name: str, new_name: str) -> None:
@@ -2109,20 +3075,44 @@ def rename_sheet(wb: Any, old_name: str, new_name: str) -> None:
         raise ExcelMCPError("Workbook cannot be None")
     
     # Check that the original sheet exists
-    if old_name not in list_sheets(wb):
+    names = _sheetname_set(wb)
+    if old_name not in names:
         raise SheetNotFoundError(f"Sheet '{old_name}' does not exist in the workbook")
     
     # Check that no sheet with the new name exists
-    if new_name in list_sheets(wb) and old_name != new_name:
+    if new_name in names and old_name != new_name:
         raise SheetExistsError(f"A sheet named '{new_name}' already exists")
     
     # Rename the sheet
     try:
         wb[old_name].title = new_name
     except Exception as e:
-        logger.error(f"Error renaming sheet '{old_name}' to '{new_name}': {e}")
+        logger.error("Error renaming sheet '%s' to '%s': %s", old_name, new_name, e)
         raise ExcelMCPError(f"Error renaming sheet: {e}")
 
+@contextlib.contextmanager
+def _edit_or_create_sheet(file_path: str, sheet_name: str):
+    """
+    Yield ``(workbook, worksheet)`` for ``file_path``, making sure ``sheet_name`` exists.
+
+    A new workbook starts with just ``sheet_name`` and is saved when the
+    block ends. An existing one is edited through
+    :func:`cached_workbook_edit`, so it is not parsed again and the cache
+    saves it; the sheet is added when it is missing.
+    """
+    if not os.path.exists(file_path):
+        wb = create_workbook(file_path, empty=True)
+        ws = add_sheet(wb, sheet_name)
+        yield wb, ws
+        save_workbook(wb, file_path)
+        return
+    
+    with cached_workbook_edit(file_path) as wb:
+        # Create the sheet if it doesn't exist
+        if not _has_sheet(wb, sheet_name):
+            add_sheet(wb, sheet_name)
+        yield wb, get_sheet(wb, sheet_name)
+
 # 2. Data reading and exploration
 def read_sheet_data(wb: Any, sheet_name: str, range_str: Optional[str] = None,
                    formulas: bool = False) -> List[List[Any]]:
@@ -2183,6 +3173,129 @@ def read_sheet_data(wb: Any, sheet_name: str, range_str: Optional[str] = None,
     
     return data
 
+def _matches_filter(value: Any, condition: Any) -> bool:
+    """Check one record value against a ``filter_data_tool`` condition."""
+    if isinstance(condition, (list, tuple, set)):
+        return value in condition
+    if not isinstance(condition, dict):
+        return value == condition
+    for op, operand in condition.items():
+        try:
+            if op == 'gt' and not value > operand:
+                return False
+            if op == 'lt' and not value < operand:
+                return False
+        except TypeError:
+            # None or mixed text/number cells never satisfy a comparison
+            return False
+        if op == 'contains' and str(operand).lower() not in str(value if value is not None else '').lower():
+            return False
+    return True
+
+def filter_sheet_data(wb: Any, sheet_name: str, range_str: str,
+                      filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Read a range as records keyed by its header row and keep the matching ones.
+    
+    Args:
+        wb: Openpyxl workbook object
+        sheet_name: Sheet name
+        range_str: Range in ``A1:B5`` format whose first row holds the headers
+        filters: ``{header: condition}``; a condition is a value, a list of
+            allowed values or a dict with ``gt``, ``lt`` and/or ``contains``
+    
+    Returns:
+        List of dictionaries, one per matching data row
+        
+    Raises:
+        SheetNotFoundError: If the sheet does not exist
+        RangeError: If the range is invalid or a filter names an unknown column
+    """
+    rows = read_sheet_data(wb, sheet_name, range_str)
+    if not rows:
+        return []
+    
+    headers = [str(h) if h is not None else f"Column{i + 1}" for i, h in enumerate(rows[0])]
+    filters = filters or {}
+    unknown = [field for field in filters if field not in headers]
+    if unknown:
+        raise RangeError(f"Unknown filter column(s) in range '{range_str}': {', '.join(unknown)}")
+    
+    records = (dict(zip(headers, row)) for row in rows[1:])
+    return [record for record in records
+            if all(_matches_filter(record[field], cond) for field, cond in filters.items())]
+
+def list_xlsb_sheets(filename: str) -> List[str]:
+    """
+    List the sheets of a binary ``.xlsb`` workbook.
+
+    Raises:
+        ExcelMCPError: If the optional ``pyxlsb`` package is not installed.
+    """
+    try:
+        from pyxlsb import open_workbook as open_xlsb
+    except ImportError:
+        raise ExcelMCPError("Reading .xlsb files requires the 'pyxlsb' package")
+    
+    with open_xlsb(filename) as wb:
+        return list(wb.sheets)
+
+def read_xlsb_sheet_data(filename: str, sheet_name: str,
+                         range_str: Optional[str] = None) -> List[List[Any]]:
+    """
+    Read the values of a sheet of a binary ``.xlsb`` workbook.
+
+    openpyxl cannot open ``.xlsb`` files, so they are read with ``pyxlsb``.
+    Only the values Excel last calculated are available, as with
+    ``data_only=True``; the files cannot be modified.
+    
+    Args:
+        filename: Path to the ``.xlsb`` file
+        sheet_name: Sheet name
+        range_str: Range in ``A1:B5`` format or ``None`` for the whole sheet
+    
+    Returns:
+        List of lists with cell values
+        
+    Raises:
+        ExcelMCPError: If the optional ``pyxlsb`` package is not installed
+        SheetNotFoundError: If the sheet does not exist
+        RangeError: If the range is invalid
+    """
+    try:
+        from pyxlsb import open_workbook as open_xlsb
+    except ImportError:
+        raise ExcelMCPError("Reading .xlsb files requires the 'pyxlsb' package")
+    
+    bounds = None
+    if range_str:
+        try:
+            bounds = _parse_range(range_str)
+        except ValueError as e:
+            raise RangeError(f"Invalid range '{range_str}': {e}")
+    
+    with open_xlsb(filename) as wb:
+        if sheet_name not in wb.sheets:
+            raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in the workbook")
+        with wb.get_sheet(sheet_name) as sheet:
+            if bounds is None:
+                return [[cell.v for cell in row] for row in sheet.rows()]
+            
+            # Rows come back dense and 0-based, starting at A1
+            min_row, min_col, max_row, max_col = bounds
+            data = []
+            for row_index, row in enumerate(sheet.rows()):
+                if row_index > max_row:
+                    break
+                if row_index >= min_row:
+                    data.append([row[col].v if col < len(row) else None
+                                 for col in range(min_col, max_col + 1)])
+    
+    # Pad rows past the end of the sheet
+    width = max_col - min_col + 1
+    data.extend([None] * width for _ in range(max_row - min_row + 1 - len(data)))
+    return data
+
 def list_tables(wb: Any, sheet_name: str) -> List[Dict[str, Any]]:
     """
     List all tables defined on an Excel sheet.
@@ -2205,13 +3318,14 @@ def list_tables(wb: Any, sheet_name: str) -> List[Dict[str, Any]]:
     
     # Check if the sheet has tables
     if hasattr(ws, 'tables') and ws.tables:
-        for table_name, table in ws.tables.items():
+        # TableList.items() yields (name, ref) pairs, so walk the Table objects
+        for table in ws.tables.values():
             table_info = {
-                'name': table_name,
+                'name': table.name,
                 'ref': table.ref,
                 'display_name': table.displayName,
-                'header_row': table.headerRowCount > 0,
-                'totals_row': table.totalsRowCount > 0,
+                'header_row': (table.headerRowCount or 0) > 0,
+                'totals_row': (table.totalsRowCount or 0) > 0,
                 'style': table.tableStyleInfo.name if table.tableStyleInfo else None
             }
             
@@ -2325,7 +3439,7 @@ def list_charts(wb: Any, sheet_name: str) -> List[Dict[str, Any]]:
     return charts_info
 
 # 3. Escritura y formato de datos (de excel_writer_mcp.py)
-def write_sheet_data(ws: Any, start_cell: str, data: List[List[Any]]) -> None:
+def write_sheet_data(ws: Any, start_cell: str, data: List[List[Any]], autofit: bool = True) -> None:
     """
     Write a two-dimensional array of values or formulas.
      **Emojis must never be included in text written to cells, labels, titles or Excel charts.**
@@ -2341,6 +3455,9 @@ def write_sheet_data(ws: Any, start_cell: str, data: List[List[Any]]) -> None:
         ws: Openpyxl worksheet object
         start_cell (str): Anchor cell (e.g. "A1")
         data (List[List]): Values or strings "=FORMULA(...)"
+        autofit (bool): Fit column widths and number formats after writing.
+            Callers that finish with save_workbook, which formats every
+            sheet, can pass False to skip this pass.
         
     Raises:
         CellReferenceError: If the cell reference is invalid
@@ -2355,44 +3472,162 @@ def write_sheet_data(ws: Any, start_cell: str, data: List[List[Any]]) -> None:
         # Parsear la celda inicial para obtener fila y columna base
         start_row, start_col = ExcelRange.parse_cell_ref(start_cell)
 
-        # Escribir los datos
-        for i, row_data in enumerate(data):
-            if row_data is None:
-                continue
+        streamed = _OPENPYXL_INTERNALS_OK and start_row >= getattr(ws, '_current_row', start_row + 1)
+        if streamed:
+            # Nothing exists at or below the anchor row, so stream the rows
+            # with ws.append instead of looking up every cell with ws.cell.
+            # Moving the append position needs openpyxl internals
+            ws._current_row = start_row
+            for row_data in data:
+                if row_data is None:
+                    ws.append([])
+                    continue
 
-            if not isinstance(row_data, list):
-                # If it's not a list, treat it as a single value
-                row_data = [row_data]
+                if not isinstance(row_data, list):
+                    # If it's not a list, treat it as a single value
+                    row_data = [row_data]
+
+                if start_col:
+                    # Column-keyed rows keep the offset without padding cells
+                    ws.append({start_col + j + 1: value for j, value in enumerate(row_data)})
+                else:
+                    ws.append(row_data)
+        else:
+            # Escribir los datos
+            for i, row_data in enumerate(data):
+                if row_data is None:
+                    continue
+
+                if not isinstance(row_data, list):
+                    # If it's not a list, treat it as a single value
+                    row_data = [row_data]
 
-            for j, value in enumerate(row_data):
-                # Calcular coordenadas de celda (base 1 para openpyxl)
-                row = start_row + i + 1
-                col = start_col + j + 1
+                for j, value in enumerate(row_data):
+                    # Calcular coordenadas de celda (base 1 para openpyxl)
+                    row = start_row + i + 1
+                    col = start_col + j + 1
 
-                # Escribir el valor
-                cell = ws.cell(row=row, column=col)
-                cell.value = value
+                    # Escribir el valor
+                    cell = ws.cell(row=row, column=col)
+                    cell.value = value
 
         # ----------------------------------------------------
         # Enhanced auto-fit and formatting
         # ----------------------------------------------------
-        # Apply enhanced autofit to all columns
-        try:
-            enhanced_autofit_columns(ws)
-        except Exception:
-            pass
-        
-        # Apply consistent number formatting
-        try:
-            apply_consistent_number_format(ws)
-        except Exception:
-            pass
+        if autofit and streamed and len(data) > BULK_WRITE_ROW_THRESHOLD:
+            # Only the new block changed, so derive its formatting from the
+            # data rather than walking every cell of the sheet twice
+            rows = [[] if row is None else (row if isinstance(row, list) else [row]) for row in data]
+            widths, number_formats, wrapped = _plan_data_formatting(rows)
+            for j, width in widths.items():
+                column_letter = get_column_letter(start_col + j + 1)
+                if column_letter in ws.column_dimensions:
+                    width = max(width, ws.column_dimensions[column_letter].width or 0)
+                ws.column_dimensions[column_letter].width = width
+            for (i, j), number_format in number_formats.items():
+                ws.cell(row=start_row + i + 1, column=start_col + j + 1).number_format = number_format
+            for i, j in wrapped:
+                ws.cell(row=start_row + i + 1, column=start_col + j + 1).alignment = Alignment(wrap_text=True)
+        elif autofit:
+            # Apply enhanced autofit to all columns
+            try:
+                enhanced_autofit_columns(ws)
+            except Exception:
+                pass
+            
+            # Apply consistent number formatting
+            try:
+                apply_consistent_number_format(ws)
+            except Exception:
+                pass
     
     except ValueError as e:
         raise CellReferenceError(f"Invalid cell reference '{start_cell}': {e}")
     except Exception as e:
         raise ExcelMCPError(f"Error writing data: {e}")
 
+def _plan_data_formatting(rows: List[List[Any]]) -> Tuple[Dict[int, float], Dict[Tuple[int, int], str], List[Tuple[int, int]]]:
+    """
+    Work out the formatting enhanced_autofit_columns and
+    apply_consistent_number_format would give ``rows`` once written.
+
+    Returns:
+        Column widths by column offset, number formats by ``(row, column)``
+        offset and the offsets of cells whose text must wrap.
+    """
+    lengths: Dict[int, int] = {}
+    for row in rows:
+        for j, value in enumerate(row):
+            if value:
+                length = max(len(line) for line in str(value).split('\n'))
+                if length > lengths.get(j, 0):
+                    lengths[j] = length
+    widths = {j: min(max(lengths.get(j, 0) + 2, 8.43), 80)
+              for j in range(max((len(row) for row in rows), default=0))}
+
+    def is_fraction(i: int, j: int) -> bool:
+        if 0 <= i < len(rows) and j < len(rows[i]):
+            value = rows[i][j]
+            return bool(value) and isinstance(value, (int, float)) and 0 <= value <= 1
+        return False
+
+    number_formats: Dict[Tuple[int, int], str] = {}
+    wrapped: List[Tuple[int, int]] = []
+    for i, row in enumerate(rows):
+        for j, value in enumerate(row):
+            if isinstance(value, (int, float)):
+                # Same rules as apply_consistent_number_format
+                if 0 <= value <= 1 and (is_fraction(i - 1, j) or is_fraction(i + 1, j)):
+                    number_formats[i, j] = DEFAULT_PERCENTAGE_FORMAT
+                elif abs(value) >= 1000:
+                    number_formats[i, j] = DEFAULT_NUMBER_FORMAT
+            elif isinstance(value, str) and '\n' in value:
+                wrapped.append((i, j))
+    return widths, number_formats, wrapped
+
+def write_sheet_data_write_only(ws: Any, data: List[List[Any]]) -> None:
+    """
+    Stream a two-dimensional array into a write-only worksheet starting at A1.
+
+    A write-only worksheet cannot be read back, so the column widths, text
+    wrapping and number formats that write_sheet_data applies afterwards are
+    computed from ``data`` up front. Only cells that need a style are wrapped
+    in WriteOnlyCell; every other value is appended as is.
+
+    Args:
+        ws: Worksheet created by ``openpyxl.Workbook(write_only=True)``
+        data (List[List]): Values or strings "=FORMULA(...)"
+
+    Raises:
+        ExcelMCPError: If the data cannot be written
+    """
+    if not data or not isinstance(data, list):
+        raise ExcelMCPError("Data must be a non-empty list")
+
+    try:
+        rows = [[] if row is None else (row if isinstance(row, list) else [row]) for row in data]
+        widths, number_formats, wrapped = _plan_data_formatting(rows)
+        wrapped = set(wrapped)
+
+        # Column widths must be set before the first row is written
+        for j, width in widths.items():
+            ws.column_dimensions[get_column_letter(j + 1)].width = width
+
+        for i, row in enumerate(rows):
+            values = []
+            for j, value in enumerate(row):
+                number_format = number_formats.get((i, j))
+                if number_format:
+                    value = WriteOnlyCell(ws, value=value)
+                    value.number_format = number_format
+                elif (i, j) in wrapped:
+                    value = WriteOnlyCell(ws, value=value)
+                    value.alignment = Alignment(wrap_text=True)
+                values.append(value)
+            ws.append(values)
+    except Exception as e:
+        raise ExcelMCPError(f"Error writing data: {e}")
+
 def append_rows(ws: Any, data: List[List[Any]]) -> None:
     """
     Append rows at the end with the given values.
@@ -2420,6 +3655,147 @@ def append_rows(ws: Any, data: List[List[Any]]) -> None:
     except Exception as e:
         raise ExcelMCPError(f"Error adding rows: {e}")
 
+def _clean_str(value: str) -> Any:
+    """
+    Convert a numeric or percentage string to a number.
+
+    Formulas (strings starting with "=") and strings that do not look like
+    numbers are returned unchanged.
+    """
+    if value.startswith('='):
+        return value
+    
+    value_str = value.strip()
+    if value_str[:1] not in _NUMBER_FIRST_CHARS or value_str[-1:] not in _NUMBER_LAST_CHARS:
+        return value
+    if _NUMERIC_STRING_RE.match(value_str):
+        # Try to convert to number
+        number_str = value_str.replace(',', '')
+        try:
+            if '.' in number_str:
+                return float(number_str)
+            return int(number_str)
+        except ValueError:
+            return value  # Keep as string
+    if value_str.endswith('%') and _PERCENT_STRING_RE.match(value_str):
+        # Convert percentage
+        return float(value_str[:-1]) / 100
+    return value
+
+# Cleaners keyed by exact value type; numbers, booleans and anything else
+# without an entry are stored as given
+_VALUE_CLEANERS: Dict[type, Callable[[Any], Any]] = {str: _clean_str}
+
+def _clean_value(value: Any) -> Any:
+    """Convert ``value`` with the cleaner registered for its type, if any."""
+    cleaner = _VALUE_CLEANERS.get(type(value))
+    return cleaner(value) if cleaner else value
+
+def _convert_numeric_columns(rows: List[List[Any]]) -> List[List[Any]]:
+    """
+    Convert the columns of a rectangular block that hold only numeric text.
+
+    Each such column is parsed with pandas in one pass; every other column
+    is returned unchanged for the per-cell cleaning in ``_clean_data``.
+    Without pandas the whole block is left to that per-cell loop.
+    """
+    # Imported here: pandas roughly doubles the server's start-up time and
+    # only large data writes and the import/export helpers need it
+    try:
+        import pandas as pd
+    except ImportError:
+        return rows
+    
+    frame = pd.DataFrame(rows, dtype=object)
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.infer_dtype(values, skipna=False) != "string":
+            continue
+        text = values.str.strip()
+        if not text.str.fullmatch(_NUMERIC_STRING_RE).all():
+            continue
+        digits = text.str.replace(',', '', regex=False)
+        has_dot = digits.str.contains('.', regex=False)
+        # Same int/float rule as the per-cell path; mixed columns stay there
+        if has_dot.all():
+            dtype = float
+        elif not has_dot.any():
+            dtype = 'int64'
+        else:
+            continue
+        try:
+            frame[column] = digits.astype(dtype)
+        except (ValueError, OverflowError):
+            continue
+    return frame.astype(object).values.tolist()
+
+def _clean_data(data: List[Any], pad: bool = True) -> Tuple[List[List[Any]], int]:
+    """
+    Clean a two-dimensional array received by a tool before writing it.
+
+    Scalar rows become one-cell rows, empty values become "", text is
+    stripped and numeric or percentage strings are converted to numbers.
+    With ``pad`` short rows are filled with "" so the block is rectangular.
+
+    Returns:
+        Tuple of (cleaned rows, number of columns of the widest row)
+    """
+    # Bound once, outside the per-cell loop
+    match_number = _NUMERIC_STRING_RE.match
+    match_percent = _PERCENT_STRING_RE.match
+    first_chars = _NUMBER_FIRST_CHARS
+    last_chars = _NUMBER_LAST_CHARS
+    _isinstance, _str, _list, _float, _int = isinstance, str, list, float, int
+    
+    # Large rectangular blocks get their numeric columns parsed column-wise;
+    # the first row is left to the loop below since it is usually a header
+    if len(data) > PANDAS_CLEAN_ROW_THRESHOLD and _isinstance(data[0], _list):
+        width = len(data[0])
+        if all(_isinstance(row, _list) and len(row) == width for row in data):
+            data = data[:1] + _convert_numeric_columns(data[1:])
+    
+    cleaned_data = []
+    ncols = 0
+    for row in data:
+        if not _isinstance(row, _list):
+            # Convert single values to list
+            row = [row]
+        
+        cleaned_row = []
+        append = cleaned_row.append
+        for cell_value in row:
+            if cell_value is None or cell_value == "":
+                append("")
+            elif _isinstance(cell_value, _str):
+                cell_str = cell_value.strip()
+                if cell_str[:1] not in first_chars or cell_str[-1:] not in last_chars:
+                    # Plain text, no need to try the patterns
+                    append(cell_str)
+                elif match_number(cell_str):
+                    # Try to convert to number
+                    number_str = cell_str.replace(',', '')
+                    try:
+                        append(_float(number_str) if '.' in number_str else _int(number_str))
+                    except ValueError:
+                        append(cell_str)
+                elif match_percent(cell_str):
+                    # Convert percentage
+                    append(_float(cell_str[:-1]) / 100)
+                else:
+                    append(cell_str)
+            else:
+                append(cell_value)
+        
+        if len(cleaned_row) > ncols:
+            ncols = len(cleaned_row)
+        cleaned_data.append(cleaned_row)
+    
+    if pad:
+        for cleaned_row in cleaned_data:
+            if len(cleaned_row) < ncols:
+                cleaned_row.extend([""] * (ncols - len(cleaned_row)))
+    return cleaned_data, ncols
+
 def update_cell(ws: Any, cell: str, value_or_formula: Any) -> None:
     """
     Update a single cell.
@@ -2472,7 +3848,7 @@ def update_cell(ws: Any, cell: str, value_or_formula: Any) -> None:
 
 def autofit_table(ws: Any, cell_range: str) -> None:
     """Adjust column widths and row heights for a tabular range."""
-    start_row, start_col, end_row, end_col = ExcelRange.parse_range(cell_range)
+    start_row, start_col, end_row, end_col = _parse_range(cell_range)
 
     col_widths: Dict[int, int] = {}
     row_heights: Dict[int, int] = {}
@@ -2507,6 +3883,104 @@ def autofit_table(ws: Any, cell_range: str) -> None:
         if height > current:
             ws.row_dimensions[row + 1].height = height
 
+@functools.lru_cache(maxsize=512)
+def _style_objects(style_items: frozenset) -> Tuple[Any, Any, Any, Any]:
+    """
+    Build the font, fill, border and alignment for an ``apply_style`` dictionary.
+
+    Returns:
+        Tuple of (Font, PatternFill, Border, Alignment); entries not requested
+        by the dictionary are None.
+    """
+    style = dict(style_items)
+    font_kwargs = {}
+    if 'font_name' in style:
+        font_kwargs['name'] = style['font_name']
+    if 'font_size' in style:
+        font_kwargs['size'] = style['font_size']
+    if 'bold' in style:
+        font_kwargs['bold'] = style['bold']
+    if 'italic' in style:
+        font_kwargs['italic'] = style['italic']
+    if 'font_color' in style:
+        font_kwargs['color'] = style['font_color']
+    
+    fill = None
+    if 'fill_color' in style:
+        fill = PatternFill(start_color=style['fill_color'], 
+                          end_color=style['fill_color'],
+                          fill_type='solid')
+    
+    border = None
+    if 'border_style' in style:
+        side = Side(style=style['border_style'])
+        border = Border(left=side, right=side, top=side, bottom=side)
+    
+    alignment = None
+    if 'alignment' in style:
+        alignment_value = style['alignment'].lower()
+        horizontal = None
+    
+        # Map horizontal alignment values
+        if alignment_value in ['left', 'center', 'right', 'justify']:
+            horizontal = alignment_value
+    
+        alignment = Alignment(horizontal=horizontal)
+    
+    return (Font(**font_kwargs) if font_kwargs else None), fill, border, alignment
+
+def _merge_cell_ranges(cell_ranges: List[str]) -> List[str]:
+    """
+    Merge single-cell references into the fewest row-aligned rectangles.
+
+    Multi-cell ranges and references that cannot be parsed are returned as
+    they are, ahead of the merged rectangles.
+    """
+    merged = []
+    columns_by_row: Dict[int, List[int]] = {}
+    for cell_range in cell_ranges:
+        if ':' in cell_range:
+            merged.append(cell_range)
+            continue
+        try:
+            row, col = ExcelRange.parse_cell_ref(cell_range)
+        except ValueError:
+            merged.append(cell_range)
+            continue
+        columns_by_row.setdefault(row, []).append(col)
+    
+    # Contiguous column runs per row; a run repeated on the next row extends
+    # the rectangle that started above it
+    rectangles = []
+    open_runs: Dict[Tuple[int, int], int] = {}  # (start_col, end_col) -> start_row
+    previous_row = None
+    for row in sorted(columns_by_row):
+        cols = sorted(set(columns_by_row[row]))
+        runs = []
+        run_start = run_end = cols[0]
+        for col in cols[1:]:
+            if col != run_end + 1:
+                runs.append((run_start, run_end))
+                run_start = col
+            run_end = col
+        runs.append((run_start, run_end))
+        
+        continued = {}
+        for run in runs:
+            if previous_row == row - 1 and run in open_runs:
+                continued[run] = open_runs.pop(run)
+            else:
+                continued[run] = row
+        for (start_col, end_col), start_row in open_runs.items():
+            rectangles.append((start_row, start_col, previous_row, end_col))
+        open_runs = continued
+        previous_row = row
+    for (start_col, end_col), start_row in open_runs.items():
+        rectangles.append((start_row, start_col, previous_row, end_col))
+    
+    merged.extend(ExcelRange.range_to_a1(*rectangle) for rectangle in rectangles)
+    return merged
+
 def apply_style(ws: Any, cell_range: str, style_dict: Dict[str, Any]) -> None:
     """
     Apply cell styles to a range.
@@ -2541,46 +4015,18 @@ def apply_style(ws: Any, cell_range: str, style_dict: Dict[str, Any]) -> None:
             # A single cell
             range_str = cell_range
         
-        # Preparar los estilos
-        font_kwargs = {}
-        if 'font_name' in style_dict:
-            font_kwargs['name'] = style_dict['font_name']
-        if 'font_size' in style_dict:
-            font_kwargs['size'] = style_dict['font_size']
-        if 'bold' in style_dict:
-            font_kwargs['bold'] = style_dict['bold']
-        if 'italic' in style_dict:
-            font_kwargs['italic'] = style_dict['italic']
-        if 'font_color' in style_dict:
-            font_kwargs['color'] = style_dict['font_color']
-        
-        fill = None
-        if 'fill_color' in style_dict:
-            fill = PatternFill(start_color=style_dict['fill_color'], 
-                              end_color=style_dict['fill_color'],
-                              fill_type='solid')
-        
-        border = None
-        if 'border_style' in style_dict:
-            side = Side(style=style_dict['border_style'])
-            border = Border(left=side, right=side, top=side, bottom=side)
-        
-        alignment = None
-        if 'alignment' in style_dict:
-            alignment_value = style_dict['alignment'].lower()
-            horizontal = None
-            
-            # Map horizontal alignment values
-            if alignment_value in ['left', 'center', 'right', 'justify']:
-                horizontal = alignment_value
-            
-            alignment = Alignment(horizontal=horizontal)
+        # Style objects are immutable, so equal dictionaries share one set
+        try:
+            font, fill, border, alignment = _style_objects(frozenset(style_dict.items()))
+        except TypeError:
+            # Unhashable values, build the objects for this call only
+            font, fill, border, alignment = _style_objects.__wrapped__(style_dict.items())
         
         # Apply styles to all cells in the range
         for row in ws[range_str]:
             for cell in row:
-                if font_kwargs:
-                    cell.font = Font(**font_kwargs)
+                if font:
+                    cell.font = font
                 if fill:
                     cell.fill = fill
                 if border:
@@ -2653,7 +4099,7 @@ def add_table(ws: Any, table_name: str, cell_range: str, style=None) -> Any:
     try:
         # Sanitize table name to prevent Excel corruption
         # Table names must be unique and follow Excel naming rules
-        sanitized_name = table_name.replace(' ', '_').replace('-', '_')
+        sanitized_name = table_name.translate(_TABLE_NAME_SEPARATOR_TABLE)
         sanitized_name = ''.join(c for c in sanitized_name if c.isalnum() or c == '_')
         if not sanitized_name:
             sanitized_name = f"Table_{len(ws.tables) + 1}"
@@ -2890,7 +4336,7 @@ def add_chart(
                     try:
                         chart.set_categories(categories)
                     except Exception as e:
-                        logger.warning(f"Could not set categories: {e}")
+                        logger.warning("Could not set categories: %s", e)
                 else:
                     # More tolerant approach - warn about blanks but don't fail
                     if _range_has_blank(data_ws, min_row + 1, min_col, max_row, max_col):
@@ -2911,7 +4357,7 @@ def add_chart(
                     try:
                         chart.set_categories(categories)
                     except Exception as e:
-                        logger.warning(f"Could not set categories: {e}")
+                        logger.warning("Could not set categories: %s", e)
             else:
                 # For scatter charts, be more flexible
                 if _range_has_blank(data_ws, min_row, min_col, max_row, max_col):
@@ -2934,7 +4380,7 @@ def add_chart(
                 # Apply the style including the color palette
                 apply_chart_style(chart, style_number)
             else:
-                logger.warning(f"Invalid chart style: '{style}'. Using default style.")
+                logger.warning("Invalid chart style: '%s'. Using default style.", style)
         
         # Apply color theme if provided
         # (here we would use the theme but omit it for simplicity)
@@ -2981,8 +4427,7 @@ def add_chart(
         if position:
             # Parse position string to get coordinates
             try:
-                import re
-                pos_match = re.match(r'([A-Z]+)(\d+)', position.upper())
+                pos_match = _CELL_POSITION_RE.match(position.upper())
                 if pos_match:
                     pos_col = column_index_from_string(pos_match.group(1)) - 1  # Convert to 0-based
                     pos_row = int(pos_match.group(2)) - 1  # Convert to 0-based
@@ -3059,6 +4504,9 @@ def add_pivot_table(wb: Any, source_sheet: str, source_range: str, target_sheet:
             data_reference = Reference(source_ws, min_row=min_row, min_col=min_col,
                                      max_row=max_row, max_col=max_col)
 
+            if PivotCache is None:
+                raise PivotTableError("This openpyxl version cannot create pivot tables")
+
             # Create pivot cache
             pivot_cache = PivotCache(cacheSource=data_reference, cacheDefinition={'refreshOnLoad': True})
 
@@ -3087,7 +4535,7 @@ def add_pivot_table(wb: Any, source_sheet: str, source_range: str, target_sheet:
             return pivot_table
             
         except Exception as pivot_error:
-            logger.error(f"Error creating pivot table: {pivot_error}")
+            logger.error("Error creating pivot table: %s", pivot_error)
             raise PivotTableError(f"Error creating pivot table: {pivot_error}")
     
     except SheetNotFoundError:
@@ -3170,7 +4618,7 @@ def create_formatted_table(wb: Any, sheet_name: str, start_cell: str, data: List
     
     # Get data range dimensions
     rows = len(data)
-    cols = max([len(row) if isinstance(row, list) else 1 for row in data], default=0)
+    cols = max((len(row) if isinstance(row, list) else 1 for row in data), default=0)
     
     # Write the data
     write_sheet_data(ws, start_cell, data)
@@ -3347,7 +4795,7 @@ def create_chart_from_data(
     
     # Calculate the full data range
     rows = len(data)
-    cols = max([len(row) if isinstance(row, list) else 1 for row in data], default=0)
+    cols = max((len(row) if isinstance(row, list) else 1 for row in data), default=0)
     start_row, start_col = ExcelRange.parse_cell_ref(data_start_cell)
     end_row = start_row + rows - 1
     end_col = start_col + cols - 1
@@ -3373,7 +4821,7 @@ def create_chart_from_data(
                 "style": table_style
             }
         except Exception as e:
-            logger.warning(f"Could not create the table: {e}")
+            logger.warning("Could not create the table: %s", e)
     
     # Create the chart
     try:
@@ -3388,7 +4836,7 @@ def create_chart_from_data(
             "style": style
         }
     except Exception as e:
-        logger.error(f"Error creating chart: {e}")
+        logger.error("Error creating chart: %s", e)
         raise ChartError(f"Error creating chart: {e}")
 
     return result
@@ -3485,8 +4933,9 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
     }
     
     # Create/update sheets with data
+    existing_sheets = _sheetname_set(wb)
     for sheet_name, sheet_data in data.items():
-        if sheet_name in list_sheets(wb):
+        if sheet_name in existing_sheets:
             if overwrite_sheets:
                 # Use the existing sheet
                 ws = wb[sheet_name]
@@ -3496,7 +4945,7 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
                 # Add numeric suffix if the sheet already exists
                 base_name = sheet_name
                 counter = 1
-                while f"{base_name}_{counter}" in list_sheets(wb):
+                while f"{base_name}_{counter}" in existing_sheets:
                     counter += 1
                 new_name = f"{base_name}_{counter}"
                 ws = create_sheet_with_data(wb, new_name, sheet_data)
@@ -3504,6 +4953,7 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
         else:
             # Create new sheet
             ws = create_sheet_with_data(wb, sheet_name, sheet_data)
+        existing_sheets.add(ws.title)
         
         result["sheets"].append({"name": sheet_name, "rows": len(sheet_data)})
         
@@ -3523,13 +4973,13 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
             style = table_config.get("style")
             
             if not sheet_name or not range_str:
-                logger.warning(f"Incomplete configuration for table '{table_name}'. Sheet and range are required.")
+                logger.warning("Incomplete configuration for table '%s'. Sheet and range are required.", table_name)
                 continue
             
             try:
                 # Verify that the sheet exists
                 if sheet_name not in list_sheets(wb):
-                    logger.warning(f"Sheet '{sheet_name}' not found for table '{table_name}'. Skipping.")
+                    logger.warning("Sheet '%s' not found for table '%s'. Skipping.", sheet_name, table_name)
                     continue
                 
                 ws = wb[sheet_name]
@@ -3551,7 +5001,7 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
                             apply_style(ws, range_str, format_value)
             
             except Exception as e:
-                logger.warning(f"Error al crear tabla '{table_name}': {e}")
+                logger.warning("Error al crear tabla '%s': %s", table_name, e)
     
     # Create charts
     if charts:
@@ -3564,13 +5014,13 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
             style = chart_config.get("style")
             
             if not sheet_name or not chart_type or not data_source:
-                logger.warning(f"Incomplete configuration for chart '{chart_name}'. Sheet, type and data are required.")
+                logger.warning("Incomplete configuration for chart '%s'. Sheet, type and data are required.", chart_name)
                 continue
             
             try:
                 # Verificar que la hoja existe
                 if sheet_name not in list_sheets(wb):
-                    logger.warning(f"Sheet '{sheet_name}' not found for chart '{chart_name}'. Skipping.")
+                    logger.warning("Sheet '%s' not found for chart '%s'. Skipping.", sheet_name, chart_name)
                     continue
                 
                 # Determinar si data_source es una tabla o un rango
@@ -3597,7 +5047,7 @@ def create_report(wb: Any, data: Dict[str, List[List[Any]]], tables: Optional[Di
                 })
             
             except Exception as e:
-                logger.warning(f"Error creating chart '{chart_name}': {e}")
+                logger.warning("Error creating chart '%s': %s", chart_name, e)
     
     return result
 
@@ -3681,7 +5131,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
                     "range": table_range
                 })
             except Exception as e:
-                logger.warning(f"Error al crear tabla: {e}")
+                logger.warning("Error al crear tabla: %s", e)
             
             # Create chart
             chart_type = data.get("chart_type", "column")
@@ -3699,7 +5149,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
                     "position": chart_position
                 })
             except Exception as e:
-                logger.warning(f"Error creating chart: {e}")
+                logger.warning("Error creating chart: %s", e)
         
         result["sheets"].append({"name": sheet_name, "type": "report"})
     
@@ -3802,7 +5252,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
                     "range": data_range
                 })
             except Exception as e:
-                logger.warning(f"Error al crear tabla de datos: {e}")
+                logger.warning("Error al crear tabla de datos: %s", e)
         
         # Create analysis sheet
         if sheet_name not in list_sheets(wb):
@@ -3843,7 +5293,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
             
             current_row += 15  # Space for the chart
         except Exception as e:
-            logger.warning(f"Error creating sales by region chart: {e}")
+            logger.warning("Error creating sales by region chart: %s", e)
             current_row += 2
         
         # 2. Sales Trend (if there is time data)
@@ -3866,7 +5316,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
             
             current_row += 15  # Space for the chart
         except Exception as e:
-            logger.warning(f"Error creating sales trend chart: {e}")
+            logger.warning("Error creating sales trend chart: %s", e)
             current_row += 2
         
         result["sheets"].append({"name": sheet_name, "type": "analysis"})
@@ -3925,7 +5375,7 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
             avance_col = get_column_letter(cols)
             apply_number_format(ws, f"{avance_col}4:{avance_col}{rows+2}", "0%")
         except Exception as e:
-            logger.warning(f"Error al crear tabla de proyectos: {e}")
+            logger.warning("Error al crear tabla de proyectos: %s", e)
         
         # Create progress chart
         try:
@@ -3940,12 +5390,12 @@ def apply_excel_template(wb: Any, template_name: str, data: Dict[str, Any]) -> D
                 "id": chart_id
             })
         except Exception as e:
-            logger.warning(f"Error creating progress chart: {e}")
+            logger.warning("Error creating progress chart: %s", e)
         
         result["sheets"].append({"name": sheet_name, "type": "tracker"})
     
     else:
-        logger.warning(f"Plantilla '{template_name}' no reconocida.")
+        logger.warning("Plantilla '%s' no reconocida.", template_name)
         result["error"] = f"Plantilla '{template_name}' no disponible"
     
     return result
@@ -3983,7 +5433,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
     data_updates = report_config.get("data_updates", {})
     for sheet_name, update_info in data_updates.items():
         if sheet_name not in list_sheets(wb):
-            logger.warning(f"Sheet '{sheet_name}' not found. Skipping update.")
+            logger.warning("Sheet '%s' not found. Skipping update.", sheet_name)
             continue
         
         ws = wb[sheet_name]
@@ -3991,7 +5441,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
         data = update_info.get("data")
         
         if not range_str or not data:
-            logger.warning(f"Incomplete configuration to update sheet '{sheet_name}'. Range and data are required.")
+            logger.warning("Incomplete configuration to update sheet '%s'. Range and data are required.", sheet_name)
             continue
         
         try:
@@ -4009,7 +5459,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
                 "range": range_str
             })
         except Exception as e:
-            logger.warning(f"Error al actualizar datos en hoja '{sheet_name}': {e}")
+            logger.warning("Error al actualizar datos en hoja '%s': %s", sheet_name, e)
     
     # Actualizar/refrescar tablas
     refresh_tables = report_config.get("refresh_tables", [])
@@ -4023,7 +5473,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
             continue
         
         if sheet_name not in list_sheets(wb):
-            logger.warning(f"Sheet '{sheet_name}' not found. Skipping table update.")
+            logger.warning("Sheet '%s' not found. Skipping table update.", sheet_name)
             continue
         
         ws = wb[sheet_name]
@@ -4031,7 +5481,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
         try:
             # Verificar si la tabla existe
             if not hasattr(ws, 'tables') or table_name not in ws.tables:
-                logger.warning(f"Table '{table_name}' not found in sheet '{sheet_name}'.")
+                logger.warning("Table '%s' not found in sheet '%s'.", table_name, sheet_name)
                 continue
             
             # Get current reference
@@ -4054,7 +5504,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
                     "refreshed": True
                 })
         except Exception as e:
-            logger.warning(f"Error updating table '{table_name}': {e}")
+            logger.warning("Error updating table '%s': %s", table_name, e)
     
     # Recalculate formulas if requested
     if recalculate:
@@ -4075,7 +5525,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
             continue
         
         if sheet_name not in list_sheets(wb):
-            logger.warning(f"Sheet '{sheet_name}' not found. Skipping chart update.")
+            logger.warning("Sheet '%s' not found. Skipping chart update.", sheet_name)
             continue
         
         ws = wb[sheet_name]
@@ -4083,7 +5533,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
         try:
             # Verify if the chart exists
             if not hasattr(ws, '_charts') or chart_id >= len(ws._charts) or chart_id < 0:
-                logger.warning(f"Chart with ID {chart_id} not found in sheet '{sheet_name}'.")
+                logger.warning("Chart with ID %s not found in sheet '%s'.", chart_id, sheet_name)
                 continue
             
             # In OpenPyXL updating a chart is not straightforward
@@ -4132,7 +5582,7 @@ def update_report(wb: Any, report_config: Dict[str, Any],
                     "note": "No new range provided. Updating data requires Excel COM."
                 })
         except Exception as e:
-            logger.warning(f"Error updating chart {chart_id}: {e}")
+            logger.warning("Error updating chart %s: %s", chart_id, e)
     
     return result
 
@@ -4203,7 +5653,7 @@ def import_data(wb: Any, import_config: Dict[str, Any]) -> Dict[str, Any]:
             result["sheet"] = sheet_name
             result["start_cell"] = start_cell
         except Exception as e:
-            logger.error(f"Error importing CSV: {e}")
+            logger.error("Error importing CSV: %s", e)
             result["error"] = f"Error importing CSV: {e}"
     
     elif source_type == "json":
@@ -4244,7 +5694,7 @@ def import_data(wb: Any, import_config: Dict[str, Any]) -> Dict[str, Any]:
             result["sheet"] = sheet_name
             result["start_cell"] = start_cell
         except Exception as e:
-            logger.error(f"Error importing JSON: {e}")
+            logger.error("Error importing JSON: %s", e)
             result["error"] = f"Error importing JSON: {e}"
     
     elif source_type == "pandas":
@@ -4275,11 +5725,11 @@ def import_data(wb: Any, import_config: Dict[str, Any]) -> Dict[str, Any]:
             result["sheet"] = sheet_name
             result["start_cell"] = start_cell
         except Exception as e:
-            logger.error(f"Error importing with pandas: {e}")
+            logger.error("Error importing with pandas: %s", e)
             result["error"] = f"Error importing with pandas: {e}"
     
     else:
-        logger.warning(f"Unsupported source type: {source_type}")
+        logger.warning("Unsupported source type: %s", source_type)
         result["error"] = f"Unsupported source type: {source_type}"
     
     return result
@@ -4325,7 +5775,7 @@ def export_data(wb: Any, export_config: Dict[str, Any]) -> Dict[str, Any]:
         return result
         
     if sheet_name not in list_sheets(wb):
-        logger.warning(f"Hoja '{sheet_name}' no encontrada.")
+        logger.warning("Hoja '%s' no encontrada.", sheet_name)
         result["error"] = f"Hoja '{sheet_name}' no encontrada"
         return result
     
@@ -4333,7 +5783,7 @@ def export_data(wb: Any, export_config: Dict[str, Any]) -> Dict[str, Any]:
     data = read_sheet_data(wb, sheet_name, range_str)
     
     if not data:
-        logger.warning(f"No data found in range {range_str} de la hoja {sheet_name}")
+        logger.warning("No data found in range %s de la hoja %s", range_str, sheet_name)
         return []
     
     # Filter the data based on the criteria
@@ -4451,7 +5901,7 @@ def create_report_from_template(template_file, output_file, data_mappings, chart
         if data_mappings:
             for sheet_name, ranges in data_mappings.items():
                 if sheet_name not in wb.sheetnames:
-                    logger.warning(f"Sheet '{sheet_name}' does not exist in the template")
+                    logger.warning("Sheet '%s' does not exist in the template", sheet_name)
                     continue
                 
                 ws = wb[sheet_name]
@@ -4469,7 +5919,7 @@ def create_report_from_template(template_file, output_file, data_mappings, chart
         if chart_mappings:
             for sheet_name, charts in chart_mappings.items():
                 if sheet_name not in wb.sheetnames:
-                    logger.warning(f"Sheet '{sheet_name}' does not exist in the template")
+                    logger.warning("Sheet '%s' does not exist in the template", sheet_name)
                     continue
                 
                 ws = wb[sheet_name]
@@ -4488,7 +5938,7 @@ def create_report_from_template(template_file, output_file, data_mappings, chart
                                 break
                     
                     if chart_idx is None or chart_idx >= len(existing_charts):
-                        logger.warning(f"Chart not found '{chart_id}' en la hoja '{sheet_name}'")
+                        logger.warning("Chart not found '%s' en la hoja '%s'", chart_id, sheet_name)
                         continue
                     
                     # Update chart properties
@@ -4506,7 +5956,7 @@ def create_report_from_template(template_file, output_file, data_mappings, chart
         if format_mappings:
             for sheet_name, ranges in format_mappings.items():
                 if sheet_name not in wb.sheetnames:
-                    logger.warning(f"Sheet '{sheet_name}' does not exist in the template")
+                    logger.warning("Sheet '%s' does not exist in the template", sheet_name)
                     continue
                 
                 ws = wb[sheet_name]
@@ -4528,7 +5978,7 @@ def create_report_from_template(template_file, output_file, data_mappings, chart
         }
     
     except Exception as e:
-        logger.error(f"Error al crear informe desde plantilla: {e}")
+        logger.error("Error al crear informe desde plantilla: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -4597,10 +6047,8 @@ def create_dynamic_dashboard(file_path, data, dashboard_config, overwrite=False)
         
         # Crear o abrir el archivo
         if not file_exists or overwrite:
-            wb = openpyxl.Workbook()
-            # Eliminar la hoja predeterminada si existe
-            if "Sheet" in wb.sheetnames:
-                del wb["Sheet"]
+            # Start without the default sheet
+            wb = create_workbook(file_path, overwrite=True, empty=True)
         else:
             wb = openpyxl.load_workbook(file_path)
         
@@ -4623,7 +6071,7 @@ def create_dynamic_dashboard(file_path, data, dashboard_config, overwrite=False)
             style = table_config.get("style", "TableStyleMedium9")
             
             if sheet_name not in wb.sheetnames:
-                logger.warning(f"Sheet '{sheet_name}' does not exist to create table '{table_name}'")
+                logger.warning("Sheet '%s' does not exist to create table '%s'", sheet_name, table_name)
                 continue
             
             ws = wb[sheet_name]
@@ -4632,7 +6080,7 @@ def create_dynamic_dashboard(file_path, data, dashboard_config, overwrite=False)
             table_exists = False
             if hasattr(ws, 'tables') and table_name in ws.tables:
                 table_exists = True
-                logger.warning(f"Table '{table_name}' already exists, it will be updated")
+                logger.warning("Table '%s' already exists, it will be updated", table_name)
             
             if table_exists:
                 # Actualizar tabla existente
@@ -4661,7 +6109,7 @@ def create_dynamic_dashboard(file_path, data, dashboard_config, overwrite=False)
             style = chart_config.get("style")
             
             if sheet_name not in wb.sheetnames:
-                logger.warning(f"Sheet '{sheet_name}' does not exist to create the chart '{title}'")
+                logger.warning("Sheet '%s' does not exist to create the chart '%s'", sheet_name, title)
                 continue
             
             # Create chart
@@ -4694,7 +6142,7 @@ def create_dynamic_dashboard(file_path, data, dashboard_config, overwrite=False)
         }
     
     except Exception as e:
-        logger.error(f"Error creating dashboard: {e}")
+        logger.error("Error creating dashboard: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -4776,7 +6224,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
             encoding = csv_config.get("encoding", "utf-8")
             
             if not os.path.exists(csv_file):
-                logger.warning(f"El archivo CSV no existe: {csv_file}")
+                logger.warning("El archivo CSV no existe: %s", csv_file)
                 continue
             
             # Crear la hoja si no existe
@@ -4817,7 +6265,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
                 try:
                     add_table(ws, table_name, table_range, "TableStyleMedium9")
                 except Exception as table_error:
-                    logger.warning(f"Could not create the table for {csv_file}: {table_error}")
+                    logger.warning("Could not create the table for %s: %s", csv_file, table_error)
             
             imported_data.append({
                 "source": "csv",
@@ -4834,7 +6282,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
             fields = json_config.get("fields", [])
             
             if not os.path.exists(json_file):
-                logger.warning(f"El archivo JSON no existe: {json_file}")
+                logger.warning("El archivo JSON no existe: %s", json_file)
                 continue
             
             # Crear la hoja si no existe
@@ -4901,7 +6349,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
                 try:
                     add_table(ws, table_name, table_range, "TableStyleMedium9")
                 except Exception as table_error:
-                    logger.warning(f"Could not create the table for {json_file}: {table_error}")
+                    logger.warning("Could not create the table for %s: %s", json_file, table_error)
             
             imported_data.append({
                 "source": "json",
@@ -4985,7 +6433,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
                             try:
                                 add_table(ws, table_name, table_range, "TableStyleMedium9")
                             except Exception as table_error:
-                                logger.warning(f"Could not create the table for SQL query: {table_error}")
+                                logger.warning("Could not create the table for SQL query: %s", table_error)
                         
                         imported_data.append({
                             "source": "sql",
@@ -4995,7 +6443,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
                         })
                     
                     except Exception as sql_error:
-                        logger.error(f"Error al importar datos SQL: {sql_error}")
+                        logger.error("Error al importar datos SQL: %s", sql_error)
                         continue
         
         # Guardar el archivo Excel
@@ -5009,7 +6457,7 @@ def import_multi_source_data(excel_file, import_config, sheet_name=None, start_c
         }
     
     except Exception as e:
-        logger.error(f"Error al importar datos: {e}")
+        logger.error("Error al importar datos: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -5057,8 +6505,13 @@ def export_excel_data(excel_file, export_config):
         if not os.path.exists(excel_file):
             raise FileNotFoundError(f"El archivo Excel no existe: {excel_file}")
         
-        # Cargar el archivo Excel
-        wb = openpyxl.load_workbook(excel_file, data_only=True)
+        # Cargar el archivo Excel; los .xlsb binarios se leen con pyxlsb
+        is_xlsb = excel_file.lower().endswith('.xlsb')
+        if is_xlsb:
+            sheet_names = list_xlsb_sheets(excel_file)
+        else:
+            wb = openpyxl.load_workbook(excel_file, data_only=True)
+            sheet_names = wb.sheetnames
         
         exported_files = []
         
@@ -5070,12 +6523,15 @@ def export_excel_data(excel_file, export_config):
             delimiter = csv_config.get("delimiter", ",")
             encoding = csv_config.get("encoding", "utf-8")
             
-            if sheet_name not in wb.sheetnames:
-                logger.warning(f"La hoja '{sheet_name}' no existe")
+            if sheet_name not in sheet_names:
+                logger.warning("La hoja '%s' no existe", sheet_name)
                 continue
             
             # Leer los datos del rango especificado
-            data = read_sheet_data(wb, sheet_name, range_str)
+            if is_xlsb:
+                data = read_xlsb_sheet_data(excel_file, sheet_name, range_str)
+            else:
+                data = read_sheet_data(wb, sheet_name, range_str)
             
             # Write the data en CSV
             with open(output_file, 'w', newline='', encoding=encoding) as csvfile:
@@ -5097,15 +6553,18 @@ def export_excel_data(excel_file, export_config):
             output_file = json_config["output_file"]
             format_type = json_config.get("format", "records")
             
-            if sheet_name not in wb.sheetnames:
-                logger.warning(f"La hoja '{sheet_name}' no existe")
+            if sheet_name not in sheet_names:
+                logger.warning("La hoja '%s' no existe", sheet_name)
                 continue
             
             # Leer los datos del rango especificado
-            data = read_sheet_data(wb, sheet_name, range_str)
+            if is_xlsb:
+                data = read_xlsb_sheet_data(excel_file, sheet_name, range_str)
+            else:
+                data = read_sheet_data(wb, sheet_name, range_str)
             
             if not data:
-                logger.warning(f"No hay datos para exportar en la hoja '{sheet_name}'")
+                logger.warning("No hay datos para exportar en la hoja '%s'", sheet_name)
                 continue
             
             # Convert data to JSON format according to the specified type
@@ -5176,7 +6635,7 @@ def export_excel_data(excel_file, export_config):
                             sheet = workbook.Sheets(sheet_name)
                             sheets_to_export.append(sheet)
                         except:
-                            logger.warning(f"La hoja '{sheet_name}' no existe para exportar a PDF")
+                            logger.warning("La hoja '%s' no existe para exportar a PDF", sheet_name)
                 else:
                     # Exportar todas las hojas
                     sheets_to_export = workbook.Sheets
@@ -5199,7 +6658,7 @@ def export_excel_data(excel_file, export_config):
                 logger.warning("win32com is not available. Cannot export to PDF.")
                 pass  # If win32com is not available, simply skip the PDF export
             except Exception as pdf_error:
-                logger.error(f"Error al exportar a PDF: {pdf_error}")
+                logger.error("Error al exportar a PDF: %s", pdf_error)
                 pass
         
         return {
@@ -5210,13 +6669,37 @@ def export_excel_data(excel_file, export_config):
         }
     
     except Exception as e:
-        logger.error(f"Error al exportar datos: {e}")
+        logger.error("Error al exportar datos: %s", e)
         return {
             "success": False,
             "error": str(e),
             "message": f"Error al exportar datos: {e}"
         }
 
+# LibreOffice conversions are heavy processes; cap how many run at once so
+# concurrent export requests do not oversubscribe the machine.
+SOFFICE_MAX_CONCURRENCY = max(1, (os.cpu_count() or 2) // 2)
+_soffice_semaphore = threading.BoundedSemaphore(SOFFICE_MAX_CONCURRENCY)
+
+def _run_soffice_pdf_conversion(soffice: str, source_file: str, outdir: str) -> None:
+    """Convert ``source_file`` to PDF inside ``outdir`` using headless LibreOffice.
+
+    Each conversion runs with its own temporary user profile so several
+    instances can work in parallel without fighting over the profile lock.
+    """
+    with _soffice_semaphore, tempfile.TemporaryDirectory() as profile_dir:
+        cmd = [
+            soffice,
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            source_file,
+            "--outdir",
+            outdir,
+        ]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
 def export_single_visible_sheet_pdf(excel_file: str, output_pdf: Optional[str] = None) -> Dict[str, Any]:
     """Export an Excel workbook to PDF only if it has a single visible sheet.
 
@@ -5230,7 +6713,6 @@ def export_single_visible_sheet_pdf(excel_file: str, output_pdf: Optional[str] =
     """
     try:
         import shutil
-        import subprocess
 
         if not os.path.exists(excel_file):
             raise FileNotFoundError(f"El archivo Excel no existe: {excel_file}")
@@ -5274,14 +6756,13 @@ def export_single_visible_sheet_pdf(excel_file: str, output_pdf: Optional[str] =
         except ImportError:
             logger.info("win32com not available, LibreOffice will be tried")
         except Exception as e:
-            logger.error(f"Error al exportar con win32com: {e}")
+            logger.error("Error al exportar con win32com: %s", e)
 
         # Fallback a LibreOffice en sistemas no Windows
         soffice = shutil.which("soffice") or shutil.which("libreoffice")
         if soffice:
             outdir = os.path.dirname(output_pdf)
-            cmd = [soffice, "--headless", "--convert-to", "pdf", os.path.abspath(excel_file), "--outdir", outdir]
-            subprocess.run(cmd, check=True)
+            _run_soffice_pdf_conversion(soffice, os.path.abspath(excel_file), outdir)
 
             generated = os.path.join(outdir, Path(excel_file).stem + ".pdf")
             if generated != output_pdf:
@@ -5305,7 +6786,7 @@ def export_single_visible_sheet_pdf(excel_file: str, output_pdf: Optional[str] =
         }
 
     except Exception as e:
-        logger.error(f"Error al exportar a PDF: {e}")
+        logger.error("Error al exportar a PDF: %s", e)
         return {
             "success": False,
             "file_path": excel_file,
@@ -5344,11 +6825,14 @@ def export_sheets_to_pdf(
 
     try:
         import shutil
-        import subprocess
 
         if not os.path.exists(excel_file):
             raise FileNotFoundError(f"El archivo Excel no existe: {excel_file}")
 
+        # Path pieces reused by every export branch below
+        excel_abs = os.path.abspath(excel_file)
+        stem = Path(excel_file).stem
+
         wb = openpyxl.load_workbook(excel_file, data_only=True)
         all_sheets = wb.sheetnames
         wb.close()
@@ -5379,7 +6863,7 @@ def export_sheets_to_pdf(
             }
 
         if output_dir is None:
-            output_dir = os.path.dirname(os.path.abspath(excel_file))
+            output_dir = os.path.dirname(excel_abs)
 
         pdf_files: List[str] = []
 
@@ -5389,21 +6873,17 @@ def export_sheets_to_pdf(
 
             excel = win32com.client.Dispatch("Excel.Application")
             excel.Visible = False
-            workbook = excel.Workbooks.Open(os.path.abspath(excel_file))
+            workbook = excel.Workbooks.Open(excel_abs)
 
             if single_file and len(valid_sheets) > 1:
                 workbook.Worksheets(valid_sheets).Select()
-                output_pdf = os.path.join(
-                    output_dir, Path(excel_file).stem + ".pdf"
-                )
+                output_pdf = os.path.join(output_dir, stem + ".pdf")
                 workbook.ActiveSheet.ExportAsFixedFormat(0, output_pdf)
                 pdf_files.append(output_pdf)
             else:
                 for s in valid_sheets:
                     ws = workbook.Worksheets(s)
-                    output_pdf = os.path.join(
-                        output_dir, f"{Path(excel_file).stem}_{s}.pdf"
-                    )
+                    output_pdf = os.path.join(output_dir, f"{stem}_{s}.pdf")
                     ws.ExportAsFixedFormat(0, output_pdf)
                     pdf_files.append(output_pdf)
 
@@ -5422,11 +6902,12 @@ def export_sheets_to_pdf(
         except ImportError:
             logger.info("win32com not available, trying LibreOffice")
         except Exception as e:
-            logger.error(f"Error al exportar con win32com: {e}")
+            logger.error("Error al exportar con win32com: %s", e)
 
         # Fallback a LibreOffice
         soffice = shutil.which("soffice") or shutil.which("libreoffice")
         if soffice:
+            # TemporaryDirectory paths are already absolute
             with tempfile.TemporaryDirectory() as tmpdir:
                 if single_file and len(valid_sheets) > 1:
                     tmp_xlsx = os.path.join(tmpdir, "tmp.xlsx")
@@ -5437,48 +6918,51 @@ def export_sheets_to_pdf(
                         )
                     wb.save(tmp_xlsx)
                     wb.close()
-                    cmd = [
-                        soffice,
-                        "--headless",
-                        "--convert-to",
-                        "pdf",
-                        os.path.abspath(tmp_xlsx),
-                        "--outdir",
-                        tmpdir,
-                    ]
-                    subprocess.run(cmd, check=True)
+                    _run_soffice_pdf_conversion(soffice, tmp_xlsx, tmpdir)
                     generated = os.path.join(tmpdir, "tmp.pdf")
-                    final = os.path.join(
-                        output_dir, Path(excel_file).stem + ".pdf"
-                    )
+                    final = os.path.join(output_dir, stem + ".pdf")
                     shutil.move(generated, final)
                     pdf_files.append(final)
                 else:
+                    # One copy per sheet with only that sheet visible, all
+                    # written from a single load of the workbook
+                    wb = openpyxl.load_workbook(excel_file)
+                    sheet_files = {}
                     for s in valid_sheets:
-                        tmp_xlsx = os.path.join(tmpdir, f"{s}.xlsx")
-                        wb = openpyxl.load_workbook(excel_file)
                         for sheet in wb.sheetnames:
                             wb[sheet].sheet_state = (
                                 "visible" if sheet == s else "hidden"
                             )
-                        wb.save(tmp_xlsx)
-                        wb.close()
-                        cmd = [
-                            soffice,
-                            "--headless",
-                            "--convert-to",
-                            "pdf",
-                            os.path.abspath(tmp_xlsx),
-                            "--outdir",
-                            tmpdir,
-                        ]
-                        subprocess.run(cmd, check=True)
-                        generated = os.path.join(tmpdir, f"{s}.pdf")
-                        final = os.path.join(
-                            output_dir, f"{Path(excel_file).stem}_{s}.pdf"
-                        )
-                        shutil.move(generated, final)
-                        pdf_files.append(final)
+                        sheet_files[s] = os.path.join(tmpdir, f"{s}.xlsx")
+                        wb.save(sheet_files[s])
+                    wb.close()
+
+                    # Each sheet converts independently; the conversions run
+                    # side by side, bounded by the LibreOffice semaphore
+                    workers = min(len(valid_sheets), SOFFICE_MAX_CONCURRENCY)
+                    exported = {}
+                    errors = []
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = {
+                            executor.submit(_run_soffice_pdf_conversion, soffice, tmp_xlsx, tmpdir): s
+                            for s, tmp_xlsx in sheet_files.items()
+                        }
+                        for future in concurrent.futures.as_completed(futures):
+                            s = futures[future]
+                            try:
+                                future.result()
+                            except Exception as e:
+                                errors.append(e)
+                                warnings.append(f"No se pudo exportar la hoja '{s}': {e}")
+                                continue
+                            generated = os.path.join(tmpdir, f"{s}.pdf")
+                            final = os.path.join(output_dir, f"{stem}_{s}.pdf")
+                            shutil.move(generated, final)
+                            exported[s] = final
+
+                    if not exported:
+                        raise errors[0]
+                    pdf_files.extend(exported[s] for s in valid_sheets if s in exported)
 
             msg = "PDF export completed successfully"
             logger.info(msg)
@@ -5500,7 +6984,7 @@ def export_sheets_to_pdf(
         }
 
     except Exception as e:
-        logger.error(f"Error al exportar a PDF: {e}")
+        logger.error("Error al exportar a PDF: %s", e)
         return {
             "success": False,
             "file_path": excel_file,
@@ -5508,6 +6992,61 @@ def export_sheets_to_pdf(
             "message": f"Error al exportar a PDF: {e}",
         }
 
+# .xlsx files above this size spend most of each tool call being parsed and
+# written, so successful edits point at cheaper ways to work with them
+LARGE_WORKBOOK_BYTES = 50 * 1024 * 1024
+
+def _with_size_suggestion(response: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+    """Add a ``suggestion`` to a tool ``response`` when ``file_path`` is a very large ``.xlsx``."""
+    entry = _workbook_cache.get(os.path.abspath(file_path))
+    # The cache already knows the size from its last stat of the file
+    if (entry is not None and file_path.lower().endswith('.xlsx')
+            and entry["signature"][1] > LARGE_WORKBOOK_BYTES):
+        response["suggestion"] = (
+            f"This workbook is over {LARGE_WORKBOOK_BYTES // (1024 * 1024)} MB, so loading and "
+            "saving dominate each call. Batch edits with defer_save or add_formulas_bulk_tool. "
+            "For read-only use, an .xlsb copy saved from Excel loads several times faster and "
+            "can be exported with export_data_tool (requires pyxlsb).")
+    return response
+
+def _error_response(error_message: str, error: Exception) -> Dict[str, Any]:
+    """Build the standard failure result, formatting ``error`` only once."""
+    detail = str(error)
+    return {
+        "success": False,
+        "error": detail,
+        "message": f"{error_message}: {detail}"
+    }
+
+def _excel_tool(error_message: str) -> Callable:
+    """
+    Decorator that turns any exception raised by a tool into its failure result.
+
+    Every MCP tool goes through it, so none of them builds that result by
+    hand. Coroutine tools get a coroutine wrapper.
+
+    Args:
+        error_message (str): Prefix of the ``message`` field (e.g. ``"Error adding formula"``).
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    return _error_response(error_message, e)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return _error_response(error_message, e)
+        return wrapper
+    return decorator
+
 # Crear el servidor MCP como variable global
 mcp = None
 if HAS_MCP:
@@ -5518,6 +7057,7 @@ if HAS_MCP:
     
     # Register basic workbook management functions
     @mcp.tool(description="Creates a new empty Excel file with professional foundation")
+    @_excel_tool("Error creating Excel file")
     def create_workbook_tool(filename, overwrite=False):
         """Create a new empty Excel workbook with optimal foundation for data manipulation.
 
@@ -5578,73 +7118,45 @@ if HAS_MCP:
         - Use add_chart_tool() to create visualizations
         - Use add_formulas_tool() to add calculations
         """
+        if overwrite:
+            # The file is replaced, so pending cached edits to it are obsolete
+            forget_cached_workbook(filename)
+
+        # Exclusive-create mode fails atomically if the file already exists,
+        # which avoids a separate existence check racing with other calls
         try:
-            import os
-            
-            # Check if file exists and overwrite flag
-            if os.path.exists(filename) and not overwrite:
-                return {
-                    "success": False,
-                    "error": "File already exists",
-                    "message": f"File '{filename}' already exists. Use overwrite=True to replace it."
-                }
-            
-            # Create a simple Excel workbook directly
-            if HAS_OPENPYXL:
-                import openpyxl
-                wb = openpyxl.Workbook()
-                wb.save(filename)
-            else:
-                # Fallback: create minimal Excel file structure
-                import zipfile
-                import tempfile
-                
-                # Create minimal Excel file structure
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    # Create basic Excel XML structure
-                    xl_dir = os.path.join(temp_dir, "xl")
-                    worksheets_dir = os.path.join(xl_dir, "worksheets")
-                    os.makedirs(worksheets_dir)
-                    
-                    # Create basic files
-                    with open(os.path.join(temp_dir, "[Content_Types].xml"), "w") as f:
-                        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/><Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/></Types>')
-                    
-                    os.makedirs(os.path.join(temp_dir, "_rels"))
-                    with open(os.path.join(temp_dir, "_rels", ".rels"), "w") as f:
-                        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>')
-                    
-                    os.makedirs(os.path.join(xl_dir, "_rels"))
-                    with open(os.path.join(xl_dir, "_rels", "workbook.xml.rels"), "w") as f:
-                        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/></Relationships>')
-                    
-                    with open(os.path.join(xl_dir, "workbook.xml"), "w") as f:
-                        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>')
-                    
-                    with open(os.path.join(worksheets_dir, "sheet1.xml"), "w") as f:
-                        f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData/></worksheet>')
-                    
-                    # Create ZIP file (Excel format)
-                    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as zf:
-                        for root, dirs, files in os.walk(temp_dir):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arc_name = os.path.relpath(file_path, temp_dir)
-                                zf.write(file_path, arc_name)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "message": f"Excel file successfully created: {filename}"
-            }
-        except Exception as e:
+            f = open(filename, "wb" if overwrite else "xb")
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
             return {
                 "success": False,
-                "error": str(e),
-                "message": f"Error creating Excel file: {e}"
+                "error": "File already exists",
+                "message": f"File '{filename}' already exists. Use overwrite=True to replace it."
             }
+        
+        try:
+            with f:
+                # Create a simple Excel workbook directly
+                if HAS_OPENPYXL:
+                    wb = openpyxl.Workbook()
+                    wb.save(f)
+                else:
+                    # Fallback: write the prebuilt minimal Excel package
+                    f.write(_EMPTY_XLSX_BYTES)
+        except BaseException:
+            # A partial file would make every retry report "already exists"
+            os.unlink(filename)
+            raise
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "message": f"Excel file successfully created: {filename}"
+        }
     
     @mcp.tool(description="Abre un fichero Excel existente")
+    @_excel_tool("Error opening Excel file")
     def open_workbook_tool(filename):
         """Open an existing Excel file.
 
@@ -5663,26 +7175,20 @@ if HAS_MCP:
         Example:
             open_workbook_tool("C:/data/sales_report.xlsx")
         """
-        try:
-            wb = open_workbook(filename)
-            sheet_names = list_sheets(wb)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "sheets": sheet_names,
-                "sheet_count": len(sheet_names),
-                "message": f"Excel file successfully opened: {filename}"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error opening Excel file: {e}"
-            }
+        # Keep the parsed workbook around for the tools that usually follow
+        wb = get_cached_workbook(filename, read_only=True)
+        sheet_names = list_sheets(wb)
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "sheets": sheet_names,
+            "sheet_count": len(sheet_names),
+            "message": f"Excel file successfully opened: {filename}"
+        }
     
     @mcp.tool(description="Guarda el Workbook en disco")
+    @_excel_tool("Error saving Excel file")
     def save_workbook_tool(filename, new_filename=None):
         """Save the workbook to disk.
 
@@ -5699,25 +7205,72 @@ if HAS_MCP:
             save_workbook_tool("C:/data/report.xlsx")
             save_workbook_tool("C:/data/report.xlsx", "C:/data/report_backup.xlsx")  # Save As
         """
-        try:
-            wb = open_workbook(filename)
-            saved_path = save_workbook(wb, new_filename or filename)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "original_file": filename,
-                "saved_file": saved_path,
-                "message": f"Excel file successfully saved: {saved_path}"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error saving Excel file: {e}"
-            }
+        # Work from the cached workbook instead of parsing the file again
+        target = new_filename or filename
+        if os.path.abspath(target) != os.path.abspath(filename):
+            flush_cached_workbook(filename)
+            saved_path = save_workbook(get_cached_workbook(filename), target)
+        else:
+            # The cache saves edits with fast, light compression; this save
+            # writes the file at the default level unless it already is
+            if not workbook_is_optimized(filename, compact=True):
+                with cached_workbook_edit(filename, defer_save=True):
+                    pass
+                flush_cached_workbook(filename, compress_level=None)
+            saved_path = target
+        
+        return {
+            "success": True,
+            "original_file": filename,
+            "saved_file": saved_path,
+            "message": f"Excel file successfully saved: {saved_path}"
+        }
+    
+    @mcp.tool(description="Write pending in-memory edits of cached workbooks to disk")
+    @_excel_tool("Error writing pending changes")
+    def flush_workbook_tool(filename=None):
+        """Write pending in-memory edits to disk.
+
+        Editing tools such as ``update_cell_tool``, ``add_table_tool`` and ``add_chart_tool``
+        keep the workbook in memory between calls and save it in the background shortly
+        afterwards. Formula tools called with ``defer_save=True`` are only written by this
+        function (or the next regular save). Call it before the file is opened by another
+        program. A background save that failed is retried here and reported if it fails
+        again; its edits stay in memory until a save succeeds.
+
+        Args:
+            filename (str, optional): Excel file to write. If omitted, every workbook with
+                pending edits is written.
+
+        Returns:
+            dict: Information about the operation including the files that were saved.
+
+        Example:
+            flush_workbook_tool("C:/data/report.xlsx")
+            flush_workbook_tool()  # All files
+        """
+        if filename:
+            flushed = [filename] if flush_cached_workbook(filename) else []
+        else:
+            flushed = flush_workbook_cache()
+            failed = pending_save_errors()
+            if failed:
+                return {
+                    "success": False,
+                    "saved_files": flushed,
+                    "failed_files": failed,
+                    "error": f"{len(failed)} file(s) could not be written; their changes are still in memory",
+                    "message": f"{len(flushed)} file(s) written to disk, {len(failed)} failed"
+                }
+        
+        return {
+            "success": True,
+            "saved_files": flushed,
+            "message": f"{len(flushed)} file(s) written to disk"
+        }
     
     @mcp.tool(description="Lista las hojas disponibles en un archivo Excel")
+    @_excel_tool("Error al listar hojas")
     def list_sheets_tool(filename):
         """List the worksheets available in an Excel file.
 
@@ -5736,27 +7289,20 @@ if HAS_MCP:
         Example:
             list_sheets_tool("C:/data/financial_report.xlsx")  # Returns: {"sheets": ["Sales", "Costs", "Summary"]}
         """
-        try:
-            wb = open_workbook(filename)
-            sheets = list_sheets(wb)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "sheets": sheets,
-                "count": len(sheets),
-                "message": f"Se encontraron {len(sheets)} hojas en el archivo Excel"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error al listar hojas: {e}"
-            }
+        # Only sheet names are needed, so skip parsing cells and styles
+        sheets = get_sheet_names(filename)
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "sheets": sheets,
+            "count": len(sheets),
+            "message": f"Se encontraron {len(sheets)} hojas en el archivo Excel"
+        }
     
     # Register basic worksheet manipulation functions
     @mcp.tool(description="Adds a new empty sheet")
+    @_excel_tool("Error adding sheet")
     def add_sheet_tool(filename, sheet_name, index=None):
         """Add a new empty worksheet.
 
@@ -5780,30 +7326,22 @@ if HAS_MCP:
             add_sheet_tool("C:/data/report.xlsx", "New Summary")  # Add at the end
             add_sheet_tool("C:/data/report.xlsx", "Cover", 0)  # Add as first sheet
         """
-        try:
-            wb = open_workbook(filename)
+        with cached_workbook_edit(filename) as wb:
             ws = add_sheet(wb, sheet_name, index)
-            save_workbook(wb, filename)
-            
-            sheets = list_sheets(wb)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "sheet_name": sheet_name,
-                "sheet_index": sheets.index(sheet_name),
-                "all_sheets": sheets,
-                "message": f"Sheet '{sheet_name}' added successfully"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error adding sheet: {e}"
-            }
+            sheets = wb.sheetnames
+            sheet_index = wb.index(ws)
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "sheet_name": sheet_name,
+            "sheet_index": sheet_index,
+            "all_sheets": sheets,
+            "message": f"Sheet '{sheet_name}' added successfully"
+        }
     
     @mcp.tool(description="Delete the indicated sheet")
+    @_excel_tool("Error deleting sheet")
     def delete_sheet_tool(filename, sheet_name):
         """Delete the indicated worksheet.
 
@@ -5825,30 +7363,22 @@ if HAS_MCP:
         Example:
             delete_sheet_tool("C:/data/report.xlsx", "Draft")
         """
-        try:
-            wb = open_workbook(filename)
+        with cached_workbook_edit(filename) as wb:
             delete_sheet(wb, sheet_name)
-            save_workbook(wb, filename)
-            
+            _rename_cached_value_sheet(filename, sheet_name)
             remaining_sheets = list_sheets(wb)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "deleted_sheet": sheet_name,
-                "remaining_sheets": remaining_sheets,
-                "remaining_count": len(remaining_sheets),
-                "message": f"Sheet '{sheet_name}' successfully deleted"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error deleting sheet: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "deleted_sheet": sheet_name,
+            "remaining_sheets": remaining_sheets,
+            "remaining_count": len(remaining_sheets),
+            "message": f"Sheet '{sheet_name}' successfully deleted"
+        }
     
     @mcp.tool(description="Rename a sheet")
+    @_excel_tool("Error renaming sheet")
     def rename_sheet_tool(filename, old_name, new_name):
         """Rename a worksheet.
 
@@ -5870,31 +7400,23 @@ if HAS_MCP:
         Example:
             rename_sheet_tool("C:/data/report.xlsx", "Sheet1", "Executive Summary")
         """
-        try:
-            wb = open_workbook(filename)
+        with cached_workbook_edit(filename) as wb:
             rename_sheet(wb, old_name, new_name)
-            save_workbook(wb, filename)
-            
+            _rename_cached_value_sheet(filename, old_name, new_name)
             sheets = list_sheets(wb)
-            close_workbook(wb)
-            
-            return {
-                "success": True,
-                "file_path": filename,
-                "old_name": old_name,
-                "new_name": new_name,
-                "all_sheets": sheets,
-                "message": f"Sheet renamed from '{old_name}' to '{new_name}'"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error renaming sheet: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": filename,
+            "old_name": old_name,
+            "new_name": new_name,
+            "all_sheets": sheets,
+            "message": f"Sheet renamed from '{old_name}' to '{new_name}'"
+        }
     
     # Register basic writing functions
     @mcp.tool(description="Write structured data arrays to Excel with intelligent type conversion")
+    @_excel_tool("Error writing data")
     def write_sheet_data_tool(file_path, sheet_name, start_cell, data):
         """Write two-dimensional data arrays to Excel with automatic data type optimization.
 
@@ -6005,100 +7527,51 @@ if HAS_MCP:
         - Validate data structure before writing large datasets
         - Consider using add_table_tool() after writing for enhanced formatting
         """
-        try:
-            # Validate inputs first
-            if not isinstance(data, list):
-                raise ValueError("The 'data' parameter must be a list")
-            
-            if not data:
-                raise ValueError("Data cannot be empty")
-            
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
-
-            # Open the file using our base function
-            wb = open_workbook(file_path)
-            
-            # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
-            
-            ws = get_sheet(wb, sheet_name)
-
-            # Clean and validate data types
-            cleaned_data = []
-            for i, row in enumerate(data):
-                if not isinstance(row, list):
-                    # Convert single values to list
-                    row = [row]
-                
-                cleaned_row = []
-                for j, cell_value in enumerate(row):
-                    # Clean and convert data types appropriately
-                    if cell_value is None or cell_value == "":
-                        cleaned_row.append("")
-                    elif isinstance(cell_value, str):
-                        # Try to convert string numbers to actual numbers
-                        cell_str = cell_value.strip()
-                        if cell_str == "":
-                            cleaned_row.append("")
-                        elif cell_str.replace('.','').replace(',','').replace('-','').isdigit():
-                            # Try to convert to number
-                            try:
-                                if '.' in cell_str:
-                                    cleaned_row.append(float(cell_str.replace(',', '')))
-                                else:
-                                    cleaned_row.append(int(cell_str.replace(',', '')))
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        elif cell_str.endswith('%'):
-                            # Convert percentage
-                            try:
-                                pct_value = float(cell_str[:-1]) / 100
-                                cleaned_row.append(pct_value)
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        else:
-                            cleaned_row.append(cell_str)
-                    else:
-                        cleaned_row.append(cell_value)
-                
-                cleaned_data.append(cleaned_row)
+        # Validate inputs first
+        if not isinstance(data, list):
+            raise ValueError("The 'data' parameter must be a list")
+        
+        if not data:
+            raise ValueError("Data cannot be empty")
+        
+        # Clean and validate data types; ragged rows are written as
+        # given so cells beyond a short row are left untouched
+        cleaned_data, ncols = _clean_data(data, pad=False)
 
+        # Edit the cached workbook so the tools usually chained after this
+        # one (add_table_tool, add_formulas_tool) reuse the parsed file; a
+        # missing file or sheet fails on lookup
+        with _edit_sheet(file_path, sheet_name) as ws:
             # Write the cleaned data
             write_sheet_data(ws, start_cell, cleaned_data)
-
-            # Save with optimization
-            save_workbook(wb, file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "start_cell": start_cell,
-                "rows_written": len(cleaned_data),
-                "columns_written": max([len(row) for row in cleaned_data], default=0),
-                "data_cleaned": True,
-                "message": f"Data successfully written starting at {start_cell} with automatic type conversion"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error writing data: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "start_cell": start_cell,
+            "rows_written": len(cleaned_data),
+            "columns_written": ncols,
+            "data_cleaned": True,
+            "message": f"Data successfully written starting at {start_cell} with automatic type conversion"
+        }
     
     @mcp.tool(description="Update a single cell")
-    def update_cell_tool(file_path, sheet_name, cell, value_or_formula):
+    @_excel_tool("Error updating cell")
+    def update_cell_tool(file_path, sheet_name, cell, value_or_formula, verbose=False):
         """Update the value or formula of a specific cell.
 
         This function modifies a single cell in a worksheet. It can be used for both values and formulas.
+        The change is kept in the in-memory workbook cache; call ``flush_workbook_tool`` to write it
+        to disk immediately.
 
         Args:
             file_path (str): Full path and name of the Excel file.
             sheet_name (str): Name of the sheet containing the cell to update.
             cell (str): Reference of the cell to update (e.g. ``"B5"``).
             value_or_formula (str | int | float | bool): Value or formula to set. Formulas must start with ``=``.
+            verbose (bool, optional): Also return ``original_value``, ``data_cleaned`` and a
+                human-readable ``message``. Defaults to ``False``.
 
         Returns:
             dict: Information about the operation including the modified cell.
@@ -6112,66 +7585,85 @@ if HAS_MCP:
             update_cell_tool("C:/data/report.xlsx", "Sales", "C4", 5280.50)  # Numeric value
             update_cell_tool("C:/data/report.xlsx", "Sales", "D4", "=SUM(A1:A10)")  # Formula
         """
-        try:
-            # Validate inputs first
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
+        result = update_cells_tool(file_path, sheet_name, {cell: value_or_formula})
+        if not result["success"]:
+            raise ExcelMCPError(result["error"])
+        
+        cleaned_value = result["values"][cell]
+        response = {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "cell": cell,
+            "value": cleaned_value
+        }
+        if verbose:
+            response["original_value"] = value_or_formula
+            response["data_cleaned"] = cleaned_value != value_or_formula
+            response["message"] = f"Cell {cell} successfully updated in sheet {sheet_name} with automatic type conversion"
+        return response
+    
+    @mcp.tool(description="Update several cells of a sheet in one call")
+    @_excel_tool("Error updating cells")
+    def update_cells_tool(file_path, sheet_name, updates, verbose=False):
+        """Update the values or formulas of several cells in one call.
+
+        The workbook is fetched once and every cell is written before returning, so updating
+        many cells costs a single load instead of one per cell. Values are converted exactly
+        like in ``update_cell_tool``. The changes are kept in the in-memory workbook cache;
+        call ``flush_workbook_tool`` to write them to disk immediately.
 
-            # Open the file using our base function
-            wb = open_workbook(file_path)
-            
-            # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
-            
-            ws = get_sheet(wb, sheet_name)
-            
-            # Clean and convert value appropriately
-            cleaned_value = value_or_formula
-            if isinstance(value_or_formula, str) and not str(value_or_formula).startswith('='):
-                # Not a formula, try to convert data type
-                value_str = str(value_or_formula).strip()
-                if value_str.replace('.','').replace(',','').replace('-','').isdigit():
-                    # Try to convert to number
-                    try:
-                        if '.' in value_str:
-                            cleaned_value = float(value_str.replace(',', ''))
-                        else:
-                            cleaned_value = int(value_str.replace(',', ''))
-                    except ValueError:
-                        pass  # Keep as string
-                elif value_str.endswith('%'):
-                    # Convert percentage
-                    try:
-                        cleaned_value = float(value_str[:-1]) / 100
-                    except ValueError:
-                        pass  # Keep as string
-            
-            # Update the cell with enhanced processing
-            update_cell(ws, cell, cleaned_value)
-            
-            # Save changes with optimization
-            save_workbook(wb, file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "cell": cell,
-                "value": cleaned_value,
-                "original_value": value_or_formula,
-                "data_cleaned": cleaned_value != value_or_formula,
-                "message": f"Cell {cell} successfully updated in sheet {sheet_name} with automatic type conversion"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error updating cell: {e}"
-            }
+        Args:
+            file_path (str): Full path and name of the Excel file.
+            sheet_name (str): Name of the sheet containing the cells to update.
+            updates (dict): Mapping of cell reference to value or formula, e.g.
+                ``{"B5": 100, "C5": "=B5*2"}``. Formulas must start with ``=``.
+            verbose (bool, optional): Also return a human-readable ``message``. Defaults to ``False``.
+
+        Returns:
+            dict: Information about the operation including the written values per cell.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            SheetNotFoundError: If the specified sheet does not exist.
+            CellReferenceError: If a cell reference is not valid.
+
+        Example:
+            update_cells_tool("C:/data/report.xlsx", "Sales", {"C4": 5280.50, "D4": "=SUM(A1:A10)"})
+        """
+        if not isinstance(updates, dict) or not updates:
+            raise ValueError("updates must be a non-empty dictionary of cell references to values")
+        
+        # Clean and convert values appropriately before touching the workbook
+        cleaned_values = {cell: _clean_value(value) for cell, value in updates.items()}
+        
+        # Edit the cached workbook; the file is written when the cache is flushed
+        with _edit_sheet(file_path, sheet_name) as ws:
+            # Update the cells; only text goes through update_cell, which also
+            # widens columns and wraps long values, the rest is assigned directly
+            for cell, cleaned_value in cleaned_values.items():
+                if isinstance(cleaned_value, str):
+                    update_cell(ws, cell, cleaned_value)
+                    continue
+                try:
+                    ws[cell] = cleaned_value
+                except (AttributeError, IndexError, KeyError, ValueError):
+                    raise CellReferenceError(f"Invalid cell reference: '{cell}'")
+        
+        response = {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "cells_updated": len(cleaned_values),
+            "values": cleaned_values
+        }
+        if verbose:
+            response["message"] = f"{len(cleaned_values)} cell(s) successfully updated in sheet {sheet_name} with automatic type conversion"
+        return response
     
     # Register advanced functions
     @mcp.tool(description="Transform data ranges into professional Excel tables with filtering and formatting")
+    @_excel_tool("Error creating table")
     def add_table_tool(file_path, sheet_name, table_name, cell_range, style=None):
         """Convert data ranges into native Excel tables with professional formatting and functionality.
 
@@ -6302,17 +7794,12 @@ if HAS_MCP:
         - Use add_chart_tool() to visualize table data
         - Use filter_data_tool() to extract subsets
         - Apply additional formatting as needed
+        - Use flush_workbook_tool() to write the changes to disk before opening the file elsewhere
         """
-        try:
-            # Validate inputs first
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
-            
-            # Open the file using our base function
-            wb = open_workbook(file_path)
-            
+        # Edit the cached workbook; the file is written when the cache is flushed
+        with cached_workbook_edit(file_path) as wb:
             # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
+            if not _has_sheet(wb, sheet_name):
                 raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
             
             # Get the sheet
@@ -6322,32 +7809,24 @@ if HAS_MCP:
             try:
                 cell_range = conservative_table_cleanup(ws, cell_range)
             except Exception as e:
-                logger.warning(f"Conservative table cleanup failed, using original range: {e}")
+                logger.warning("Conservative table cleanup failed, using original range: %s", e)
             
             # Add the table with enhanced processing
             table = add_table(ws, table_name, cell_range, style or DEFAULT_TABLE_STYLE)
-            
-            # Save changes with optimization
-            save_workbook(wb, file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "table_name": table_name,
-                "range": cell_range,
-                "style": style or DEFAULT_TABLE_STYLE,
-                "optimized": True,
-                "message": f"Table '{table_name}' successfully created in range {cell_range} with enhanced formatting"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error creating table: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "table_name": table_name,
+            "range": cell_range,
+            "style": style or DEFAULT_TABLE_STYLE,
+            "optimized": True,
+            "message": f"Table '{table_name}' successfully created in range {cell_range} with enhanced formatting"
+        }
     
     @mcp.tool(description="Create professional native Excel charts with intelligent positioning and styling")
+    @_excel_tool("Error creating chart")
     def add_chart_tool(file_path, sheet_name, chart_type, data_range, title=None, position=None, style=None, theme=None, custom_palette=None):
         """Create native Excel charts with professional styling and intelligent data linking.
 
@@ -6547,17 +8026,15 @@ if HAS_MCP:
         - "Wrong data series": Verify headers are in first row/column
         - "Poor positioning": Specify exact position parameter
         - "Styling issues": Try different style numbers or themes
+        - "Chart missing in Excel": Call flush_workbook_tool() to write pending changes to disk
         """
-        try:
-            # Validate inputs first
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
-            
-            # Open the file using our base function
-            wb = open_workbook(file_path)
-            
+        # Normalize the chart type once; "col" is accepted as an alias of "column"
+        chart_type = {'col': 'column'}.get(chart_type.lower(), chart_type.lower())
+        
+        # Edit the cached workbook; the file is written when the cache is flushed
+        with cached_workbook_edit(file_path) as wb:
             # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
+            if not _has_sheet(wb, sheet_name):
                 raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
             
             # Validate data range contains data
@@ -6568,18 +8045,16 @@ if HAS_MCP:
                     # Extract range part if sheet is included
                     data_range = data_range.split('!')[1]
                 
-                start_row, start_col, end_row, end_col = ExcelRange.parse_range(data_range)
+                start_row, start_col, end_row, end_col = _parse_range(data_range)
                 
-                # Check if range has actual data
-                has_data = False
-                for row in range(start_row + 1, end_row + 2):
-                    for col in range(start_col + 1, end_col + 2):
-                        cell = ws.cell(row=row, column=col)
-                        if cell.value is not None and str(cell.value).strip():
-                            has_data = True
-                            break
-                    if has_data:
-                        break
+                # Check if range has actual data in a single pass over the values
+                has_data = any(
+                    v is not None and (not isinstance(v, str) or v.strip())
+                    for row in ws.iter_rows(min_row=start_row + 1, max_row=end_row + 1,
+                                            min_col=start_col + 1, max_col=end_col + 1,
+                                            values_only=True)
+                    for v in row
+                )
                 
                 if not has_data:
                     raise ValueError(f"Data range '{data_range}' appears to be empty")
@@ -6592,38 +8067,25 @@ if HAS_MCP:
                 chart_id, chart = add_chart(wb, sheet_name, chart_type, data_range, title, position, style, theme, custom_palette)
             except Exception as e:
                 raise ChartError(f"Failed to create chart: {e}")
-            
-            # Save changes with optimization
-            save_workbook(wb, file_path)
-            
-            # Extract chart type for a better response message
-            chart_type_display = chart_type
-            if chart_type.lower() == "col":
-                chart_type_display = "column"
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "chart_id": chart_id,
-                "chart_type": chart_type_display,
-                "data_range": data_range,
-                "title": title,
-                "position": position,
-                "message": f"Chart '{chart_type_display}' successfully created with ID {chart_id}",
-                "chart_position": position or "Auto-positioned",
-                "overlap_prevention": True,
-                "positioning_strategy": "Intelligent automatic positioning with overlap prevention"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error creating chart: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "chart_id": chart_id,
+            "chart_type": chart_type,
+            "data_range": data_range,
+            "title": title,
+            "position": position,
+            "message": f"Chart '{chart_type}' successfully created with ID {chart_id}",
+            "chart_position": position or "Auto-positioned",
+            "overlap_prevention": True,
+            "positioning_strategy": "Intelligent automatic positioning with overlap prevention"
+        }
     
     # Register new combined functions
     @mcp.tool(description="Create a sheet with data in one step")
+    @_excel_tool("Error creating sheet with data")
     def create_sheet_with_data_tool(file_path, sheet_name, data, overwrite=False):
         """Create an Excel file with a single sheet and data in one step.
 
@@ -6638,21 +8100,27 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation.
         """
-        try:
-            # Check if the file exists
-            file_exists = os.path.exists(file_path)
-            
-            if file_exists and not overwrite:
-                raise FileExistsError(f"The file '{file_path}' already exists. Use overwrite=True to overwrite.")
-            
-            # Create or open the file
-            if not file_exists or overwrite:
-                wb = openpyxl.Workbook()
-                # Remove the default sheet if it exists
-                if "Sheet" in wb.sheetnames:
-                    del wb["Sheet"]
-            else:
-                wb = openpyxl.load_workbook(file_path)
+        # Check if the file exists
+        file_exists = os.path.exists(file_path)
+        
+        if file_exists and not overwrite:
+            raise FileExistsError(f"The file '{file_path}' already exists. Use overwrite=True to overwrite.")
+        
+        # The file is replaced, so pending cached edits to it are obsolete
+        forget_cached_workbook(file_path)
+        
+        # Create or open the file
+        if not file_exists or overwrite:
+            # A new file is streamed through a write-only workbook, which
+            # has no default sheet and never materializes the cells
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet(sheet_name)
+            
+            # Write the data
+            if data:
+                write_sheet_data_write_only(ws, data)
+        else:
+            wb = openpyxl.load_workbook(file_path)
             
             # Check if the sheet already exists
             if sheet_name in wb.sheetnames:
@@ -6668,26 +8136,21 @@ if HAS_MCP:
             # Write the data
             if data:
                 write_sheet_data(ws, "A1", data)
-            
-            # Save the file
-            wb.save(file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "rows_written": len(data) if data else 0,
-                "columns_written": max([len(row) if isinstance(row, list) else 1 for row in data], default=0) if data else 0,
-                "message": f"File created with sheet '{sheet_name}' and data"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error creating sheet with data: {e}"
-            }
+        
+        # Save the file
+        wb.save(file_path)
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "rows_written": len(data) if data else 0,
+            "columns_written": max((len(row) if isinstance(row, list) else 1 for row in data), default=0) if data else 0,
+            "message": f"File created with sheet '{sheet_name}' and data"
+        }
     
     @mcp.tool(description="Create a formatted table with data in one step")
+    @_excel_tool("Error creating formatted table")
     def create_formatted_table_tool(file_path, sheet_name, start_cell, data, table_name, table_style="TableStyleMedium9", formats=None):
         """Create a formatted table with data in one step.
 
@@ -6709,122 +8172,66 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation.
         """
-        try:
-            # Validate inputs first
-            if not isinstance(data, list) or not data:
-                raise ValueError("Data must be a non-empty list")
-            
-            # Check if the file exists, if not, create it
-            if not os.path.exists(file_path):
-                wb = create_workbook()
-                if "Sheet" in list_sheets(wb) and sheet_name != "Sheet":
-                    # Rename the default sheet
-                    rename_sheet(wb, "Sheet", sheet_name)
-            else:
-                wb = open_workbook(file_path)
-                
-                # Create the sheet if it doesn't exist
-                if sheet_name not in list_sheets(wb):
-                    add_sheet(wb, sheet_name)
-            
-            # Get the sheet
-            ws = get_sheet(wb, sheet_name)
-            
+        # Validate inputs first
+        if not isinstance(data, list) or not data:
+            raise ValueError("Data must be a non-empty list")
+        
+        # Open the file, or create it, with the target sheet in place
+        with _edit_or_create_sheet(file_path, sheet_name) as (wb, ws):
             # Clean and write the data with enhanced processing
-            cleaned_data = []
-            for i, row in enumerate(data):
-                if not isinstance(row, list):
-                    row = [row]
-                
-                cleaned_row = []
-                for j, cell_value in enumerate(row):
-                    # Clean and convert data types appropriately
-                    if cell_value is None or cell_value == "":
-                        cleaned_row.append("")
-                    elif isinstance(cell_value, str):
-                        cell_str = cell_value.strip()
-                        if cell_str == "":
-                            cleaned_row.append("")
-                        elif cell_str.replace('.','').replace(',','').replace('-','').isdigit():
-                            try:
-                                if '.' in cell_str:
-                                    cleaned_row.append(float(cell_str.replace(',', '')))
-                                else:
-                                    cleaned_row.append(int(cell_str.replace(',', '')))
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        elif cell_str.endswith('%'):
-                            try:
-                                pct_value = float(cell_str[:-1]) / 100
-                                cleaned_row.append(pct_value)
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        else:
-                            cleaned_row.append(cell_str)
-                    else:
-                        cleaned_row.append(cell_value)
-                
-                cleaned_data.append(cleaned_row)
+            cleaned_data, ncols = _clean_data(data)
             
-            write_sheet_data(ws, start_cell, cleaned_data)
+            # Widths and number formats are fitted once by save_workbook,
+            # after the formulas below have been added
+            write_sheet_data(ws, start_cell, cleaned_data, autofit=False)
             
             # Calculate exact table range based on provided data only
             start_row, start_col = ExcelRange.parse_cell_ref(start_cell)
             end_row = start_row + len(cleaned_data) - 1
-            end_col = start_col + (len(cleaned_data[0]) if cleaned_data and len(cleaned_data) > 0 else 0) - 1
+            end_col = start_col + ncols - 1
             table_range = ExcelRange.range_to_a1(start_row, start_col, end_row, end_col)
             
             # Apply conservative table cleanup (only improves headers, no range expansion)
             try:
                 table_range = conservative_table_cleanup(ws, table_range)
             except Exception as e:
-                logger.warning(f"Conservative table cleanup failed: {e}")
+                logger.warning("Conservative table cleanup failed: %s", e)
             
             # Create the table with enhanced processing
             add_table(ws, table_name, table_range, table_style or DEFAULT_TABLE_STYLE)
             
-            # Apply formats if provided
+            # Apply formats if provided; consecutive entries with the same
+            # format are applied together, their single cells merged into ranges
             if formats:
-                for cell_range, fmt in formats.items():
-                    if isinstance(fmt, dict):
-                        apply_style(ws, cell_range, fmt)
-                    else:
-                        apply_number_format(ws, cell_range, fmt)
-            
-            # Apply consistent formatting
-            apply_consistent_number_format(ws, table_range)
-            enhanced_autofit_columns(ws)
+                for fmt, entries in itertools.groupby(formats.items(), key=lambda entry: entry[1]):
+                    for cell_range in _merge_cell_ranges([cell_range for cell_range, _ in entries]):
+                        if isinstance(fmt, dict):
+                            apply_style(ws, cell_range, fmt)
+                        else:
+                            apply_number_format(ws, cell_range, fmt)
             
             # Add smart formulas to enhance the table
             try:
                 formula_result = add_formula_to_table(ws, table_range, 'auto')
                 if formula_result.get('success'):
-                    logger.info(f"Added formulas to table: {formula_result.get('message', '')}")
+                    logger.info("Added formulas to table: %s", formula_result.get('message', ''))
             except Exception as e:
-                logger.warning(f"Could not add formulas to table: {e}")
-            
-            # Save with optimization
-            save_workbook(wb, file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "table_name": table_name,
-                "table_range": table_range,
-                "table_style": table_style or DEFAULT_TABLE_STYLE,
-                "data_cleaned": True,
-                "optimized": True,
-                "message": f"Table '{table_name}' created and formatted successfully with enhanced processing"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error creating formatted table: {e}"
-            }
+                logger.warning("Could not add formulas to table: %s", e)
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "table_name": table_name,
+            "table_range": table_range,
+            "table_style": table_style or DEFAULT_TABLE_STYLE,
+            "data_cleaned": True,
+            "optimized": True,
+            "message": f"Table '{table_name}' created and formatted successfully with enhanced processing"
+        }
     
     @mcp.tool(description="Create a chart from new data in one step")
+    @_excel_tool("Error creating chart with data")
     def create_chart_from_data_tool(file_path, sheet_name, data, chart_type, position=None, title=None, style=None):
         """Create a chart from new data in one step.
 
@@ -6842,159 +8249,95 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation.
         """
-        try:
-            # Validate inputs first
-            if not isinstance(data, list) or not data:
-                raise ValueError("Data must be a non-empty list")
-            
-            # Check if the file exists, if not, create it
-            if not os.path.exists(file_path):
-                wb = create_workbook()
-                if "Sheet" in list_sheets(wb) and sheet_name != "Sheet":
-                    rename_sheet(wb, "Sheet", sheet_name)
-            else:
-                wb = open_workbook(file_path)
-                
-                # Create the sheet if it doesn't exist
-                if sheet_name not in list_sheets(wb):
-                    add_sheet(wb, sheet_name)
-            
-            # Get the sheet
-            ws = get_sheet(wb, sheet_name)
-            
+        # Normalize the chart type once; "col" is accepted as an alias of "column"
+        chart_type = {'col': 'column'}.get(chart_type.lower(), chart_type.lower())
+        
+        # Validate inputs first
+        if not isinstance(data, list) or not data:
+            raise ValueError("Data must be a non-empty list")
+        
+        # Open the file, or create it, with the target sheet in place
+        with _edit_or_create_sheet(file_path, sheet_name) as (wb, ws):
             # Find a free area for the data intelligently
             start_cell = "A1"
             
             # Check if there is already data in that area
             if ws["A1"].value is not None:
-                # Find the first empty column
-                col = 1
-                while ws.cell(row=1, column=col).value is not None:
-                    col += 1
-                start_cell = f"{get_column_letter(col)}1"
+                # Start right after the last used column, which openpyxl tracks
+                start_cell = f"{get_column_letter(ws.max_column + 1)}1"
             
             # Clean and write the data with enhanced processing
-            cleaned_data = []
-            for i, row in enumerate(data):
-                if not isinstance(row, list):
-                    row = [row]
-                
-                cleaned_row = []
-                for j, cell_value in enumerate(row):
-                    # Clean and convert data types appropriately
-                    if cell_value is None or cell_value == "":
-                        cleaned_row.append("")
-                    elif isinstance(cell_value, str):
-                        cell_str = cell_value.strip()
-                        if cell_str == "":
-                            cleaned_row.append("")
-                        elif cell_str.replace('.','').replace(',','').replace('-','').isdigit():
-                            try:
-                                if '.' in cell_str:
-                                    cleaned_row.append(float(cell_str.replace(',', '')))
-                                else:
-                                    cleaned_row.append(int(cell_str.replace(',', '')))
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        elif cell_str.endswith('%'):
-                            try:
-                                pct_value = float(cell_str[:-1]) / 100
-                                cleaned_row.append(pct_value)
-                            except ValueError:
-                                cleaned_row.append(cell_str)
-                        else:
-                            cleaned_row.append(cell_str)
-                    else:
-                        cleaned_row.append(cell_value)
-                
-                cleaned_data.append(cleaned_row)
+            cleaned_data, ncols = _clean_data(data)
             
-            write_sheet_data(ws, start_cell, cleaned_data)
+            # Widths and number formats are fitted once by save_workbook,
+            # after the formulas below have been added
+            write_sheet_data(ws, start_cell, cleaned_data, autofit=False)
             
             # Determine the data range for the chart
             start_row, start_col = ExcelRange.parse_cell_ref(start_cell)
             end_row = start_row + len(cleaned_data) - 1
-            end_col = start_col + (len(cleaned_data[0]) if cleaned_data and len(cleaned_data) > 0 else 0) - 1
+            end_col = start_col + ncols - 1
             data_range = ExcelRange.range_to_a1(start_row, start_col, end_row, end_col)
             
             # AUTOMATIC INTELLIGENT POSITIONING - No overlaps guaranteed!
+            # Chart positions are read once and shared by the checks below
+            existing_charts = get_existing_chart_positions(ws)
             if not position:
-                # Automatically analyze worksheet layout and prevent ALL overlaps
-                existing_charts = get_existing_chart_positions(ws)
-                
-                # Get intelligent layout recommendations based on data
-                layout_analysis = get_chart_layout_recommendations(ws, [data_range])
-                
                 # Use intelligent positioning with full context
-                position = find_optimal_chart_position(ws, end_col + 2, 0, 8, 15)
-                
-                # Log positioning decision for transparency
-                logger.info(f"AUTOMATIC POSITIONING: Found {len(existing_charts)} existing charts. Strategy: {layout_analysis.get('layout_strategy', 'adaptive')}. Selected position: {position} (guaranteed no overlap)")
+                position = find_optimal_chart_position(ws, end_col + 2, 0, 8, 15, existing_charts)
+            
+                # Log positioning decision for transparency; the layout
+                # analysis only feeds this message, so skip it when not logged
+                if logger.isEnabledFor(logging.INFO):
+                    layout_analysis = get_chart_layout_recommendations(ws, [data_range])
+                    logger.info("AUTOMATIC POSITIONING: Found %d existing charts. Strategy: %s. Selected position: %s (guaranteed no overlap)",
+                                len(existing_charts), layout_analysis.get('layout_strategy', 'adaptive'), position)
             else:
                 # Validate user-provided position to prevent overlaps
-                existing_charts = get_existing_chart_positions(ws)
                 try:
                     # Parse user position
-                    import re
-                    pos_match = re.match(r'([A-Z]+)(\d+)', position.upper())
+                    pos_match = _CELL_POSITION_RE.match(position.upper())
                     if pos_match:
                         pos_col = column_index_from_string(pos_match.group(1)) - 1
                         pos_row = int(pos_match.group(2)) - 1
-                        
+            
                         # Check if user position would cause overlap
                         if check_area_overlap(pos_col, pos_row, 8, 15, existing_charts, 1, 1):
                             # User position would overlap - find alternative
-                            logger.warning(f"USER POSITION {position} would cause overlap. Finding safe alternative...")
-                            safe_position = find_optimal_chart_position(ws, pos_col, pos_row, 8, 15)
-                            logger.info(f"OVERLAP PREVENTION: Changed position from {position} to {safe_position}")
+                            logger.warning("USER POSITION %s would cause overlap. Finding safe alternative...", position)
+                            safe_position = find_optimal_chart_position(ws, pos_col, pos_row, 8, 15, existing_charts)
+                            logger.info("OVERLAP PREVENTION: Changed position from %s to %s", position, safe_position)
                             position = safe_position
                         else:
-                            logger.info(f"USER POSITION {position} validated - no overlap detected")
+                            logger.info("USER POSITION %s validated - no overlap detected", position)
                 except Exception as e:
-                    logger.warning(f"Could not validate user position {position}: {e}. Using automatic positioning.")
-                    position = find_optimal_chart_position(ws, 5, 0, 8, 15)
-            
-            # Apply consistent formatting to data
-            apply_consistent_number_format(ws, data_range)
-            enhanced_autofit_columns(ws)
+                    logger.warning("Could not validate user position %s: %s. Using automatic positioning.", position, e)
+                    position = find_optimal_chart_position(ws, 5, 0, 8, 15, existing_charts)
             
             # Create the chart with enhanced error handling
             try:
                 chart_id, chart = add_chart(wb, sheet_name, chart_type, data_range, title, position, style)
             except Exception as e:
                 raise ChartError(f"Failed to create chart: {e}")
-            
-            # Save with optimization
-            save_workbook(wb, file_path)
-            
-            # Extract chart type for better response message
-            chart_type_display = chart_type
-            if chart_type.lower() == "col":
-                chart_type_display = "column"
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "data_range": data_range,
-                "chart_id": chart_id,
-                "chart_type": chart_type_display,
-                "position": position,
-                "data_cleaned": True,
-                "optimized": True,
-                "message": f"Chart '{chart_type_display}' successfully created from new data with enhanced processing"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error creating chart with data: {e}"
-            }
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "data_range": data_range,
+            "chart_id": chart_id,
+            "chart_type": chart_type,
+            "position": position,
+            "data_cleaned": True,
+            "optimized": True,
+            "message": f"Chart '{chart_type}' successfully created from new data with enhanced processing"
+        }
     
     
     
     
     @mcp.tool(description="Import data from multiple sources (CSV, JSON, SQL) into an Excel file")
+    @_excel_tool("Error importing data")
     def import_data_tool(excel_file, import_config, sheet_name=None, start_cell="A1", create_tables=False):
         """Import data from multiple sources (CSV, JSON, SQL) into an Excel file.
 
@@ -7008,9 +8351,11 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation.
         """
+        flush_cached_workbook(excel_file)
         return import_multi_source_data(excel_file, import_config, sheet_name, start_cell, create_tables)
     
     @mcp.tool(description="Export Excel data to multiple formats (CSV, JSON, PDF)")
+    @_excel_tool("Error exporting data")
     def export_data_tool(excel_file, export_config):
         """Export Excel data to multiple formats (CSV, JSON, PDF).
 
@@ -7021,9 +8366,11 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation.
         """
+        flush_cached_workbook(excel_file)
         return export_excel_data(excel_file, export_config)
     
     @mcp.tool(description="Filter and extract data from a table or range as records")
+    @_excel_tool("Error filtering data")
     def filter_data_tool(file_path, sheet_name, range_str=None, table_name=None, filters=None):
         """Filter and extract data from a table or range as records.
 
@@ -7044,58 +8391,45 @@ if HAS_MCP:
         Returns:
             dict: Result of the operation with the filtered data.
         """
-        try:
-            # Validate arguments
-            if not range_str and not table_name:
-                raise ValueError("You must provide 'range_str' or 'table_name'")
+        # Validate arguments
+        if not range_str and not table_name:
+            raise ValueError("You must provide 'range_str' or 'table_name'")
 
-            # Validate inputs first
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
+        # Validate inputs first
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File does not exist: {file_path}")
 
-            # Open the file using our base function
-            wb = open_workbook(file_path)
+        # Open the file using our base function
+        wb = open_workbook(file_path)
 
-            # Verify that the sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in the file")
-            
-            ws = get_sheet(wb, sheet_name)
-            
-            # If table_name is provided, get its range
-            if table_name:
-                tables = list_tables(ws)
-                if table_name not in [t.get('name') for t in tables]:
-                    raise TableNotFoundError(f"Table '{table_name}' does not exist on sheet '{sheet_name}'")
-                
-                # Find the table and get its range
-                for table in tables:
-                    if table.get('name') == table_name:
-                        range_str = table.get('range')
-                        break
-            
-            # Filter the data with enhanced processing
-            filtered_data = filter_sheet_data(wb, sheet_name, range_str, filters)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "source": f"Table '{table_name}'" if table_name else f"Range {range_str}",
-                "filtered_data": filtered_data,
-                "record_count": len(filtered_data),
-                "enhanced_processing": True,
-                "message": f"Found {len(filtered_data)} records that meet the criteria"
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error filtering data: {e}"
-            }
+        # Verify that the sheet exists
+        if not _has_sheet(wb, sheet_name):
+            raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in the file")
+        
+        # If table_name is provided, get its range
+        if table_name:
+            table_ranges = {t['name']: t['ref'] for t in list_tables(wb, sheet_name)}
+            if table_name not in table_ranges:
+                raise TableError(f"Table '{table_name}' does not exist on sheet '{sheet_name}'")
+            range_str = table_ranges[table_name]
+        
+        # Filter the data with enhanced processing
+        filtered_data = filter_sheet_data(wb, sheet_name, range_str, filters)
+        
+        return {
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "source": f"Table '{table_name}'" if table_name else f"Range {range_str}",
+            "filtered_data": filtered_data,
+            "record_count": len(filtered_data),
+            "enhanced_processing": True,
+            "message": f"Found {len(filtered_data)} records that meet the criteria"
+        }
 
     @mcp.tool(description="Export Excel worksheets to PDF with intelligent automatic handling")
-    def export_pdf_tool(excel_file, sheets=None, output_path=None, single_file=True):
+    @_excel_tool("Error exporting to PDF")
+    async def export_pdf_tool(excel_file, sheets=None, output_path=None, single_file=True):
         """Export Excel worksheets to PDF with intelligent automatic handling.
 
         **UNIFIED PDF EXPORT - HANDLES ALL SCENARIOS:**
@@ -7136,64 +8470,67 @@ if HAS_MCP:
         - Error handling: Graceful fallbacks for complex scenarios
         - Professional output: Consistent PDF quality and formatting
         """
-        try:
-            # Validate input file
-            if not os.path.exists(excel_file):
-                raise FileNotFoundError(f"Excel file not found: {excel_file}")
-
-            # Open workbook to analyze structure
-            wb = open_workbook(excel_file)
-            available_sheets = list_sheets(wb)
-            
-            # Determine sheets to export
-            if sheets is None:
-                target_sheets = available_sheets
-            elif isinstance(sheets, str):
-                target_sheets = [sheets]
-            elif isinstance(sheets, list):
-                target_sheets = sheets
-            else:
-                raise ValueError("sheets parameter must be None, string, or list")
-            
-            # Validate target sheets exist
-            missing_sheets = [s for s in target_sheets if s not in available_sheets]
-            if missing_sheets:
-                raise ValueError(f"Sheets not found: {missing_sheets}. Available: {available_sheets}")
-            
-            # Intelligent export strategy selection
-            if len(target_sheets) == 1:
-                # Single sheet - use optimized single sheet export
-                result = export_single_visible_sheet_pdf(excel_file, output_path)
-                strategy = "single_sheet"
-                output_files = [result.get('output_file', output_path)] if result.get('success') else []
-            else:
-                # Multiple sheets - use multi-sheet export
-                output_dir = os.path.dirname(output_path) if output_path else None
-                result = export_sheets_to_pdf(excel_file, target_sheets, output_dir, single_file)
-                strategy = "multi_sheet"
-                output_files = result.get('pdf_files', []) if result.get('success') else []
-            
-            return {
-                "success": result.get('success', False),
-                "excel_file": excel_file,
-                "exported_sheets": target_sheets,
-                "pdf_strategy": strategy,
-                "single_file": single_file if len(target_sheets) > 1 else True,
-                "output_files": output_files,
-                "files_created": len(output_files),
-                "result_details": result,
-                "message": f"Successfully exported {len(target_sheets)} sheet(s) to PDF using {strategy} strategy"
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "excel_file": excel_file,
-                "message": f"Error exporting to PDF: {e}"
-            }
+        # LibreOffice/Excel convert the file on disk, so write pending edits first
+        flush_cached_workbook(excel_file)
+
+        # Validate input file
+        if not os.path.exists(excel_file):
+            raise FileNotFoundError(f"Excel file not found: {excel_file}")
+
+        # Only the sheet names are needed, so skip parsing cells and styles
+        available_sheets = get_sheet_names(excel_file)
+        
+        # Determine sheets to export
+        if sheets is None:
+            target_sheets = available_sheets
+        elif isinstance(sheets, str):
+            target_sheets = [sheets]
+        elif isinstance(sheets, list):
+            target_sheets = sheets
+        else:
+            raise ValueError("sheets parameter must be None, string, or list")
+        
+        # Validate target sheets exist
+        available_set = set(available_sheets)
+        missing_sheets = [s for s in target_sheets if s not in available_set]
+        if missing_sheets:
+            raise ValueError(f"Sheets not found: {missing_sheets}. Available: {available_sheets}")
+        
+        # Run the conversion in a worker thread so the server keeps
+        # dispatching other requests while LibreOffice/Excel is busy
+        loop = asyncio.get_running_loop()
+        
+        # Intelligent export strategy selection
+        if len(target_sheets) == 1:
+            # Single sheet - use optimized single sheet export
+            result = await loop.run_in_executor(
+                None, functools.partial(export_single_visible_sheet_pdf, excel_file, output_path)
+            )
+            strategy = "single_sheet"
+            output_files = [result.get('output_file', output_path)] if result.get('success') else []
+        else:
+            # Multiple sheets - use multi-sheet export
+            output_dir = os.path.dirname(output_path) if output_path else None
+            result = await loop.run_in_executor(
+                None, functools.partial(export_sheets_to_pdf, excel_file, target_sheets, output_dir, single_file)
+            )
+            strategy = "multi_sheet"
+            output_files = result.get('pdf_files', []) if result.get('success') else []
+        
+        return {
+            "success": result.get('success', False),
+            "excel_file": excel_file,
+            "exported_sheets": target_sheets,
+            "pdf_strategy": strategy,
+            "single_file": single_file if len(target_sheets) > 1 else True,
+            "output_files": output_files,
+            "files_created": len(output_files),
+            "result_details": result,
+            "message": f"Successfully exported {len(target_sheets)} sheet(s) to PDF using {strategy} strategy"
+        }
 
     @mcp.tool(description="Comprehensive cleanup and optimization of Excel files")
+    @_excel_tool("Error optimizing Excel file")
     def optimize_excel_file_tool(excel_file, output_file=None):
         """Perform comprehensive cleanup and optimization of an Excel file.
 
@@ -7208,6 +8545,9 @@ if HAS_MCP:
         - Aligns text and numbers properly
         - Applies professional themes and layout
 
+        Every tool that saves through ``save_workbook`` already applies these
+        optimizations in memory, so there is no need to call this tool right after them.
+
         Args:
             excel_file (str): Path to the Excel file to optimize
             output_file (str, optional): Path for the optimized file. If not provided, 
@@ -7216,49 +8556,48 @@ if HAS_MCP:
         Returns:
             dict: Result of the optimization operation
         """
-        try:
-            # Open the workbook
-            wb = openpyxl.load_workbook(excel_file)
-            
-            # Apply comprehensive optimization
-            optimize_entire_workbook(wb)
-            
-            # Apply unified theme
-            apply_unified_theme(wb, "professional")
-            
-            # Determine output file
-            if not output_file:
-                output_file = excel_file
-            
-            # Save the optimized workbook
-            wb.save(output_file)
-            
-            return {
-                "success": True,
-                "input_file": excel_file,
-                "output_file": output_file,
-                "message": "Excel file has been comprehensively optimized",
-                "optimizations_applied": [
-                    "Dynamic data range detection",
-                    "Empty row removal",
-                    "Smart header renaming",
-                    "Chart repositioning",
-                    "Number format standardization",
-                    "Total row formatting",
-                    "Text alignment optimization",
-                    "Professional theme application"
-                ]
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error optimizing Excel file: {e}"
-            }
+        # Determine output file
+        if not output_file:
+            output_file = excel_file
+        
+        # save_workbook applies optimize_workbook_object before writing, and
+        # the cached copy of the workbook is reused when there is one.
+        # Pending edits are optimized as they are written here, and a file
+        # last written by the cache is left as it is.
+        flush_cached_workbook(excel_file)
+        already_optimized = workbook_is_optimized(excel_file)
+        if os.path.abspath(output_file) == os.path.abspath(excel_file):
+            if not already_optimized:
+                with cached_workbook_edit(excel_file):
+                    pass  # Only marks the cached copy as modified
+                flush_cached_workbook(excel_file)
+        elif already_optimized:
+            import shutil
+            shutil.copyfile(excel_file, output_file)
+        else:
+            save_workbook(get_cached_workbook(excel_file), output_file)
+        
+        return {
+            "success": True,
+            "input_file": excel_file,
+            "output_file": output_file,
+            "already_optimized": already_optimized,
+            "message": "Excel file has been comprehensively optimized",
+            "optimizations_applied": [
+                "Dynamic data range detection",
+                "Empty row removal",
+                "Smart header renaming",
+                "Chart repositioning",
+                "Number format standardization",
+                "Total row formatting",
+                "Text alignment optimization",
+                "Professional theme application"
+            ]
+        }
     
     @mcp.tool(description="Add intelligent Excel formulas for dynamic data analysis and calculations")
-    def add_formulas_tool(file_path, sheet_name, table_range, formula_type="auto", add_totals=True):
+    @_excel_tool("Error adding formulas")
+    def add_formulas_tool(file_path, sheet_name, table_range, formula_type="auto", add_totals=True, defer_save=False, evaluate=False):
         """Add live Excel formulas to create dynamic, self-updating data analysis.
 
         **PURPOSE & CONTEXT:**
@@ -7355,6 +8694,14 @@ if HAS_MCP:
                              **False**: Adds formulas without totals row
                              - Provides formula analysis without additional formatting
                              - Use when totals row already exists or not desired
+            defer_save (bool): Keep the change in memory without writing the file.
+                             Use it for all but the last of several chained calls
+                             and finish with flush_workbook_tool(file_path).
+            evaluate (bool): Also store the computed result of simple formulas
+                             (SUM/AVERAGE/COUNT/MAX/MIN of a range, or two cells
+                             combined with + - * /) so pandas and data_only readers
+                             see values without recalculating in Excel. Saves the
+                             file right away, even with defer_save.
 
         Returns:
             dict: Comprehensive formula addition result:
@@ -7434,55 +8781,138 @@ if HAS_MCP:
         - Use conditional formatting to highlight key metrics
         - Consider pivot tables for additional analysis
         """
+        result = {}
+        evaluated = {}
         try:
-            # Validate inputs
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
+            # Edit the cached workbook; the file is written when the cache is
+            # flushed, or left pending with defer_save
+            with _edit_sheet(file_path, sheet_name, defer_save) as ws:
+                # Add formulas to the table
+                if add_totals:
+                    result = add_formula_to_table(ws, table_range, formula_type)
+                else:
+                    result = add_smart_formulas_to_data(ws, table_range, add_totals=False)
+                
+                if not result.get('success'):
+                    # Discard whatever the failed operation left in the cached copy
+                    raise FormulaError(result.get('error', 'Unknown error'))
+                
+                if not result.get('formulas_added'):
+                    # No numeric column to total: leave the file as it is
+                    raise _WorkbookUnchanged()
+                
+                if evaluate:
+                    # The formulas land below and beside the table
+                    start_row, start_col, _, _ = _parse_range(table_range)
+                    evaluated = evaluate_formula_cells(ws, ExcelRange.range_to_a1(
+                        start_row, start_col, ws.max_row - 1, ws.max_column - 1))
+        except FormulaError:
+            if result.get('success') is not False:
+                raise
+        
+        cached_values = 0
+        if evaluate:
+            # Results can only be patched into a saved file
+            flush_cached_workbook(file_path)
+            cached_values = write_cached_formula_values(file_path, sheet_name, evaluated)
+        
+        if result.get('success'):
+            return _with_size_suggestion({
+                "success": True,
+                "file_path": file_path,
+                "sheet_name": sheet_name,
+                "table_range": table_range,
+                "formulas_added": result.get('formulas_added', []),
+                "total_row": result.get('total_row'),
+                "cached_values": cached_values,
+                "message": f"Successfully added Excel formulas: {result.get('message', '')}"
+            }, file_path)
+        else:
+            return {
+                "success": False,
+                "error": result.get('error', 'Unknown error'),
+                "message": f"Failed to add formulas: {result.get('message', '')}"
+            }
+    
+    @mcp.tool(description="Add Excel formulas to several tables or sheets of one file in a single call")
+    @_excel_tool("Error adding formulas")
+    def add_formulas_bulk_tool(file_path, operations, defer_save=False):
+        """Apply several add_formulas_tool operations to one Excel file at once.
 
-            # Open the file
-            wb = open_workbook(file_path)
-            
-            # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
-            
-            ws = get_sheet(wb, sheet_name)
-            
-            # Add formulas to the table
-            if add_totals:
-                result = add_formula_to_table(ws, table_range, formula_type)
-            else:
-                result = add_smart_formulas_to_data(ws, table_range, add_totals=False)
-            
-            if result.get('success'):
-                # Save changes
-                save_workbook(wb, file_path)
+        The file is parsed and written a single time for the whole batch instead
+        of once per call, which matters for large workbooks or long lists of
+        tables spread over many sheets. The batch is all or nothing: if any
+        operation fails, none of the changes are kept.
+
+        Args:
+            file_path (str): Path to the Excel file.
+            operations (list): One dict per table, with the same meaning as the
+                             add_formulas_tool arguments:
+                             - sheet_name (str): Sheet holding the table (required)
+                             - table_range (str): Table range, e.g. "A1:E20" (required)
+                             - formula_type (str): "auto", "sum", "average", "count",
+                               "max" or "min" (default "auto")
+                             - add_totals (bool): Add a totals row (default True)
+            defer_save (bool): Keep the changes in memory without writing the file;
+                             finish with flush_workbook_tool(file_path).
+
+        Returns:
+            dict: Batch result:
+                - success (bool): True if every operation succeeded
+                - file_path (str): Path to the modified Excel file
+                - results (list): Per operation, sheet_name, table_range,
+                  formulas_added and total_row
+                - message (str): Summary with the number of formulas added
+                - error (str): Error details, naming the failed operation
+
+        Example:
+            add_formulas_bulk_tool("C:/data/report.xlsx", [
+                {"sheet_name": "Q1", "table_range": "A1:D20", "formula_type": "sum"},
+                {"sheet_name": "Q2", "table_range": "A1:D25", "formula_type": "sum"},
+            ])
+        """
+        if not isinstance(operations, list) or not operations:
+            raise ValueError("operations must be a non-empty list")
+        
+        results = []
+        # A failed operation discards the whole batch: cached_workbook_edit
+        # undoes every change made inside the block
+        with cached_workbook_edit(file_path, defer_save=defer_save) as wb:
+            for number, operation in enumerate(operations, 1):
+                sheet_name = operation['sheet_name']
+                table_range = operation['table_range']
+                ws = _get_ws_or_raise(wb, sheet_name, file_path)
                 
-                return {
-                    "success": True,
-                    "file_path": file_path,
+                if operation.get('add_totals', True):
+                    result = add_formula_to_table(ws, table_range, operation.get('formula_type', 'auto'))
+                else:
+                    result = add_smart_formulas_to_data(ws, table_range, add_totals=False)
+                
+                if not result.get('success'):
+                    raise FormulaError(f"Operation {number} ({sheet_name}!{table_range}): "
+                                       f"{result.get('error', 'Unknown error')}")
+                
+                results.append({
                     "sheet_name": sheet_name,
                     "table_range": table_range,
                     "formulas_added": result.get('formulas_added', []),
                     "total_row": result.get('total_row'),
-                    "message": f"Successfully added Excel formulas: {result.get('message', '')}"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.get('error', 'Unknown error'),
-                    "message": f"Failed to add formulas: {result.get('message', '')}"
-                }
-                
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error adding formulas: {e}"
-            }
+                })
+            
+            formula_count = sum(len(result["formulas_added"]) for result in results)
+            if not formula_count:
+                raise _WorkbookUnchanged()
+        
+        return _with_size_suggestion({
+            "success": True,
+            "file_path": file_path,
+            "results": results,
+            "message": f"Added {formula_count} formulas in {len(results)} operations"
+        }, file_path)
     
     @mcp.tool(description="Add calculated columns with live Excel formulas for advanced data analysis")
-    def add_calculated_column_tool(file_path, sheet_name, table_range, column_header, formula_template):
+    @_excel_tool("Error adding calculated column")
+    def add_calculated_column_tool(file_path, sheet_name, table_range, column_header, formula_template, defer_save=False, evaluate=False):
         """Create calculated columns with live Excel formulas for dynamic data analysis.
 
         **PURPOSE & CONTEXT:**
@@ -7572,6 +9002,14 @@ if HAS_MCP:
                                   - "=ROUND(B{row}*C{row},2)" → Round to 2 decimal places
                                   - "=SQRT(B{row})" → Square root calculation
                                   - "=POWER(B{row},2)" → Square the value
+            defer_save (bool): Keep the change in memory without writing the file.
+                             Use it for all but the last of several chained calls
+                             and finish with flush_workbook_tool(file_path).
+            evaluate (bool): Also store the computed result of simple formulas
+                             (SUM/AVERAGE/COUNT/MAX/MIN of a range, or two cells
+                             combined with + - * /) so pandas and data_only readers
+                             see values without recalculating in Excel. Saves the
+                             file right away, even with defer_save.
 
         Returns:
             dict: Comprehensive calculated column creation result:
@@ -7671,54 +9109,54 @@ if HAS_MCP:
         - Apply conditional formatting to highlight key values
         - Use add_formulas_tool() to add totals for the new column
         """
+        result = {}
+        evaluated = {}
         try:
-            # Validate inputs
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
-
-            # Open the file
-            wb = open_workbook(file_path)
-            
-            # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
-            
-            ws = get_sheet(wb, sheet_name)
-            
-            # Create calculated column
-            result = create_calculated_column(ws, table_range, column_header, formula_template)
-            
-            if result.get('success'):
-                # Save changes
-                save_workbook(wb, file_path)
+            # Edit the cached workbook; the file is written when the cache is
+            # flushed, or left pending with defer_save
+            with _edit_sheet(file_path, sheet_name, defer_save) as ws:
+                # Create calculated column
+                result = create_calculated_column(ws, table_range, column_header, formula_template)
                 
-                return {
-                    "success": True,
-                    "file_path": file_path,
-                    "sheet_name": sheet_name,
-                    "original_range": table_range,
-                    "new_range": result.get('new_range'),
-                    "new_column": result.get('new_column'),
-                    "column_header": column_header,
-                    "formulas_added": result.get('formulas_added'),
-                    "message": f"Successfully added calculated column: {result.get('message', '')}"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": result.get('error', 'Unknown error'),
-                    "message": f"Failed to add calculated column: {result.get('message', '')}"
-                }
+                if not result.get('success'):
+                    # Discard whatever the failed operation left in the cached copy
+                    raise FormulaError(result.get('error', 'Unknown error'))
                 
-        except Exception as e:
+                if evaluate:
+                    evaluated = evaluate_formula_cells(ws, result['new_range'])
+        except FormulaError:
+            if result.get('success') is not False:
+                raise
+        
+        cached_values = 0
+        if evaluate:
+            # Results can only be patched into a saved file
+            flush_cached_workbook(file_path)
+            cached_values = write_cached_formula_values(file_path, sheet_name, evaluated)
+        
+        if result.get('success'):
+            return _with_size_suggestion({
+                "success": True,
+                "file_path": file_path,
+                "sheet_name": sheet_name,
+                "original_range": table_range,
+                "new_range": result.get('new_range'),
+                "new_column": result.get('new_column'),
+                "column_header": column_header,
+                "formulas_added": result.get('formulas_added'),
+                "cached_values": cached_values,
+                "message": f"Successfully added calculated column: {result.get('message', '')}"
+            }, file_path)
+        else:
             return {
                 "success": False,
-                "error": str(e),
-                "message": f"Error adding calculated column: {e}"
+                "error": result.get('error', 'Unknown error'),
+                "message": f"Failed to add calculated column: {result.get('message', '')}"
             }
     
     @mcp.tool(description="Add a specific Excel formula to a cell or range")
-    def add_formula_tool(file_path, sheet_name, cell_or_range, formula):
+    @_excel_tool("Error adding formula")
+    def add_formula_tool(file_path, sheet_name, cell_or_range, formula, defer_save=False, evaluate=False):
         """Add a specific Excel formula to a cell or range of cells.
 
         This tool allows you to add any Excel formula to enhance data analysis.
@@ -7730,6 +9168,14 @@ if HAS_MCP:
             cell_or_range (str): Target cell (e.g., "D5") or range (e.g., "D5:D10").
             formula (str): Excel formula to add (must start with "=").
                           Examples: "=SUM(A1:A10)", "=B2*C2", "=AVERAGE(B:B)"
+                          For a range it is written to the first cell and its
+                          relative references are shifted for the others, like
+                          an Excel fill ("=B2*C2" in D2:D4 gives "=B3*C3", ...).
+            defer_save (bool, optional): Keep the change in memory without writing the
+                          file; finish a series of calls with flush_workbook_tool(file_path).
+            evaluate (bool, optional): Also store the result of simple formulas
+                          (SUM/AVERAGE/COUNT/MAX/MIN of a range, "=B2*C2") in the
+                          file for data_only readers. Saves right away.
 
         Returns:
             dict: Result of the operation.
@@ -7742,64 +9188,73 @@ if HAS_MCP:
                 "=SUM(E2:E14)"  # Sum all values above
             )
         """
-        try:
-            # Validate inputs
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File does not exist: {file_path}")
+        # Validate inputs before touching the workbook
+        if not formula.startswith('='):
+            raise ValueError("Formula must start with '='")
 
-            if not formula.startswith('='):
-                raise ValueError("Formula must start with '='")
-
-            # Open the file
-            wb = open_workbook(file_path)
-            
-            # Validate sheet exists
-            if sheet_name not in list_sheets(wb):
-                raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in {file_path}")
-            
-            ws = get_sheet(wb, sheet_name)
-            
+        # Edit the cached workbook; a missing file or sheet fails on lookup
+        # and the file is written when the cache is flushed
+        with _edit_sheet(file_path, sheet_name, defer_save) as ws:
             # Apply formula to cell or range
             if ':' in cell_or_range:
-                # Range of cells
-                start_cell, end_cell = cell_or_range.split(':')
-                start_row, start_col = ExcelRange.parse_cell_ref(start_cell)
-                end_row, end_col = ExcelRange.parse_cell_ref(end_cell)
+                # Range of cells. Whole columns or rows ("D:D", "5:5") stop
+                # at the used area of the sheet
+                min_col, min_row, max_col, max_row = range_boundaries(cell_or_range)
+                min_col, min_row = min_col or 1, min_row or 1
+                max_col, max_row = max_col or ws.max_column, max_row or ws.max_row
+                cells_updated = (max_row - min_row + 1) * (max_col - min_col + 1)
+                target_range = (f"{get_column_letter(min_col)}{min_row}:"
+                                f"{get_column_letter(max_col)}{max_row}")
                 
-                cells_updated = 0
-                for row in range(start_row, end_row + 1):
-                    for col in range(start_col, end_col + 1):
-                        cell = ws.cell(row=row + 1, column=col + 1)
-                        # Adjust formula for each cell if it contains relative references
-                        adjusted_formula = formula  # For now, use same formula
-                        cell.value = adjusted_formula
-                        cells_updated += 1
+                # Relative references are shifted for each cell, as Excel does
+                # when filling a range; the formula applies to the first cell
+                rows = ws.iter_rows(min_row=min_row, max_row=max_row,
+                                    min_col=min_col, max_col=max_col)
+                if _has_relative_refs(formula):
+                    translator = Translator(formula, origin=f"{get_column_letter(min_col)}{min_row}")
+                    for row in rows:
+                        for cell in row:
+                            cell.value = translator.translate_formula(cell.coordinate)
+                else:
+                    # Absolute-only formulas are the same in every cell. The first
+                    # cell binds it through the validating setter and the rest copy
+                    # the bound value and type instead of re-checking it
+                    bound = None
+                    for row in rows:
+                        for cell in row:
+                            if bound is None or not FAST_FORMULA_WRITE:
+                                cell.value = formula
+                                bound = cell
+                            else:
+                                cell._value = bound._value
+                                cell.data_type = bound.data_type
                         
                 message = f"Formula added to {cells_updated} cells in range {cell_or_range}"
             else:
                 # Single cell
                 cell = ws[cell_or_range]
                 cell.value = formula
+                target_range = cell_or_range
                 message = f"Formula added to cell {cell_or_range}"
             
-            # Save changes
-            save_workbook(wb, file_path)
-            
-            return {
-                "success": True,
-                "file_path": file_path,
-                "sheet_name": sheet_name,
-                "target": cell_or_range,
-                "formula": formula,
-                "message": message
-            }
-                
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": f"Error adding formula: {e}"
-            }
+            if evaluate:
+                evaluated = evaluate_formula_cells(ws, target_range)
+        
+        cached_values = 0
+        if evaluate:
+            # Results can only be patched into a saved file
+            flush_cached_workbook(file_path)
+            cached_values = write_cached_formula_values(file_path, sheet_name, evaluated)
+        
+        return _with_size_suggestion({
+            "success": True,
+            "file_path": file_path,
+            "sheet_name": sheet_name,
+            "target": cell_or_range,
+            "formula": formula,
+            "cached_values": cached_values,
+            "message": message
+        }, file_path)
     
 
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Shared pytest configuration for the Excel MCP Server tests."""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+# Path given with --results-file on the controlling process, None otherwise
+_results_path = None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--results-file",
+        default=None,
+        help="Append one JSON line per test result to this file while the suite runs.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    global _results_path
+    path = config.getoption("--results-file")
+    # Under pytest-xdist the reports of every worker reach the controller too,
+    # so only the controller writes and each result is recorded once.
+    if path and not hasattr(config, "workerinput"):
+        _results_path = os.path.abspath(path)
+        open(_results_path, "w").close()
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    """Record each result as soon as it is known instead of at session end."""
+    if _results_path is None:
+        return
+    # The call phase carries the outcome; setup/teardown only matter when they
+    # did not pass (errors, skips).
+    if report.when != "call" and report.passed:
+        return
+    line = json.dumps({
+        "nodeid": report.nodeid,
+        "when": report.when,
+        "outcome": report.outcome,
+        "duration": report.duration,
+    }) + "\n"
+    # One O_APPEND write per line: lines never interleave or overwrite each
+    # other, and a crash leaves every earlier line intact.
+    fd = os.open(_results_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+@pytest.fixture
+def cached_file(tmp_path: Path) -> Iterator[Path]:
+    """Small workbook with a ``Data`` sheet; its cache entry is discarded after the test."""
+    from openpyxl import Workbook
+
+    import master_excel_mcp as m
+
+    path = tmp_path / "cached.xlsx"
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb.active["A1"] = 1
+    wb.save(path)
+    yield path
+    m.forget_cached_workbook(str(path))
+
+
+@pytest.fixture
+def sync_save(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Save edits before each tool returns, as with ``SYNC_SAVE=1``."""
+    import master_excel_mcp as m
+
+    monkeypatch.setattr(m, "SYNC_SAVE", True)
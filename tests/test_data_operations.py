@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for reading, writing and formula operations, on real files."""
+
+import struct
+import sys
+import zipfile
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+pytest.importorskip("openpyxl")
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+import master_excel_mcp as m  # noqa: E402
+
+# The tools are only defined when the MCP server framework imports
+needs_mcp = pytest.mark.skipif(not m.HAS_MCP, reason="MCP server framework not importable")
+
+
+@pytest.fixture
+def sales_table_file(tmp_path: Path) -> Path:
+    """Workbook with a ``SalesTable`` table on the ``Sales`` sheet."""
+    path = tmp_path / "tables.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sales"
+    for row in [["Region", "Units"], ["North", 120], ["South", 40], ["East", 300]]:
+        ws.append(row)
+    ws.add_table(m.Table(displayName="SalesTable", ref="A1:B4"))
+    wb.save(path)
+    return path
+
+
+def test_filter_sheet_data_on_table_ref(sales_table_file: Path) -> None:
+    wb = load_workbook(sales_table_file)
+    refs = {t["name"]: t["ref"] for t in m.list_tables(wb, "Sales")}
+    assert refs == {"SalesTable": "A1:B4"}
+
+    records = m.filter_sheet_data(wb, "Sales", refs["SalesTable"],
+                                  {"Region": ["North", "South"], "Units": {"lt": 100}})
+    assert records == [{"Region": "South", "Units": 40}]
+
+    with pytest.raises(m.RangeError):
+        m.filter_sheet_data(wb, "Sales", "A1:B4", {"Price": 1})
+
+
+@needs_mcp
+def test_filter_data_tool_by_table_name(sales_table_file: Path) -> None:
+    result = m.filter_data_tool(str(sales_table_file), "Sales", table_name="SalesTable",
+                                filters={"Units": {"gt": 100}})
+
+    assert result["success"], result
+    assert result["filtered_data"] == [{"Region": "North", "Units": 120},
+                                       {"Region": "East", "Units": 300}]
+
+    missing = m.filter_data_tool(str(sales_table_file), "Sales", table_name="Nope")
+    assert not missing["success"]
+    assert "Nope" in missing["error"]
+
+
+# ----------------------------------------
+# Cell updates
+# ----------------------------------------
+
+@pytest.mark.parametrize("raw, expected", [
+    (" 1,234 ", 1234),
+    ("2.5", 2.5),
+    ("15%", 0.15),
+    ("  text  ", "  text  "),
+    ("=SUM(A1:A2)", "=SUM(A1:A2)"),
+    (7, 7),
+])
+def test_clean_value(raw: Any, expected: Any) -> None:
+    assert m._clean_value(raw) == expected
+
+
+@needs_mcp
+def test_update_cells_tool_round_trip(cached_file: Path, sync_save: None) -> None:
+    result = m.update_cells_tool(str(cached_file), "Data",
+                                 {"A1": "1,500", "B1": "=A1*2", "C1": "note", "D1": "20%"})
+
+    assert result["success"], result
+    assert result["cells_updated"] == 4
+    saved = load_workbook(cached_file)["Data"]
+    assert [saved[c].value for c in ("A1", "B1", "C1", "D1")] == [1500, "=A1*2", "note", 0.2]
+
+
+@needs_mcp
+def test_update_cells_tool_rejects_bad_reference(cached_file: Path, sync_save: None) -> None:
+    result = m.update_cells_tool(str(cached_file), "Data", {"A1": 5, "NOT A CELL": 1})
+
+    assert not result["success"]
+    # The failed call leaves the file and the cached copy as they were
+    assert load_workbook(cached_file)["Data"]["A1"].value == 1
+    assert m.get_cached_workbook(str(cached_file))["Data"]["A1"].value == 1
+
+
+# ----------------------------------------
+# Formulas
+# ----------------------------------------
+
+@pytest.mark.parametrize("formula, relative", [
+    ("=A1*2", True),
+    ("=SUM($A$1:$A$9)", False),
+    ("=$A1+B$2", True),
+    ('="A1"&$B$1', False),
+    ("=TODAY()", False),
+])
+def test_has_relative_refs(formula: str, relative: bool) -> None:
+    assert m._has_relative_refs(formula) is relative
+
+
+@needs_mcp
+@pytest.mark.parametrize("fast_write", [True, False])
+def test_add_formula_tool_translates_range_formulas(cached_file: Path, sync_save: None,
+                                                    fast_write: bool,
+                                                    monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "FAST_FORMULA_WRITE", fast_write)
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        for row in range(1, 4):
+            ws.cell(row=row, column=1, value=row * 10)
+
+    relative = m.add_formula_tool(str(cached_file), "Data", "B1:B3", "=A1*2")
+    absolute = m.add_formula_tool(str(cached_file), "Data", "C1:C3", "=SUM($A$1:$A$3)")
+
+    assert relative["success"] and absolute["success"]
+    saved = load_workbook(cached_file)["Data"]
+    assert [saved[f"B{r}"].value for r in range(1, 4)] == ["=A1*2", "=A2*2", "=A3*2"]
+    assert {saved[f"C{r}"].value for r in range(1, 4)} == {"=SUM($A$1:$A$3)"}
+    assert {saved[f"C{r}"].data_type for r in range(1, 4)} == {"f"}
+
+
+@pytest.mark.parametrize("internals", [True, False])
+def test_sheet_helpers_without_openpyxl_internals(internals: bool,
+                                                  monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "_OPENPYXL_INTERNALS_OK", internals)
+    ws = Workbook().active
+    m.write_sheet_data(ws, "B2", [["Qty", "Price"], [2, 10], [3, 5]], autofit=False)
+    m.write_sheet_data(ws, "B5", [["=B3*C3", "=SUM(C3:C4)", "=B3*D9"]], autofit=False)
+    m.enhanced_autofit_columns(ws, min_width=1)
+
+    assert [list(row) for row in ws.iter_rows(min_row=2, max_row=4, min_col=2, values_only=True)] \
+        == [["Qty", "Price", None], [2, 10, None], [3, 5, None]]
+    assert m.evaluate_formula_cells(ws, "A1:D5") == {"B5": 20, "C5": 15, "D5": 0}
+    assert ws.column_dimensions["B"].width == len("=B3*C3") + 2
+
+
+def test_restore_cells_undoes_totals_row() -> None:
+    wb = Workbook()
+    ws = wb.active
+    for row in [["Item", "Qty"], ["a", 1], ["b", 2]]:
+        ws.append(row)
+    ws["A1"].font = m.Font(bold=True)
+    before = {(c.coordinate, c.value, c.font.b) for row in ws.iter_rows() for c in row}
+
+    snapshot = m._snapshot_cells(ws)
+    assert m.add_formula_to_table(ws, "A1:B3", "sum")["success"]
+    ws["A1"] = "changed"
+    ws["A1"].font = m.Font(italic=True)
+    m._restore_cells(ws, snapshot)
+
+    assert {(c.coordinate, c.value, c.font.b) for row in ws.iter_rows() for c in row} == before
+    assert ws.max_row == 3
+
+
+@needs_mcp
+def test_add_formulas_bulk_rolls_back_on_pending_edits(cached_file: Path) -> None:
+    with m._edit_sheet(str(cached_file), "Data", defer_save=True) as ws:
+        for row in [["Item", "Qty"], ["a", 1], ["b", 2]]:
+            ws.append(row)
+    result = m.add_formulas_bulk_tool(str(cached_file), [
+        {"sheet_name": "Data", "table_range": "A2:B4", "formula_type": "sum"},
+        {"sheet_name": "Missing", "table_range": "A1:B2"},
+    ], defer_save=True)
+
+    assert not result["success"]
+    ws = m.get_cached_workbook(str(cached_file))["Data"]
+    # The earlier deferred edit survives, the first operation's totals do not
+    assert ws["A4"].value == "b"
+    assert ws.max_row == 4
+
+
+@pytest.mark.parametrize("fast_save", [True, False])
+def test_cached_formula_values_survive_later_saves(cached_file: Path, fast_save: bool,
+                                                   sync_save: None,
+                                                   monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "FAST_SHEET_SAVE", fast_save)
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        for row in [["Qty", "Price"], [2, 10], [3, 5]]:
+            ws.append(row)
+        ws["C3"] = "=A3*B3"
+        ws["A6"] = "=SUM(A3:A4)"
+    ws = m.get_cached_workbook(str(cached_file))["Data"]
+    values = m.evaluate_formula_cells(ws, "A1:C6")
+    assert values == {"C3": 20, "A6": 5}
+    assert m.write_cached_formula_values(str(cached_file), "Data", values) == 2
+    assert load_workbook(cached_file, data_only=True)["Data"]["A6"].value == 5
+
+    # The next save goes through openpyxl, which drops cached values on load;
+    # the results are stored again, recomputed from the new data
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["A4"] = 7
+    saved = load_workbook(cached_file, data_only=True)["Data"]
+    assert saved["A6"].value == 9
+    assert saved["C3"].value == 20
+    # A further edit may only rewrite the sheet XML (FAST_SHEET_SAVE)
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["B3"] = 4
+    assert load_workbook(cached_file, data_only=True)["Data"]["C3"].value == 8
+    assert load_workbook(cached_file)["Data"]["A6"].value == "=SUM(A3:A4)"
+
+
+def _write_totals(path: Path) -> dict:
+    with m._edit_sheet(str(path), "Data") as ws:
+        for row in [["Qty"], [2], [3]]:
+            ws.append(row)
+        ws["A5"] = "=SUM(A3:A4)"
+    return m.evaluate_formula_cells(m.get_cached_workbook(str(path))["Data"], "A1:A5")
+
+
+def test_cached_formula_values_count_results_a_save_already_stored(cached_file: Path,
+                                                                   sync_save: None) -> None:
+    values = _write_totals(cached_file)
+    assert m.write_cached_formula_values(str(cached_file), "Data", values) == 1
+
+    # The save stores the sheet's results itself; the count still reports them
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["A6"] = "=A3*A4"
+    values = m.evaluate_formula_cells(m.get_cached_workbook(str(cached_file))["Data"], "A1:A6")
+    assert m.write_cached_formula_values(str(cached_file), "Data", values) == 2
+    assert load_workbook(cached_file, data_only=True)["Data"]["A6"].value == 6
+
+
+def test_cached_formula_values_follow_a_renamed_sheet(cached_file: Path, sync_save: None) -> None:
+    m.write_cached_formula_values(str(cached_file), "Data", _write_totals(cached_file))
+
+    with m.cached_workbook_edit(str(cached_file)) as wb:
+        m.rename_sheet(wb, "Data", "Totals")
+        m._rename_cached_value_sheet(str(cached_file), "Data", "Totals")
+    with m._edit_sheet(str(cached_file), "Totals") as ws:
+        ws["A4"] = 7
+
+    assert load_workbook(cached_file, data_only=True)["Totals"]["A5"].value == 9
+
+
+@needs_mcp
+def test_rename_sheet_tool_keeps_cached_formula_values(cached_file: Path, sync_save: None) -> None:
+    m.write_cached_formula_values(str(cached_file), "Data", _write_totals(cached_file))
+
+    assert m.rename_sheet_tool(str(cached_file), "Data", "Totals")["success"]
+
+    assert load_workbook(cached_file, data_only=True)["Totals"]["A5"].value == 5
+
+
+# ----------------------------------------
+# Range helpers
+# ----------------------------------------
+
+@pytest.mark.parametrize("cells, expected", [
+    (["A1"], ["A1"]),
+    (["A1", "B1", "C1"], ["A1:C1"]),
+    (["A1", "B1", "A2", "B2"], ["A1:B2"]),
+    (["A1", "C1"], ["A1", "C1"]),
+    (["B2", "A1", "B1", "A2"], ["A1:B2"]),
+    (["A1", "A1"], ["A1"]),
+    (["A1", "A3"], ["A1", "A3"]),
+    (["A1", "B1", "A2"], ["A2", "A1:B1"]),
+    (["C1:C3", "bad", "A1"], ["C1:C3", "bad", "A1"]),
+])
+def test_merge_cell_ranges(cells: List[str], expected: List[str]) -> None:
+    assert sorted(m._merge_cell_ranges(cells)) == sorted(expected)
+
+
+def test_merge_cell_ranges_covers_the_same_cells() -> None:
+    cells = ["A1", "B1", "C1", "A2", "B2", "C2", "E2", "A3", "E3", "F3"]
+    covered = set()
+    for cell_range in m._merge_cell_ranges(cells):
+        min_row, min_col, max_row, max_col = m.ExcelRange.parse_range(cell_range)
+        rectangle = {(r, c) for r in range(min_row, max_row + 1) for c in range(min_col, max_col + 1)}
+        assert not covered & rectangle
+        covered |= rectangle
+
+    assert covered == {m.ExcelRange.parse_cell_ref(cell) for cell in cells}
+
+
+# ----------------------------------------
+# Data cleaning
+# ----------------------------------------
+
+def test_clean_data_converts_and_pads() -> None:
+    data = [["Name", "Qty", "Share"], [" a ", "1,000", "15%"], ["b", None], "total"]
+
+    cleaned, ncols = m._clean_data(data)
+
+    assert ncols == 3
+    assert cleaned == [["Name", "Qty", "Share"], ["a", 1000, 0.15], ["b", "", ""], ["total", "", ""]]
+    assert m._clean_data([["a", "1"], ["b"]], pad=False) == ([["a", 1], ["b"]], 2)
+
+
+def test_clean_data_converts_numeric_columns_with_pandas(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("pandas")
+    monkeypatch.setattr(m, "PANDAS_CLEAN_ROW_THRESHOLD", 2)
+    data = [["Id", "Price", "Mixed", "Label"],
+            ["1", "1,000.50", "3", "x"],
+            ["2", " 2.25 ", "4.5", "15%"],
+            ["3", "7.0", "n/a", "5"]]
+
+    cleaned, ncols = m._clean_data(data)
+
+    assert ncols == 4
+    assert cleaned[0] == ["Id", "Price", "Mixed", "Label"]
+    assert [row[0] for row in cleaned[1:]] == [1, 2, 3]
+    assert [row[1] for row in cleaned[1:]] == [1000.5, 2.25, 7.0]
+    # Columns pandas leaves alone get the same per-cell conversion
+    assert [row[2] for row in cleaned[1:]] == [3, 4.5, "n/a"]
+    assert [row[3] for row in cleaned[1:]] == ["x", 0.15, 5]
+    assert all(type(row[0]) is int for row in cleaned[1:])
+    # Same result as the per-cell path
+    monkeypatch.setattr(m, "PANDAS_CLEAN_ROW_THRESHOLD", 1000)
+    assert m._clean_data(data) == (cleaned, ncols)
+
+
+def test_clean_data_without_pandas(monkeypatch: pytest.MonkeyPatch) -> None:
+    data = [["Id", "Price"]] + [[str(i), f"{i}.5"] for i in range(5)]
+    expected = m._clean_data(data)
+    monkeypatch.setattr(m, "PANDAS_CLEAN_ROW_THRESHOLD", 2)
+    # A None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "pandas", None)
+
+    assert m._clean_data(data) == expected
+
+
+# ----------------------------------------
+# Binary workbooks (.xlsb)
+# ----------------------------------------
+
+def _record(record_id: int, payload: bytes = b"") -> bytes:
+    """One BIFF12 record: 1-2 byte type and 7-bit variable-length size."""
+    header = record_id.to_bytes(2 if record_id >= 0x80 else 1, "little")
+    size, length = len(payload), b""
+    while True:
+        byte = size & 0x7F
+        size >>= 7
+        length += bytes([byte | (0x80 if size else 0)])
+        if not size:
+            break
+    return header + length + payload
+
+
+def _wide(text: str) -> bytes:
+    return struct.pack("<I", len(text)) + text.encode("utf-16-le")
+
+
+def _write_xlsb(path: Path, sheet_name: str, rows: List[List[Any]]) -> None:
+    """Write a minimal ``.xlsb`` with one sheet of numbers and shared strings."""
+    strings: List[str] = []
+    cells = b""
+    for r, row in enumerate(rows):
+        cells += _record(0x0000, struct.pack("<I", r))
+        for c, value in enumerate(row):
+            if isinstance(value, str):
+                if value not in strings:
+                    strings.append(value)
+                cells += _record(0x0007, struct.pack("<III", c, 0, strings.index(value)))
+            elif value is not None:
+                cells += _record(0x0005, struct.pack("<IId", c, 0, float(value)))
+    width = max(len(row) for row in rows)
+    sheet = (_record(0x0181) + _record(0x0194, struct.pack("<IIII", 0, len(rows) - 1, 0, width - 1))
+             + _record(0x0191) + cells + _record(0x0192) + _record(0x0182))
+    workbook = (_record(0x0183) + _record(0x018F)
+                + _record(0x019C, struct.pack("<II", 0, 1) + _wide("rId1") + _wide(sheet_name))
+                + _record(0x0190) + _record(0x0184))
+    shared = (_record(0x019F, struct.pack("<II", len(strings), len(strings)))
+              + b"".join(_record(0x0013, b"\x00" + _wide(s)) for s in strings) + _record(0x01A0))
+    rels = ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.bin" Type="http://schemas.'
+            'openxmlformats.org/officeDocument/2006/relationships/worksheet"/></Relationships>')
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.bin", workbook)
+        zf.writestr("xl/_rels/workbook.bin.rels", rels)
+        zf.writestr("xl/sharedStrings.bin", shared)
+        zf.writestr("xl/worksheets/sheet1.bin", sheet)
+
+
+def test_xlsb_reader(tmp_path: Path) -> None:
+    pytest.importorskip("pyxlsb")
+    path = tmp_path / "data.xlsb"
+    _write_xlsb(path, "Data", [["Name", "Qty"], ["a", 1.5], ["b", 2]])
+
+    assert m.list_xlsb_sheets(str(path)) == ["Data"]
+    assert m.read_xlsb_sheet_data(str(path), "Data") == [["Name", "Qty"], ["a", 1.5], ["b", 2.0]]
+    assert m.read_xlsb_sheet_data(str(path), "Data", "B2:B3") == [[1.5], [2.0]]
+    # Rows and columns past the end of the sheet are padded with None
+    assert m.read_xlsb_sheet_data(str(path), "Data", "B3:C4") == [[2.0, None], [None, None]]
+    with pytest.raises(m.SheetNotFoundError):
+        m.read_xlsb_sheet_data(str(path), "Nope")
+    with pytest.raises(m.RangeError):
+        m.read_xlsb_sheet_data(str(path), "Data", "not a range")
+
+
+def test_xlsb_reader_without_pyxlsb(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A None entry makes "import pyxlsb" fail as if the package were not installed
+    monkeypatch.setitem(sys.modules, "pyxlsb", None)
+
+    with pytest.raises(m.ExcelMCPError, match="pyxlsb"):
+        m.list_xlsb_sheets(str(tmp_path / "data.xlsb"))
+    with pytest.raises(m.ExcelMCPError, match="pyxlsb"):
+        m.read_xlsb_sheet_data(str(tmp_path / "data.xlsb"), "Data")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the in-memory workbook cache and its savers, on real files."""
+
+import os
+import subprocess
+import sys
+import textwrap
+import zipfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("openpyxl")
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+import master_excel_mcp as m  # noqa: E402
+
+
+def _write_value(path: Path, value) -> None:
+    """Replace ``path`` with a workbook holding ``value`` in ``Data!A1``, as another program would."""
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb.active["A1"] = value
+    wb.save(path)
+
+
+def test_cache_reuses_the_parsed_workbook(cached_file: Path) -> None:
+    wb = m.get_cached_workbook(str(cached_file))
+
+    assert m.get_cached_workbook(str(cached_file)) is wb
+    # A read-only request is served by the writable entry
+    assert m.get_cached_workbook(str(cached_file), read_only=True) is wb
+
+
+def test_writable_request_upgrades_read_only_entry(cached_file: Path) -> None:
+    ro = m.get_cached_workbook(str(cached_file), read_only=True)
+    rw = m.get_cached_workbook(str(cached_file))
+
+    assert rw is not ro
+    assert not getattr(rw, "read_only", False)
+    assert m.get_cached_workbook(str(cached_file), read_only=True) is rw
+
+
+def test_cache_reloads_when_size_changes(cached_file: Path) -> None:
+    wb = m.get_cached_workbook(str(cached_file))
+    _write_value(cached_file, "a much longer value than before " * 20)
+
+    reloaded = m.get_cached_workbook(str(cached_file))
+    assert reloaded is not wb
+    assert reloaded["Data"]["A1"].value.startswith("a much longer value")
+
+
+def test_cache_reloads_when_only_mtime_changes(cached_file: Path) -> None:
+    wb = m.get_cached_workbook(str(cached_file))
+    st = os.stat(cached_file)
+    os.utime(cached_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert m.get_cached_workbook(str(cached_file)) is not wb
+
+
+def test_missing_file_raises_and_drops_entry(cached_file: Path) -> None:
+    m.get_cached_workbook(str(cached_file))
+    cached_file.unlink()
+
+    with pytest.raises(m.FileNotFoundError):
+        m.get_cached_workbook(str(cached_file))
+    assert os.path.abspath(cached_file) not in m._workbook_cache
+
+
+def test_pending_edits_win_over_the_file_on_disk(cached_file: Path) -> None:
+    with m._edit_sheet(str(cached_file), "Data", defer_save=True) as ws:
+        ws["A1"] = "pending"
+
+    assert load_workbook(cached_file)["Data"]["A1"].value == 1
+    assert m.get_cached_workbook(str(cached_file))["Data"]["A1"].value == "pending"
+    assert m.flush_cached_workbook(str(cached_file))
+    assert load_workbook(cached_file)["Data"]["A1"].value == "pending"
+    assert not m.flush_cached_workbook(str(cached_file))
+
+
+def test_failed_edit_drops_clean_entry(cached_file: Path) -> None:
+    with pytest.raises(ZeroDivisionError):
+        with m._edit_sheet(str(cached_file), "Data") as ws:
+            ws["A1"] = "half done"
+            1 / 0
+
+    assert m.get_cached_workbook(str(cached_file))["Data"]["A1"].value == 1
+
+
+@pytest.mark.parametrize("internals", [True, False])
+def test_failed_edit_keeps_only_earlier_pending_edits(cached_file: Path, internals: bool,
+                                                      monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "_OPENPYXL_INTERNALS_OK", internals)
+    with m._edit_sheet(str(cached_file), "Data", defer_save=True) as ws:
+        ws["A1"] = "pending"
+    with pytest.raises(ZeroDivisionError):
+        with m.cached_workbook_edit(str(cached_file), defer_save=True) as wb:
+            wb["Data"]["A1"] = "half done"
+            wb["Data"]["B5"] = "half done"
+            wb["Data"].title = "Renamed"
+            wb.create_sheet("Extra")
+            1 / 0
+
+    wb = m.get_cached_workbook(str(cached_file))
+    assert wb.sheetnames == ["Data"]
+    assert wb["Data"]["A1"].value == "pending"
+    assert wb["Data"].max_row == 1
+    m.flush_cached_workbook(str(cached_file))
+    assert load_workbook(cached_file)["Data"]["A1"].value == "pending"
+
+
+def test_eviction_saves_pending_edits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "WORKBOOK_CACHE_SIZE", 1)
+    first, second = tmp_path / "first.xlsx", tmp_path / "second.xlsx"
+    _write_value(first, 1)
+    _write_value(second, 2)
+    try:
+        with m._edit_sheet(str(first), "Data", defer_save=True) as ws:
+            ws["A1"] = "evicted"
+        m.get_cached_workbook(str(second))
+
+        assert os.path.abspath(first) not in m._workbook_cache
+        assert load_workbook(first)["Data"]["A1"].value == "evicted"
+    finally:
+        m.forget_cached_workbook(str(first))
+        m.forget_cached_workbook(str(second))
+
+
+def test_sheet_names_come_from_disk_or_pending_edits(cached_file: Path) -> None:
+    assert m.get_sheet_names(str(cached_file)) == ["Data"]
+
+    with m.cached_workbook_edit(str(cached_file), defer_save=True) as wb:
+        wb.create_sheet("Extra")
+    assert m.get_sheet_names(str(cached_file)) == ["Data", "Extra"]
+
+    m.flush_cached_workbook(str(cached_file))
+    assert m.get_sheet_names(str(cached_file)) == ["Data", "Extra"]
+    with zipfile.ZipFile(cached_file) as zf:
+        assert m._workbook_sheet_names(zf) == ["Data", "Extra"]
+
+
+def test_background_saver_coalesces_a_burst_of_edits(cached_file: Path,
+                                                     monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "SYNC_SAVE", False)
+    monkeypatch.setattr(m, "SAVE_COALESCE_DELAY", 0.2)
+    saves = []
+    real_flush = m.flush_cached_workbook
+
+    def counting_flush(filename, *args, **kwargs):
+        saves.append(filename)
+        return real_flush(filename, *args, **kwargs)
+
+    monkeypatch.setattr(m, "flush_cached_workbook", counting_flush)
+    for value in range(5):
+        with m._edit_sheet(str(cached_file), "Data") as ws:
+            ws["A1"] = value
+    # Nothing is written until the worker wakes up
+    assert load_workbook(cached_file)["Data"]["A1"].value == 1
+    m._save_queue.join()
+
+    assert saves == [os.path.abspath(cached_file)]
+    assert load_workbook(cached_file)["Data"]["A1"].value == 4
+    assert m.workbook_is_optimized(str(cached_file))
+
+
+def test_failed_background_save_is_kept_and_reported(cached_file: Path,
+                                                     monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "SYNC_SAVE", False)
+    monkeypatch.setattr(m, "SAVE_COALESCE_DELAY", 0)
+    real_save = m.save_workbook
+
+    def failing_save(*args, **kwargs):
+        raise m.ExcelMCPError("disk full")
+
+    monkeypatch.setattr(m, "save_workbook", failing_save)
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["A1"] = 2
+    m._save_queue.join()
+
+    key = os.path.abspath(cached_file)
+    assert list(m.pending_save_errors()) == [key]
+    assert "disk full" in m.pending_save_errors()[key]
+    # The edit is still pending in memory and the next edit reports the failure
+    assert m.get_cached_workbook(str(cached_file))["Data"]["A1"].value == 2
+    with pytest.raises(m.ExcelMCPError, match="could not be saved"):
+        with m._edit_sheet(str(cached_file), "Data") as ws:
+            ws["A1"] = 3
+
+    # Once saving works again the retry writes the pending edit
+    monkeypatch.setattr(m, "save_workbook", real_save)
+    assert m.flush_workbook_cache() == [key]
+    assert m.pending_save_errors() == {}
+    assert load_workbook(cached_file)["Data"]["A1"].value == 2
+
+
+def test_pending_edits_are_written_at_exit(cached_file: Path) -> None:
+    script = textwrap.dedent(f"""
+        import master_excel_mcp as m
+        with m._edit_sheet({str(cached_file)!r}, "Data", defer_save=True) as ws:
+            ws["B2"] = "written at exit"
+    """)
+    repo_root = Path(m.__file__).resolve().parent
+    env = dict(os.environ, EXCEL_MCP_LOG_LEVEL="ERROR")
+    env.pop("SYNC_SAVE", None)
+    subprocess.run([sys.executable, "-c", script], cwd=repo_root, env=env, check=True, timeout=120)
+
+    assert load_workbook(cached_file)["Data"]["B2"].value == "written at exit"
+
+
+def test_single_sheet_save_rewrites_only_that_sheet(cached_file: Path, sync_save: None,
+                                                    monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "FAST_SHEET_SAVE", True)
+    with m.cached_workbook_edit(str(cached_file)) as wb:
+        wb.create_sheet("Other")["A1"] = "untouched"
+    with zipfile.ZipFile(cached_file) as zf:
+        before = {name: zf.read(name) for name in zf.namelist()}
+
+    sheet_saves = []
+    real_save_sheet = m._save_edited_sheet
+    monkeypatch.setattr(m, "_save_edited_sheet",
+                        lambda *args: sheet_saves.append(real_save_sheet(*args)) or sheet_saves[-1])
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["A1"] = 42
+        ws["C3"] = "=A1*2"
+
+    assert sheet_saves == [True]
+    with zipfile.ZipFile(cached_file) as zf:
+        after = {name: zf.read(name) for name in zf.namelist()}
+        sheet_part = m._sheet_part_name(zf, "Data")
+    assert after.keys() == before.keys()
+    assert [name for name in after if after[name] != before[name]] == [sheet_part]
+    saved = load_workbook(cached_file)
+    assert saved["Data"]["A1"].value == 42
+    assert saved["Data"]["C3"].value == "=A1*2"
+    assert saved["Other"]["A1"].value == "untouched"
+
+
+def test_single_sheet_save_falls_back_for_sheets_with_tables(cached_file: Path, sync_save: None,
+                                                             monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(m, "FAST_SHEET_SAVE", True)
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws.append(["Qty"])
+        ws.append([5])
+        ws.add_table(m.Table(displayName="Qty", ref="A2:A3"))
+
+    sheet_saves = []
+    real_save_sheet = m._save_edited_sheet
+    monkeypatch.setattr(m, "_save_edited_sheet",
+                        lambda *args: sheet_saves.append(real_save_sheet(*args)) or sheet_saves[-1])
+    with m._edit_sheet(str(cached_file), "Data") as ws:
+        ws["A3"] = 6
+
+    assert sheet_saves == [False]
+    saved = load_workbook(cached_file)["Data"]
+    assert saved["A3"].value == 6
+    assert list(saved.tables) == ["Qty"]